@@ -1,15 +1,40 @@
 import azure.functions as func
 import azure.durable_functions as df
-from datetime import timedelta
-from typing import Dict, Any
-from platform_core.registry import get_platform_commands
-from platform_core.state import JobState, JobPhase
-from platform_core.commands import Plan
-import requests
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+from platform_core import registry
+from platform_core.registry import get_command, get_platform_commands
+from platform_core.state import PROGRESS_KEYS, JobState, JobPhase
+from platform_core.commands import Payload, Plan
+from platform_core.polling import PollPolicy, make_poll_policy
+from platform_core.coalesce import status_batcher, submit_batcher
+from platform_core.limits import is_outage, run_limited
+from platform_core.metrics import metrics
+from platform_core.breaker import CircuitOpenError
+from platform_core.result_cache import cache_key, result_cache
+from platform_core import async_http, callbacks, dispatch, http_pool
+from platform_core.claimcheck import claims
+from platform_core.codec import canonical_hash
+import asyncio
+import atexit
 import json
+import os
+import uuid
+from urllib.parse import urlsplit, urlunsplit
 
 app = df.DFApp(http_auth_level=func.AuthLevel.ANONYMOUS)
 
+# Command instances live for the whole worker; WARM_PLATFORMS (comma separated)
+# pre-builds them at start-up instead of on the first activity.
+registry.warm_up(p for p in os.environ.get("WARM_PLATFORMS", "").split(",") if p.strip())
+atexit.register(registry.close)
+atexit.register(dispatch.shutdown)
+atexit.register(http_pool.close_all)
+atexit.register(async_http.close_all)
+
+JOB_STATE_CHANGED = "JobStateChanged"
+CANCEL_REQUESTED = "CancelRequested"
+
 @app.route(route="orchestrators/{platform}", methods=["POST"])
 @app.durable_client_input(client_name="client")
 async def http_start(req: func.HttpRequest, client: df.DurableOrchestrationClient):
@@ -17,88 +42,676 @@ async def http_start(req: func.HttpRequest, client: df.DurableOrchestrationClien
     body = req.get_json()
     body = body or {}
     body["platform"] = platform
-    instance_id = await client.start_new("orchestrate_submission", client_input=body)
+    body["requested_at"] = datetime.now(timezone.utc).isoformat()
+    instance_id = _idempotent_instance_id(req, platform, body)
+    if instance_id is not None:
+        body["payload_hash"] = canonical_hash(body.get("payload"))
+        existing = await _existing_instance_response(req, client, instance_id, body["payload_hash"])
+        if existing is not None:
+            return existing
+    if body.get("push_events"):
+        # Pre-allocate the instance id so the backend can be told where to push.
+        instance_id = instance_id or uuid.uuid4().hex
+        body["payload"] = {**(body.get("payload") or {}), "notify_url": _events_url(req.url, instance_id)}
+    body["payload"] = await claims().aoffload(body.get("payload"))
+    ids = {"instance_id": instance_id} if instance_id else {}
+    try:
+        instance_id = await client.start_new("orchestrate_submission", client_input=body, **ids)
+    except Exception:
+        # host.json refuses to replace a live instance, so a concurrent request
+        # with the same key that started first lands here.
+        existing = None
+        if instance_id is not None:
+            existing = await _existing_instance_response(req, client, instance_id, body["payload_hash"])
+        if existing is None:
+            raise
+        return existing
+    return client.create_check_status_response(req, instance_id)
+
+
+@app.route(route="orchestrators/{platform}/batch", methods=["POST"])
+@app.durable_client_input(client_name="client")
+async def http_start_batch(req: func.HttpRequest, client: df.DurableOrchestrationClient):
+    """Start one orchestrate_batch instance fanning out over body["items"] (a list of payloads)."""
+    platform = req.route_params.get("platform")
+    body = req.get_json() or {}
+    items = body.get("items")
+    if not isinstance(items, list) or not items:
+        return func.HttpResponse("Body must contain a non-empty 'items' list", status_code=400)
+    body["platform"] = platform
+    body["requested_at"] = datetime.now(timezone.utc).isoformat()
+
+    instance_id = uuid.uuid4().hex
+    item_ids = [batch_item_instance_id(instance_id, i) for i in range(len(items))]
+    if body.get("push_events"):
+        platform_url = urlunsplit(urlsplit(req.url)._replace(query="")).rstrip("/").rsplit("/", 1)[0]
+        body["items"] = [
+            {**(item or {}), "notify_url": _events_url(platform_url, item_id)}
+            for item, item_id in zip(items, item_ids)
+        ]
+    body["items"] = [await claims().aoffload(item) for item in body["items"]]
+    await client.start_new("orchestrate_batch", instance_id=instance_id, client_input=body)
+
+    response = client.create_http_management_payload(instance_id)
+    response["items"] = item_ids
+    return func.HttpResponse(
+        json.dumps(response),
+        status_code=202,
+        mimetype="application/json",
+        headers={"Location": response["statusQueryGetUri"]},
+    )
+
+
+# Instances seen with the same key are reused while live, and for this long
+# after completing; failed, terminated and older instances are started afresh.
+IDEMPOTENCY_WINDOW_S = float(os.environ.get("IDEMPOTENCY_WINDOW_S") or 86400)
+_LIVE_STATUSES = {
+    df.OrchestrationRuntimeStatus.Pending,
+    df.OrchestrationRuntimeStatus.Running,
+    df.OrchestrationRuntimeStatus.ContinuedAsNew,
+    df.OrchestrationRuntimeStatus.Suspended,
+}
+
+
+def _idempotent_instance_id(req: func.HttpRequest, platform: str, body: Dict[str, Any]) -> Optional[str]:
+    """
+    Deterministic instance id from the Idempotency-Key header or, when the
+    body sets "idempotent": true, from a canonical hash of (platform, payload).
+    """
+    key = req.headers.get("Idempotency-Key")
+    if key:
+        return "idem-" + canonical_hash({"platform": platform.lower(), "key": key})[:32]
+    if body.get("idempotent"):
+        return "idem-" + canonical_hash({"platform": platform.lower(), "payload": body.get("payload")})[:32]
+    return None
+
+
+async def _existing_instance_response(
+    req: func.HttpRequest, client: df.DurableOrchestrationClient, instance_id: str, payload_hash: str
+) -> Optional[func.HttpResponse]:
+    """
+    Response for a request whose idempotent instance is reusable: its status
+    URLs, or 409 when it was started with a different payload. None when a
+    new instance should be started instead.
+    """
+    status = await client.get_status(instance_id, show_input=True)
+    if not _is_reusable(status):
+        return None
+    started_hash = (_started_with(status) or {}).get("payload_hash")
+    if started_hash is not None and started_hash != payload_hash:
+        return func.HttpResponse(
+            f"Idempotency key already used by instance '{instance_id}' with a different payload", status_code=409
+        )
     return client.create_check_status_response(req, instance_id)
 
 
+def _started_with(status) -> Optional[Dict[str, Any]]:
+    """The instance's input, decoded when the client returns it as a JSON string."""
+    started_with = getattr(status, "input_", None)
+    if isinstance(started_with, str):
+        started_with = json.loads(started_with)
+    return started_with
+
+
+def _is_reusable(status) -> bool:
+    runtime_status = getattr(status, "runtime_status", None)
+    if runtime_status in _LIVE_STATUSES:
+        return True
+    if runtime_status is df.OrchestrationRuntimeStatus.Completed and status.last_updated_time is not None:
+        updated = status.last_updated_time
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - updated <= timedelta(seconds=IDEMPOTENCY_WINDOW_S)
+    return False
+
+
+def batch_item_instance_id(batch_instance_id: str, index: int) -> str:
+    return f"{batch_instance_id}-{index}"
+
+
+def _events_url(platform_url: str, instance_id: str) -> str:
+    return urlunsplit(urlsplit(platform_url)._replace(query="")).rstrip("/") + f"/{instance_id}/events"
+
+
+@app.route(route="orchestrators/{platform}/{instance_id}/events", methods=["POST"])
+@app.durable_client_input(client_name="client")
+async def http_job_event(req: func.HttpRequest, client: df.DurableOrchestrationClient):
+    """
+    Webhook for backends to wake a waiting orchestration. The route is
+    anonymous, so the body is ignored: the orchestration polls the backend for
+    the job's real state instead of trusting whoever posted. Late webhooks are
+    expected: 404 for an unknown instance, 410 for one no longer running.
+    """
+    instance_id = req.route_params.get("instance_id")
+    status = await client.get_status(instance_id)
+    runtime_status = getattr(status, "runtime_status", None)
+    if runtime_status is None:
+        return func.HttpResponse(f"Instance '{instance_id}' not found", status_code=404)
+    if runtime_status not in _LIVE_STATUSES:
+        return func.HttpResponse(f"Instance '{instance_id}' already finished", status_code=410)
+    try:
+        await client.raise_event(instance_id, JOB_STATE_CHANGED, None)
+    except Exception:
+        # It finished between the status check and the event.
+        return func.HttpResponse(f"Instance '{instance_id}' already finished", status_code=410)
+    return func.HttpResponse(status_code=202)
+
+
+@app.route(route="orchestrators/{platform}/{instance_id}/cancel", methods=["POST"])
+@app.durable_client_input(client_name="client")
+async def http_cancel(req: func.HttpRequest, client: df.DurableOrchestrationClient):
+    """
+    Stop a live orchestration started with "cancellable": it cancels the backend
+    job and finishes as CANCELLED. (Terminating the instance instead would leave
+    the job running: a terminated orchestrator runs no more code.) For a batch,
+    every item is asked to stop. Returns 409 when nothing was left to stop.
+
+    "cancellable" stays opt-in: it adds a CANCEL_REQUESTED waiter to every poll
+    wait, and turning it on by default would change the replayed history of
+    instances already running, which Durable Functions rejects as
+    non-deterministic.
+    """
+    instance_id = req.route_params.get("instance_id")
+    status = await client.get_status(instance_id, show_input=True)
+    if getattr(status, "runtime_status", None) not in _LIVE_STATUSES:
+        return func.HttpResponse(f"Instance '{instance_id}' is not running", status_code=409)
+    started_with = _started_with(status)
+    if not (started_with or {}).get("cancellable"):
+        return func.HttpResponse(f"Instance '{instance_id}' was not started with 'cancellable'", status_code=409)
+    try:
+        body = req.get_json()
+    except ValueError:
+        body = None
+    reason = (body or {}).get("reason") if isinstance(body, dict) else None
+    items = started_with.get("items")
+    targets = [batch_item_instance_id(instance_id, i) for i in range(len(items))] if items else [instance_id]
+    # An instance (or batch item) may finish between the status check and the
+    # event; it no longer accepts events, which is not an error here.
+    outcomes = await asyncio.gather(
+        *(client.raise_event(target, CANCEL_REQUESTED, {"reason": reason}) for target in targets),
+        return_exceptions=True,
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
+    if all(isinstance(outcome, Exception) for outcome in outcomes):
+        return func.HttpResponse(f"Instance '{instance_id}' already finished", status_code=409)
+    return func.HttpResponse(status_code=202)
+
+
+@app.route(route="orchestrators/{instance_id}/progress", methods=["GET"])
+@app.durable_client_input(client_name="client")
+async def http_progress(req: func.HttpRequest, client: df.DurableOrchestrationClient):
+    """The instance's runtime status and latest progress record, without history or input."""
+    instance_id = req.route_params.get("instance_id")
+    status = await client.get_status(instance_id)
+    runtime_status = getattr(status, "runtime_status", None)
+    if runtime_status is None:
+        return func.HttpResponse(f"Instance '{instance_id}' not found", status_code=404)
+    body = {"instance_id": instance_id, "runtime_status": runtime_status.value, "progress": status.custom_status}
+    return func.HttpResponse(json.dumps(body), mimetype="application/json")
+
+
 @app.orchestration_trigger(context_name="ctx")
 def orchestrate_submission(ctx: df.DurableOrchestrationContext):
     req: Dict[str, Any] = ctx.get_input() or {}
     platform = req["platform"]
-    payload = req["payload"]
-    callback_url = req["callback_url"]
+    callback_url = req.get("callback_url")
     poll_s = int(req.get("poll_s", 10))
     timeout_s = int(req.get("timeout_s", 3600))
+    checkpoint_polls = int(req.get("checkpoint_polls", 100))
+    safety_net_s = float(req.get("safety_net_s", 600)) if req.get("push_events") else None
+    cancellable = bool(req.get("cancellable"))
+    policy = make_poll_policy(req.get("poll_policy"), poll_s=poll_s, seed=str(ctx.instance_id))
 
-    prepared_payload = yield ctx.call_activity(
-        "prepare_activity",
-        {
-            "platform": platform, 
-            "payload": payload
-        }
-    )
+    checkpoint = req.get("checkpoint")
+    final_job_state: Optional[JobState] = None
+    if checkpoint is None:
+        prepared_payload = yield ctx.call_activity(
+            "prepare_activity",
+            {
+                "platform": platform, 
+                "payload": req["payload"]
+            }
+        )
 
-    plan = yield ctx.call_activity(
-        "submit_activity",
-        {
-            "platform": platform, 
-            "payload": prepared_payload
-        }
-    )
+        result_key = None
+        if req.get("cache"):
+            # Opt-in: a cached success for the same prepared payload skips submit and polling.
+            lookup = yield ctx.call_activity(
+                "lookup_result_activity",
+                {"platform": platform, "payload": prepared_payload}
+            )
+            result_key, final_job_state = lookup["key"], lookup["state"]
 
-    final_job_state = yield from wait_for_plan_status(
-        ctx=ctx,
-        platform=platform,
-        plan=plan,
-        timeout_s=timeout_s, 
-        poll_s=poll_s
-    )
+        if final_job_state is None:
+            plan = yield ctx.call_activity(
+                "submit_activity",
+                {
+                    "platform": platform, 
+                    "payload": prepared_payload
+                }
+            )
 
-    yield ctx.call_activity(
-        "callback_activity",
-        {
-            "callback_url": callback_url,
-            "result": final_job_state
-        }
-    )
+            checkpoint = _new_checkpoint(ctx, plan, timeout_s)
+            if result_key:
+                checkpoint["cache_key"] = result_key
+
+    if final_job_state is None:
+        final_job_state = yield from wait_for_plan_status(
+            ctx=ctx,
+            platform=platform,
+            checkpoint=checkpoint,
+            policy=policy,
+            max_polls=checkpoint_polls,
+            safety_net_s=safety_net_s,
+            cancellable=cancellable
+        )
+
+        if final_job_state is None:
+            # Poll budget for this generation used up: restart with a fresh history.
+            next_input = {k: v for k, v in req.items() if k != "payload"}
+            next_input["checkpoint"] = checkpoint
+            ctx.continue_as_new(next_input)
+            return None
+
+        if final_job_state.phase in (JobPhase.TIMEOUT, JobPhase.CANCELLED):
+            # Free the backend capacity the job would otherwise keep using.
+            yield ctx.call_activity("cancel_activity", {"platform": platform, "plan": checkpoint["plan"]})
+
+        _record_summary(ctx, platform, req.get("requested_at"), checkpoint, final_job_state)
+        if final_job_state.phase is JobPhase.SUCCEEDED and checkpoint.get("cache_key"):
+            yield ctx.call_activity(
+                "store_result_activity",
+                {"key": checkpoint["cache_key"], "state": final_job_state}
+            )
+
+    if callback_url:
+        delivery = yield ctx.call_activity(
+            "callback_activity",
+            {
+                "callback_url": callback_url,
+                "result": final_job_state
+            }
+        )
+        # A failed delivery does not fail the finished job; its record stays on the progress route.
+        ctx.set_custom_status({**_progress(final_job_state), "callback": delivery})
 
     return final_job_state
 
+
+def _new_checkpoint(ctx, plan: Plan, timeout_s: float) -> Dict[str, Any]:
+    now = ctx.current_utc_datetime
+    return {
+        "plan": plan,
+        "deadline": (now + timedelta(seconds=timeout_s)).isoformat(),
+        "attempt": 0,
+        "started_at": now.isoformat(),
+    }
+
+
+# Per-item settings a batch request may set once for all of its items.
+_BATCH_ITEM_SETTINGS = (
+    "poll_s", "timeout_s", "poll_policy", "checkpoint_polls", "push_events", "safety_net_s", "requested_at",
+    "cancellable", "cache",
+)
+
+@app.orchestration_trigger(context_name="ctx")
+def orchestrate_batch(ctx: df.DurableOrchestrationContext):
+    """
+    Fan out one orchestrate_submission per item, at most `max_concurrency` at a
+    time. With "bulk_submit", items are prepared and submitted in chunks of up
+    to `submit_batch_size` by one activity each, and the sub-orchestrations only
+    poll. A chunk never exceeds the free concurrency slots, so every submitted
+    item starts polling (and its `timeout_s` starts) right away. An item the
+    platform rejects ends as ERROR without failing the batch; with "cache", a
+    cached success is returned without submitting.
+
+    A failing item never fails the batch: its entry becomes an ERROR state, it
+    still gets its item callback, and the aggregate callback still fires. The
+    aggregate delivery record, and those of item callbacks that were not
+    delivered, become the custom status.
+    """
+    req: Dict[str, Any] = ctx.get_input() or {}
+    platform = req["platform"]
+    max_concurrency = max(1, int(req.get("max_concurrency", 50)))
+    chunk_size = max(1, int(req.get("submit_batch_size", 100))) if req.get("bulk_submit") else 0
+    timeout_s = int(req.get("timeout_s", 3600))
+    shared = {k: req[k] for k in _BATCH_ITEM_SETTINGS if k in req}
+
+    items = req["items"]
+    results: List[Any] = [None] * len(items)
+    checkpoints: Dict[int, Dict[str, Any]] = {}
+    item_callback_url = req.get("item_callback_url")
+    undelivered: List[Dict[str, Any]] = []
+    tasks, in_flight = [], []
+    submitted_to = 0
+    for i, payload in enumerate(items):
+        if chunk_size and i >= submitted_to:
+            if len(in_flight) >= max_concurrency:
+                done = yield ctx.task_any(in_flight)
+                in_flight.remove(done)
+            submitted_to = i + min(chunk_size, max_concurrency - len(in_flight))
+            try:
+                submitted = yield ctx.call_activity(
+                    "submit_many_activity",
+                    {"platform": platform, "payloads": items[i:submitted_to], "cache": bool(req.get("cache"))}
+                )
+            except Exception as e:
+                # Only this chunk's items fail; items already started keep being tracked.
+                submitted = [{"error": f"Submit failed: {e}"}] * (submitted_to - i)
+            for j, entry in enumerate(submitted, start=i):
+                if "plan" in entry:
+                    checkpoints[j] = _new_checkpoint(ctx, entry["plan"], timeout_s)
+                    if entry.get("cache_key"):
+                        checkpoints[j]["cache_key"] = entry["cache_key"]
+                elif "state" in entry:
+                    results[j] = yield from _item_done(ctx, item_callback_url, entry["state"], undelivered)
+                else:
+                    results[j] = yield from _item_error(ctx, item_callback_url, entry["error"], undelivered)
+        if results[i] is not None:
+            continue
+        if len(in_flight) >= max_concurrency:
+            done = yield ctx.task_any(in_flight)
+            in_flight.remove(done)
+        item = {**shared, "platform": platform, "callback_url": item_callback_url}
+        if i in checkpoints:
+            item["checkpoint"] = checkpoints.pop(i)
+        else:
+            item["payload"] = payload
+        task = ctx.call_sub_orchestrator(
+            "orchestrate_submission", item, batch_item_instance_id(ctx.instance_id, i)
+        )
+        tasks.append((i, task))
+        in_flight.append(task)
+    # task_all would fail the batch on the first failed item; drain one by one.
+    while in_flight:
+        done = yield ctx.task_any(in_flight)
+        in_flight.remove(done)
+
+    for i, task in tasks:
+        if isinstance(task.result, Exception):
+            results[i] = yield from _item_error(ctx, item_callback_url, f"Item failed: {task.result}", undelivered)
+        else:
+            results[i] = task.result
+    delivery = None
+    if req.get("callback_url"):
+        delivery = yield ctx.call_activity(
+            "callback_activity",
+            {
+                "callback_url": req["callback_url"],
+                "result": {"instance_id": ctx.instance_id, "items": results}
+            }
+        )
+    if delivery is not None or undelivered:
+        ctx.set_custom_status({"callback": delivery, "undelivered_item_callbacks": undelivered})
+    return results
+
+def _item_error(ctx, callback_url: Optional[str], message: str, undelivered: List[Dict[str, Any]]):
+    """ERROR state for a batch item that did not finish on its own, reported to its callback."""
+    state = JobState(JobPhase.ERROR, raw_status=None, message=message)
+    return (yield from _item_done(ctx, callback_url, state, undelivered))
+
+def _item_done(ctx, callback_url: Optional[str], state: JobState, undelivered: List[Dict[str, Any]]):
+    """
+    A batch item settled without a sub-orchestration, reported to its callback;
+    a failed delivery's record is appended to `undelivered`.
+    """
+    if callback_url:
+        delivery = yield ctx.call_activity("callback_activity", {"callback_url": callback_url, "result": state})
+        if delivery is not None and not delivery.get("delivered"):
+            undelivered.append(delivery)
+    return state
+
+# Activities run on the worker's event loop: async commands are awaited there,
+# sync ones run on dispatch's bounded thread pool (SYNC_COMMAND_THREADS).
+# Backend calls go through the platform's circuit breaker and rate / in-flight
+# limiter; during an outage, and without a call while a circuit is open, polls
+# report UNAVAILABLE.
+# Payloads, plans and job outputs above CLAIM_CHECK_THRESHOLD_BYTES leave
+# activities as claim-check references and are resolved on the way back in.
+
+@app.activity_trigger(input_name="args")
+async def prepare_activity(args: Dict[str, Any]) -> Payload:
+    prepare_cmd = get_command(args["platform"], "prepare")
+    payload = await claims().aresolve(args["payload"])
+    return await claims().aoffload(await run_limited(args["platform"], prepare_cmd.execute, payload))
+
 @app.activity_trigger(input_name="submit")
-def submit_activity(submit: Dict[str, Any]) -> Plan:
-    submit_cmd = get_platform_commands(submit["platform"]).submit()
-    plan = submit_cmd.execute(submit["payload"])
-    return plan
+async def submit_activity(submit: Dict[str, Any]) -> Plan:
+    submit_cmd = get_command(submit["platform"], "submit")
+    payload = await claims().aresolve(submit["payload"])
+    batcher = submit_batcher(submit["platform"])
+    if batcher is not None:
+        plan: Plan = await dispatch.run_blocking(batcher.submit, payload)
+    else:
+        plan = await run_limited(submit["platform"], submit_cmd.execute, payload)
+    return await claims().aoffload(plan)
 
 @app.activity_trigger(input_name="args")
-def get_status_activity(plan: Dict[str, Any]) -> JobState:
-    status_cmd = get_platform_commands(plan["platform"]).status()
-    state: JobState = status_cmd.execute(plan["plan"])
-    return state
+async def submit_many_activity(args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Prepare each payload, then submit them with one `execute_many` call. Entries
+    are {"plan": ...} or {"error": ...} in payload order: an item that fails to
+    prepare or is rejected by the platform fails alone. With "cache", a cached
+    success comes back as {"state": ...} without being submitted, and submitted
+    entries carry the "cache_key" to store their result under.
+    """
+    platform = args["platform"]
+    prepare_cmd = get_command(platform, "prepare")
+    submit_cmd = get_command(platform, "submit")
+    cache = result_cache() if args.get("cache") and get_platform_commands(platform).cacheable else None
+
+    async def prepare(ref: Any) -> Payload:
+        return await run_limited(platform, prepare_cmd.execute, await claims().aresolve(ref))
+
+    entries: List[Dict[str, Any]] = []
+    prepared: List[Any] = []
+    for outcome in await asyncio.gather(*(prepare(ref) for ref in args["payloads"]), return_exceptions=True):
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
+        entry: Dict[str, Any] = {}
+        entries.append(entry)
+        if isinstance(outcome, Exception):
+            entry["error"] = f"{type(outcome).__name__}: {outcome}"
+            continue
+        if cache is not None:
+            entry["cache_key"] = cache_key(platform, outcome)
+            hit = await dispatch.run_blocking(cache.get, entry["cache_key"])
+            if hit is not None:
+                entries[-1] = {"state": hit}
+                continue
+        prepared.append((entry, outcome))
+
+    plans = await run_limited(platform, submit_cmd.execute_many, [p for _, p in prepared]) if prepared else []
+    for (entry, _), plan in zip(prepared, plans):
+        if isinstance(plan, Exception):
+            entry["error"] = f"{type(plan).__name__}: {plan}"
+        else:
+            entry["plan"] = await claims().aoffload(plan)
+    return entries
+
+@app.activity_trigger(input_name="args")
+async def get_status_activity(plan: Dict[str, Any]) -> JobState:
+    job_plan = await claims().aresolve(plan["plan"])
+    batcher = status_batcher(plan["platform"])
+    try:
+        if batcher is not None:
+            state: JobState = await dispatch.run_blocking(batcher.submit, job_plan)
+        else:
+            status_cmd = get_command(plan["platform"], "status")
+            state = await run_limited(plan["platform"], status_cmd.execute, job_plan)
+    except CircuitOpenError as e:
+        # The poll interval follows the circuit's reset timeout (clamped by the policy).
+        state = JobState(JobPhase.UNAVAILABLE, raw_status=None, message=str(e), next_poll_after_s=e.retry_after_s)
+    except Exception as e:
+        # An outage is not the job's fault: keep polling until the deadline.
+        if not is_outage(e):
+            raise
+        state = JobState(JobPhase.UNAVAILABLE, raw_status=None, message=f"{type(e).__name__}: {e}")
+    return await claims().aoffload_state(state)
+
+@app.activity_trigger(input_name="args")
+async def lookup_result_activity(args: Dict[str, Any]) -> Dict[str, Any]:
+    """{"key", "state"}: key is None when the platform or worker does not cache."""
+    cache = result_cache()
+    if cache is None or not get_platform_commands(args["platform"]).cacheable:
+        return {"key": None, "state": None}
+    payload = await claims().aresolve(args["payload"])
+    key = cache_key(args["platform"], payload)
+    return {"key": key, "state": await dispatch.run_blocking(cache.get, key)}
+
+@app.activity_trigger(input_name="args")
+async def store_result_activity(args: Dict[str, Any]) -> None:
+    cache = result_cache()
+    if cache is not None:
+        await dispatch.run_blocking(cache.put, args["key"], args["state"])
+
+@app.activity_trigger(input_name="args")
+async def callback_activity(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Delivery record (status, attempts, latency); see callbacks.CallbackDelivery."""
+    result = await claims().aresolve(args["result"])
+    return await callbacks.delivery().deliver(args["callback_url"], result)
 
 @app.activity_trigger(input_name="args")
-def callback_activity(args: Dict[str, Any]) -> None:
-    callback_url = args["callback_url"]
-    result = args["result"]
-    headers = {"Content-Type": "application/json"}
-    requests.post(callback_url, data=json.dumps(result), headers=headers, timeout=30)
+async def cancel_activity(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Best-effort: ask the platform to stop the plan's job. Returns {"cancelled",
+    "info"} or {"cancelled": False, "error"}; never fails the orchestration.
+    """
+    platform = args["platform"]
+    if getattr(get_platform_commands(platform), "cancel", None) is None:
+        return {"cancelled": False, "error": f"Platform '{platform}' cannot cancel jobs"}
+    cancel_cmd = get_command(platform, "cancel")
+    try:
+        info = await run_limited(platform, cancel_cmd.execute, await claims().aresolve(args["plan"]))
+    except Exception as e:
+        return {"cancelled": False, "error": f"{type(e).__name__}: {e}"}
+    return {"cancelled": True, "info": info}
 
+def wait_for_plan_status(
+    ctx, platform, checkpoint, policy: PollPolicy, max_polls=0, safety_net_s=None, cancellable=False
+) -> Optional[JobState]:
+    """
+    Poll until the plan is terminal or the checkpoint's deadline passes.
 
-def wait_for_plan_status(ctx, platform, plan, timeout_s, poll_s) -> JobState:
-    deadline = ctx.current_utc_datetime + timedelta(seconds=timeout_s)
+    `checkpoint` ({"plan", "deadline", "attempt"}) is updated in place, along
+    with the poll count and observation times `_record_summary` reads. When
+    `max_polls` wake-ups have run without a terminal state this returns None so
+    the caller can `continue_as_new` with the checkpoint.
+
+    With `safety_net_s` set, waits race a JOB_STATE_CHANGED external event
+    against a timer of that length; either one triggers the next poll. With
+    `cancellable`, waits also race CANCEL_REQUESTED, which ends polling with a
+    CANCELLED state.
+
+    Progress (see `_progress`) is published as the custom status before each
+    wait and on the final state, whenever it differs from the last one sent.
+    """
+    deadline = datetime.fromisoformat(checkpoint["deadline"])
+    polls = 0
+    job_state: Optional[JobState] = None
+    published: Optional[Dict[str, Any]] = None
 
     while True:
-        job_state: JobState = yield ctx.call_activity(
-            "get_status_activity",
-            {"platform": platform, "plan": plan}
-        )
+        if job_state is None:
+            checkpoint.setdefault("first_poll_at", ctx.current_utc_datetime.isoformat())
+            checkpoint["polls"] = checkpoint.get("polls", 0) + 1
+            job_state = yield ctx.call_activity(
+                "get_status_activity",
+                {"platform": platform, "plan": checkpoint["plan"]}
+            )
+        polls += 1
+        if job_state.cursor is not None:
+            checkpoint["plan"] = {**checkpoint["plan"], "cursor": job_state.cursor}
         if job_state.is_terminal:
             break
+        checkpoint["observed_at"] = ctx.current_utc_datetime.isoformat()
 
         now = ctx.current_utc_datetime
         if now >= deadline:
             job_state.phase = JobPhase.TIMEOUT
             break
 
-        yield ctx.create_timer(now + timedelta(seconds=poll_s))
+        events = [JOB_STATE_CHANGED] if safety_net_s is not None else []
+        if cancellable:
+            events.append(CANCEL_REQUESTED)
+        if safety_net_s is not None:
+            fire_at = min(now + timedelta(seconds=safety_net_s), deadline)
+        else:
+            delay = timedelta(seconds=policy.next_delay(checkpoint["attempt"], job_state))
+            checkpoint["attempt"] += 1
+            fire_at = min(now + delay, deadline)
+        published = _publish_progress(ctx, published, _progress(job_state))
+        event, data = yield from _wait_for_events(ctx, fire_at, events)
+        if event == CANCEL_REQUESTED:
+            reason = data.get("reason") if isinstance(data, dict) else None
+            job_state = JobState(JobPhase.CANCELLED, raw_status=None, message=reason or "Cancel requested")
+            break
+        job_state = None
+        if max_polls and polls >= max_polls:
+            return None
+    _publish_progress(ctx, published, _progress(job_state))
     return job_state
+
+
+def _progress(job_state: JobState) -> Dict[str, Any]:
+    """
+    Compact progress record; "active"/"total" are copied from raw_status when
+    the provider reports them (they survive JOBSTATE_DROP_RAW_STATUS). Poll
+    counts and times are left out: they change every wait, so publishing them
+    would rewrite the status each time or leave them stale.
+    """
+    record: Dict[str, Any] = {"phase": JobPhase(job_state.phase).value}
+    if isinstance(job_state.raw_status, dict):
+        record.update((k, job_state.raw_status[k]) for k in PROGRESS_KEYS if k in job_state.raw_status)
+    return record
+
+
+def _publish_progress(ctx, published: Optional[Dict[str, Any]], record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Set `record` as the custom status unless it equals the last one published; returns the record now published."""
+    if record == published:
+        return published
+    ctx.set_custom_status(record)
+    return record
+
+
+def _record_summary(ctx, platform: str, requested_at: Optional[str], checkpoint: Dict[str, Any], job_state: JobState) -> None:
+    """
+    Per-instance summary from orchestration timestamps, so replays compute the
+    same values; emitted only outside replay, i.e. once per instance.
+
+    detection_lag_s is an upper bound: the time since the job was last seen
+    non-terminal.
+    """
+    # Checkpoints written before these timestamps existed are not summarized.
+    if ctx.is_replaying or "started_at" not in checkpoint:
+        return
+    now = ctx.current_utc_datetime
+    tags = {"platform": platform, "phase": JobPhase(job_state.phase).value}
+    started_at = datetime.fromisoformat(checkpoint["started_at"])
+    observed_at = datetime.fromisoformat(checkpoint.get("observed_at") or checkpoint["started_at"])
+    sink = metrics()
+    sink.record("orchestration.polls", checkpoint.get("polls", 0), tags)
+    sink.record("orchestration.wall_s", (now - started_at).total_seconds(), tags)
+    sink.record("orchestration.detection_lag_s", max(0.0, (now - observed_at).total_seconds()), tags)
+    if requested_at and checkpoint.get("first_poll_at"):
+        first_poll_at = datetime.fromisoformat(checkpoint["first_poll_at"])
+        queued = (first_poll_at - datetime.fromisoformat(requested_at)).total_seconds()
+        sink.record("orchestration.queue_to_first_poll_s", max(0.0, queued), tags)
+
+
+def _wait_for_events(ctx, fire_at: datetime, names: List[str]):
+    """Wait until `fire_at` or the first of the `names` external events; returns (name or None, data)."""
+    if not names:
+        yield ctx.create_timer(fire_at)
+        return None, None
+    events = [ctx.wait_for_external_event(name) for name in names]
+    timer = ctx.create_timer(fire_at)
+    winner = yield ctx.task_any([*events, timer])
+    for name, event in zip(names, events):
+        if winner == event:
+            timer.cancel()
+            return name, event.result
+    return None, None
+
@@ -0,0 +1,137 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+import aiohttp
+
+from .http_pool import PoolPolicy, _host_key, policy_for
+
+# One session per (event loop, host): aiohttp sessions are bound to the loop
+# that created them, and the Functions worker keeps a single long-lived loop.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, aiohttp.ClientSession]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status: int, url: str, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+        self.headers = headers or {}
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    url: str
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise HTTPStatusError(self.status, self.url, self.headers)
+
+
+def session_for(url: str) -> aiohttp.ClientSession:
+    """
+    The running loop's keep-alive session for the host of `url`. Connections
+    are capped by HTTP_ASYNC_LIMIT (default 1000) rather than a thread count.
+    """
+    loop = asyncio.get_running_loop()
+    by_host = _sessions.setdefault(loop, {})
+    key = _host_key(url)
+    session = by_host.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=int(os.environ.get("HTTP_ASYNC_LIMIT") or 1000))
+        session = by_host[key] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+def _timeout(policy: PoolPolicy) -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(sock_connect=policy.connect_timeout, sock_read=policy.read_timeout)
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    try:
+        return float(headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def request(method: str, url: str, **kwargs) -> Response:
+    """
+    Read the whole response on the shared session. Retries follow the host's
+    PoolPolicy like the sync pool's urllib3 Retry: failed connects for any
+    verb (nothing was sent), dropped connections, timeouts and
+    `status_forcelist` answers for idempotent verbs only, with exponential
+    backoff or the server's Retry-After.
+    """
+    policy = policy_for(url)
+    idempotent = method.upper() in policy.allowed_methods
+    session = session_for(url)
+    attempt = 0
+    while True:
+        delay: Optional[float] = None
+        try:
+            async with session.request(method, url, timeout=_timeout(policy), **kwargs) as res:
+                body = await res.read()
+                response = Response(res.status, res.headers, body, str(res.url))
+        except aiohttp.ClientConnectorError:
+            if attempt >= policy.retries:
+                raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if not idempotent or attempt >= policy.retries:
+                raise
+        else:
+            if response.status not in policy.status_forcelist or not idempotent or attempt >= policy.retries:
+                return response
+            delay = _retry_after(response.headers)
+        if delay is None:
+            delay = policy.backoff_factor * (2 ** attempt)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def get(url: str, **kwargs) -> Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> Response:
+    return await request("POST", url, **kwargs)
+
+
+async def close() -> None:
+    """Close the running loop's sessions."""
+    await _close_sessions(_sessions.pop(asyncio.get_running_loop(), {}))
+
+
+def close_all(timeout_s: float = 5.0) -> None:
+    """
+    Close every loop's sessions from outside those loops, e.g. at interpreter
+    exit. A loop still running elsewhere closes its own sessions; sessions of
+    an already closed loop are dropped, their sockets go with the process.
+    """
+    for loop in list(_sessions.keys()):
+        by_host = _sessions.pop(loop, {})
+        if loop.is_closed() or not by_host:
+            continue
+        if loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(_close_sessions(by_host), loop).result(timeout_s)
+            except concurrent.futures.TimeoutError:
+                pass
+        else:
+            loop.run_until_complete(_close_sessions(by_host))
+
+
+async def _close_sessions(by_host: Dict[str, aiohttp.ClientSession]) -> None:
+    for session in by_host.values():
+        await session.close()
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import register_observer
+from .registry import get_platform_commands
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, platform: str, retry_after_s: float):
+        super().__init__(f"Circuit open for platform '{platform}'; retry in {retry_after_s:.0f}s")
+        self.platform = platform
+        self.retry_after_s = retry_after_s
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects calls
+    for `reset_timeout_s`. Then up to `half_open_max_calls` probes go through:
+    a successful probe closes the circuit, a failed one reopens it. Probes
+    that report nothing within `reset_timeout_s` are written off, so a lost
+    probe cannot hold the circuit half-open.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.platform = platform
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probed_at = 0.0
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+
+    def _move(self, state: str) -> None:
+        # Caller holds the lock.
+        name = f"{self.state}->{state}"
+        self.transitions[name] = self.transitions.get(name, 0) + 1
+        self.state = state
+        if state == OPEN:
+            self._opened_at = self._clock()
+        self._probes = 0
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go to the backend now."""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout_s - self._clock()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.platform, remaining)
+                self._move(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                now = self._clock()
+                if self._probes >= self.half_open_max_calls and now - self._probed_at < self.reset_timeout_s:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.platform, self._probed_at + self.reset_timeout_s - now)
+                if self._probes >= self.half_open_max_calls:
+                    self._probes = 0
+                self._probes += 1
+                self._probed_at = now
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self.state != CLOSED:
+                self._move(CLOSED)
+
+    def on_unrelated(self) -> None:
+        """The call failed for a reason that says nothing about the backend's health."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self._move(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+            }
+
+
+_lock = threading.Lock()
+_breakers: Dict[str, Optional[CircuitBreaker]] = {}
+
+
+def breaker_for(platform: str) -> Optional[CircuitBreaker]:
+    """
+    Worker-wide breaker for `platform`, from the Provider's
+    `breaker_failure_threshold` / `breaker_reset_timeout_s`, overridden by
+    <PLATFORM>_BREAKER_FAILURES / _BREAKER_RESET_S. A threshold of 0 disables it.
+    """
+    key = platform.lower()
+    with _lock:
+        if key not in _breakers:
+            prov = get_platform_commands(platform)
+            env = key.upper().replace("-", "_")
+            threshold = int(os.environ.get(f"{env}_BREAKER_FAILURES") or prov.breaker_failure_threshold)
+            reset_s = float(os.environ.get(f"{env}_BREAKER_RESET_S") or prov.breaker_reset_timeout_s)
+            _breakers[key] = (
+                CircuitBreaker(key, failure_threshold=threshold, reset_timeout_s=reset_s) if threshold > 0 else None
+            )
+        return _breakers[key]
+
+
+def all_stats() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        breakers = {k: b for k, b in _breakers.items() if b is not None}
+    return {k: b.stats() for k, b in breakers.items()}
+
+
+def reset() -> None:
+    with _lock:
+        _breakers.clear()
+
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _observe_state():
+    for platform, stats in all_stats().items():
+        yield _STATE_VALUES[stats["state"]], {"platform": platform}
+
+
+def _observe_rejected():
+    for platform, stats in all_stats().items():
+        yield stats["rejected"], {"platform": platform}
+
+
+def _observe_transitions():
+    for platform, stats in all_stats().items():
+        for transition, count in stats["transitions"].items():
+            yield count, {"platform": platform, "transition": transition}
+
+
+# 0 closed, 1 half-open, 2 open.
+register_observer("breaker.state", _observe_state)
+register_observer("breaker.rejected", _observe_rejected)
+register_observer("breaker.transitions", _observe_transitions)
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from . import async_http, codec
+from .http_pool import _host_key
+from .limits import Limiter
+from .metrics import metrics
+
+_HEADERS = {"Content-Type": "application/json"}
+# Receiver answers worth another attempt; any other 4xx is final.
+_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+Delivery = Dict[str, Any]
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.items: List[Tuple[Any, asyncio.Future]] = []
+        self.full = asyncio.Event()
+
+
+class CallbackDelivery:
+    """
+    POSTs job results to callback URLs on the shared aiohttp sessions.
+
+    Each destination host gets at most `max_in_flight` POSTs at a time; a
+    delivery waiting to retry holds no slot. Attempts that get no response,
+    408, 429 or 5xx are retried up to `retries` times with exponential backoff
+    from `backoff_s`, or after the receiver's Retry-After. With `batch_window_s`, results for the same URL that arrive
+    within the window go out as one POST of {"results": [...]}, up to `max_batch`.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = 3,
+        backoff_s: float = 0.5,
+        max_backoff_s: float = 30.0,
+        max_in_flight: int = 8,
+        batch_window_s: float = 0.0,
+        max_batch: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.max_in_flight = max_in_flight
+        self.batch_window_s = batch_window_s
+        self.max_batch = max_batch
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, Limiter] = {}
+        self._batches: Dict[str, _Batch] = {}
+        self._senders: Set[asyncio.Task] = set()
+        self.delivered = 0
+        self.failed = 0
+        self.posts = 0
+        self.attempts = 0
+        self.latency_s_total = 0.0
+        self.latency_s_max = 0.0
+
+    def _limiter(self, url: str) -> Limiter:
+        key = _host_key(url)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = Limiter(max_in_flight=self.max_in_flight)
+            return limiter
+
+    async def deliver(self, url: str, result: Any) -> Delivery:
+        """
+        Deliver `result` to `url`. Returns {"url", "delivered", "status",
+        "attempts", "latency_s", "batch_size", "error"}; failures are reported
+        there rather than raised.
+        """
+        if self.batch_window_s <= 0:
+            return await self._post(url, codec.dumps_bytes(result), 1)
+        batch = self._batches.get(url)
+        if batch is None:
+            batch = self._batches[url] = _Batch()
+            sender = asyncio.ensure_future(self._send_batch(url, batch))
+            self._senders.add(sender)
+            sender.add_done_callback(self._senders.discard)
+        fut = asyncio.get_running_loop().create_future()
+        batch.items.append((result, fut))
+        if len(batch.items) >= self.max_batch:
+            # Later results start a new batch while this one is sent.
+            del self._batches[url]
+            batch.full.set()
+        return await fut
+
+    async def _send_batch(self, url: str, batch: _Batch) -> None:
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.batch_window_s)
+        except asyncio.TimeoutError:
+            pass
+        if self._batches.get(url) is batch:
+            del self._batches[url]
+        try:
+            body = codec.dumps_bytes({"results": [result for result, _ in batch.items]})
+            delivery = await self._post(url, body, len(batch.items))
+        except BaseException as e:
+            for _, fut in batch.items:
+                if not fut.done():
+                    fut.set_exception(e)
+            raise
+        for _, fut in batch.items:
+            if not fut.done():
+                fut.set_result(delivery)
+
+    async def _post(self, url: str, body: bytes, batch_size: int) -> Delivery:
+        started = self._clock()
+        attempts, status, error = 0, None, None
+        limiter = self._limiter(url)
+        while True:
+            attempts += 1
+            delay: Optional[float] = None
+            # One slot per attempt: backoff and Retry-After waits leave the host's
+            # slots to other deliveries.
+            async with limiter.aslot():
+                try:
+                    res = await async_http.post(url, data=body, headers=_HEADERS)
+                    status, error = res.status, None if res.status < 400 else f"HTTP {res.status}"
+                    if error is None or status not in _RETRY_STATUSES:
+                        break
+                    delay = async_http._retry_after(res.headers)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status, error = None, f"{type(e).__name__}: {e}"
+            if attempts > self.retries:
+                break
+            if delay is None:
+                delay = self.backoff_s * 2 ** (attempts - 1)
+            await asyncio.sleep(min(delay, self.max_backoff_s))
+
+        latency_s = self._clock() - started
+        with self._lock:
+            self.posts += 1
+            self.attempts += attempts
+            if error is None:
+                self.delivered += batch_size
+            else:
+                self.failed += batch_size
+            self.latency_s_total += latency_s
+            self.latency_s_max = max(self.latency_s_max, latency_s)
+        tags = {"outcome": "delivered" if error is None else "failed"}
+        sink = metrics()
+        sink.record("callback.duration_s", latency_s, tags)
+        sink.record("callback.attempts", attempts, tags)
+        sink.record("callback.batch_size", batch_size, tags)
+        return {
+            "url": url,
+            "delivered": error is None,
+            "status": status,
+            "attempts": attempts,
+            "latency_s": latency_s,
+            "batch_size": batch_size,
+            "error": error,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "posts": self.posts,
+                "attempts": self.attempts,
+                "latency_s_avg": self.latency_s_total / self.posts if self.posts else 0.0,
+                "latency_s_max": self.latency_s_max,
+            }
+
+
+_delivery: Optional[CallbackDelivery] = None
+_lock = threading.Lock()
+
+
+def delivery() -> CallbackDelivery:
+    """
+    Worker-wide callback delivery, configured by CALLBACK_RETRIES,
+    CALLBACK_BACKOFF_S, CALLBACK_MAX_IN_FLIGHT (per host), and CALLBACK_BATCH_MS /
+    CALLBACK_BATCH_MAX to batch results per URL (off by default).
+    """
+    global _delivery
+    with _lock:
+        if _delivery is None:
+            _delivery = CallbackDelivery(
+                retries=int(os.environ.get("CALLBACK_RETRIES", 3)),
+                backoff_s=float(os.environ.get("CALLBACK_BACKOFF_S") or 0.5),
+                max_in_flight=int(os.environ.get("CALLBACK_MAX_IN_FLIGHT") or 8),
+                batch_window_s=float(os.environ.get("CALLBACK_BATCH_MS") or 0) / 1000.0,
+                max_batch=int(os.environ.get("CALLBACK_BATCH_MAX") or 50),
+            )
+        return _delivery
+
+
+def reset() -> None:
+    global _delivery
+    with _lock:
+        _delivery = None
@@ -0,0 +1,216 @@
+import dataclasses
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import codec
+from .dispatch import run_blocking
+from .state import JobState
+from .ttlcache import TTLCache
+
+CLAIM = "$claim"
+
+
+class BlobStore(ABC):
+    """Byte store keyed by hex digests; `get` raises KeyError for a missing key."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class LocalFileStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class AzureBlobStore(BlobStore):
+    """Azure Blob Storage (or Azurite) container; needs `azure-storage-blob`."""
+
+    def __init__(self, connection_string: str, container: str):
+        from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+        from azure.storage.blob import ContainerClient
+
+        self._exists_error = ResourceExistsError
+        self._not_found_error = ResourceNotFoundError
+        self._container = ContainerClient.from_connection_string(connection_string, container)
+        try:
+            self._container.create_container()
+        except ResourceExistsError:
+            pass
+
+    def put(self, key: str, data: bytes) -> None:
+        try:
+            self._container.upload_blob(key, data, overwrite=False)
+        except self._exists_error:
+            pass
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._container.download_blob(key).readall()
+        except self._not_found_error:
+            raise KeyError(key) from None
+
+    def delete(self, key: str) -> None:
+        try:
+            self._container.delete_blob(key)
+        except self._not_found_error:
+            pass
+
+
+def _dumps(value: Any) -> bytes:
+    return codec.dumps_bytes(value, sort_keys=True)
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and CLAIM in value
+
+
+class ClaimCheck:
+    """
+    Swaps JSON values larger than `threshold_bytes` for a small reference,
+    `{"$claim": <sha256>, "bytes": <size>}`, so only the reference is written
+    to (and replayed from) orchestration history.
+
+    Other keys next to `$claim` override the stored value's keys on resolve,
+    which lets the orchestrator add e.g. a poll cursor to an offloaded plan.
+    With no store every value passes through unchanged.
+    """
+
+    def __init__(self, store: Optional[BlobStore], threshold_bytes: int = 16384, cache_size: int = 256):
+        self.store = store
+        self.threshold_bytes = threshold_bytes
+        self._cache = TTLCache(maxsize=cache_size, ttl_s=3600)
+        self._lock = threading.Lock()
+        self.offloaded = 0
+        self.bytes_saved = 0
+        self.resolved = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def offload(self, value: Any) -> Any:
+        if self.store is None or value is None or is_ref(value):
+            return value
+        data = _dumps(value)
+        if len(data) <= self.threshold_bytes:
+            return value
+        # Content-addressed: identical values share one blob.
+        key = hashlib.sha256(data).hexdigest()
+        self.store.put(key, data)
+        ref = {CLAIM: key, "bytes": len(data)}
+        with self._lock:
+            self.offloaded += 1
+            self.bytes_saved += len(data) - len(_dumps(ref))
+        return ref
+
+    def resolve(self, value: Any) -> Any:
+        """Replace every reference in `value` (dicts, lists, JobStates) by its data."""
+        if is_ref(value):
+            if self.store is None:
+                raise RuntimeError("Claim-check reference found but CLAIM_CHECK_STORE is not configured")
+            key = value[CLAIM]
+            loaded = codec.loads(self._cache.get_or_load(key, lambda: self.store.get(key)))
+            with self._lock:
+                self.resolved += 1
+            extras = {k: v for k, v in value.items() if k not in (CLAIM, "bytes")}
+            return {**loaded, **extras} if extras else loaded
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        if isinstance(value, JobState):
+            return dataclasses.replace(value, raw_status=self.resolve(value.raw_status), output=self.resolve(value.output))
+        return value
+
+    def offload_state(self, state: JobState) -> JobState:
+        if self.store is None:
+            return state
+        return dataclasses.replace(state, raw_status=self.offload(state.raw_status), output=self.offload(state.output))
+
+    # Activities run on the event loop: only hop to the thread pool for real I/O.
+
+    async def aoffload(self, value: Any) -> Any:
+        return await run_blocking(self.offload, value) if self.enabled else value
+
+    async def aresolve(self, value: Any) -> Any:
+        return await run_blocking(self.resolve, value) if self.enabled else value
+
+    async def aoffload_state(self, state: JobState) -> JobState:
+        return await run_blocking(self.offload_state, state) if self.enabled else state
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"offloaded": self.offloaded, "bytes_saved": self.bytes_saved, "resolved": self.resolved}
+
+
+def store_from_env(prefix: str = "CLAIM_CHECK", container: str = "claim-checks") -> Optional[BlobStore]:
+    """
+    {prefix}_STORE: unset disables the store; `azure` uses the container
+    {prefix}_CONTAINER (default `container`) of {prefix}_CONNECTION or
+    AzureWebJobsStorage; anything else is a local directory (`file://` optional).
+    """
+    spec = os.environ.get(f"{prefix}_STORE")
+    if not spec:
+        return None
+    if spec == "azure":
+        conn = os.environ.get(f"{prefix}_CONNECTION") or os.environ["AzureWebJobsStorage"]
+        return AzureBlobStore(conn, os.environ.get(f"{prefix}_CONTAINER") or container)
+    return LocalFileStore(spec[len("file://"):] if spec.startswith("file://") else spec)
+
+
+_claims: Optional[ClaimCheck] = None
+_claims_lock = threading.Lock()
+
+
+def claims() -> ClaimCheck:
+    """Worker-wide claim check configured from the environment."""
+    global _claims
+    with _claims_lock:
+        if _claims is None:
+            _claims = ClaimCheck(
+                store_from_env(),
+                threshold_bytes=int(os.environ.get("CLAIM_CHECK_THRESHOLD_BYTES") or 16384),
+            )
+        return _claims
+
+
+def reset() -> None:
+    global _claims
+    with _claims_lock:
+        _claims = None
@@ -0,0 +1,165 @@
+import inspect
+import os
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .breaker import breaker_for
+from .limits import limiter_for, settle
+from .commands import SubmitCommand
+from .registry import get_command, get_platform_commands
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Merges concurrent single-item calls into `execute_many` calls.
+
+    The first caller of a window becomes the leader: it waits up to `window_s`
+    (or until `max_batch` items are queued), then runs one batch and resolves
+    every caller's future. Items queued meanwhile are handed to the oldest
+    waiting caller, which leads the next batch straight away, so under steady
+    load every leader still returns after its own batch. Callers block only on
+    their own result; a failing batch raises the same exception in every caller
+    of that batch, and an exception returned in place of one item's result is
+    raised in its caller only.
+    """
+
+    def __init__(self, execute_many: Callable[[List[T]], List[R]], *, window_s: float = 0.02, max_batch: int = 100):
+        self._execute_many = execute_many
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[T, Future]] = []
+        self._leader = False
+        self._successor: Optional[Future] = None
+        self.items = 0
+        self.batches = 0
+
+    def submit(self, item: T) -> R:
+        fut: Future = Future()
+        with self._cond:
+            self._pending.append((item, fut))
+            self.items += 1
+            fresh = not self._leader
+            if fresh:
+                self._leader = True
+            elif len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+            lead = fresh
+            if not lead:
+                self._cond.wait_for(lambda: fut.done() or self._successor is fut)
+                lead = not fut.done()
+                if lead:
+                    self._successor = None
+        if lead:
+            self._lead(fresh)
+        return fut.result()
+
+    def _lead(self, fresh: bool) -> None:
+        # A fresh leader opens the window; a successor's items already waited out the last batch.
+        with self._cond:
+            if fresh:
+                self._cond.wait_for(lambda: len(self._pending) >= self.max_batch, timeout=self.window_s)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            self.batches += 1
+        try:
+            self._run(batch)
+        finally:
+            with self._cond:
+                if self._pending:
+                    self._successor = self._pending[0][1]
+                else:
+                    self._leader = False
+                self._cond.notify_all()
+
+    def _run(self, batch: List[Tuple[T, Future]]) -> None:
+        try:
+            results = self._execute_many([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"execute_many returned {len(results)} results for {len(batch)} items")
+        except BaseException as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        for (_, fut), result in zip(batch, results):
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"items": self.items, "batches": self.batches}
+
+
+_lock = threading.Lock()
+_batchers: Dict[Tuple[str, str], Optional[MicroBatcher]] = {}
+
+
+def _batcher(platform: str, kind: str, env: str) -> Optional[MicroBatcher]:
+    window_ms = float(os.environ.get(f"{env}_MS") or 0)
+    if window_ms <= 0:
+        return None
+    key = (platform.lower(), kind)
+    with _lock:
+        if key not in _batchers:
+            cmd = get_command(platform, kind)
+            _batchers[key] = None if inspect.iscoroutinefunction(cmd.execute_many) else MicroBatcher(
+                _limited(platform, cmd.execute_many),
+                window_s=window_ms / 1000.0,
+                max_batch=int(os.environ.get(f"{env}_MAX_BATCH") or 100),
+            )
+        return _batchers[key]
+
+
+def status_batcher(platform: str) -> Optional[MicroBatcher]:
+    """
+    Worker-wide status coalescer for `platform`, or None when disabled.
+    Enabled by STATUS_COALESCE_MS (window) with STATUS_COALESCE_MAX_BATCH.
+    Async status commands are never coalesced: waiting on them holds no thread.
+    """
+    return _batcher(platform, "status", "STATUS_COALESCE")
+
+
+def submit_batcher(platform: str) -> Optional[MicroBatcher]:
+    """
+    Worker-wide submit coalescer, as `status_batcher` with SUBMIT_COALESCE_MS
+    and SUBMIT_COALESCE_MAX_BATCH. Only providers that override
+    `SubmitCommand.execute_many` are coalesced; the default loops per item.
+    """
+    prov_submit = get_platform_commands(platform).submit
+    if prov_submit.execute_many is SubmitCommand.execute_many:
+        return None
+    return _batcher(platform, "submit", "SUBMIT_COALESCE")
+
+
+def _limited(platform: str, execute_many: Callable[[List[T]], List[R]]) -> Callable[[List[T]], List[R]]:
+    """One breaker check and limiter slot per backend batch call rather than per coalesced item."""
+    limiter, breaker = limiter_for(platform), breaker_for(platform)
+    if limiter is None and breaker is None:
+        return execute_many
+
+    def run(items: List[T]) -> List[R]:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            if limiter is None:
+                results = execute_many(items)
+            else:
+                with limiter.slot():
+                    results = execute_many(items)
+        except BaseException as e:
+            settle(limiter, breaker, e)
+            raise
+        settle(limiter, breaker, None)
+        return results
+    return run
+
+
+def reset() -> None:
+    with _lock:
+        _batchers.clear()
@@ -0,0 +1,40 @@
+import hashlib
+import json
+from typing import Any, Union
+
+try:  # optional fast backend
+    import orjson
+except ImportError:  # pragma: no cover - exercised where orjson is absent
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    # Public (long-key) form for objects leaving the system, e.g. callbacks.
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(value: Any, *, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(value, default=_default, option=option)
+    return json.dumps(value, default=_default, sort_keys=sort_keys, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> str:
+    return dumps_bytes(value, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def canonical_hash(value: Any) -> str:
+    """sha256 hex digest of `value`'s key-sorted compact JSON encoding."""
+    return hashlib.sha256(dumps_bytes(value, sort_keys=True)).hexdigest()
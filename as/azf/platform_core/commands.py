@@ -1,27 +1,127 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, TypeAlias
+from typing import Any, Dict, List, TypeAlias, TypedDict, Union
 from .state import JobState  # Ensure this module exists alongside this file
 
-Plan: TypeAlias = Dict[str, Any]
+class Plan(TypedDict, total=False):
+    """
+    What submit returns and every status poll receives. Stays a plain dict on
+    the wire so providers can add their own keys (e.g. MLflow's experiment_id).
+    """
+    platform: str
+    job_id: str
+    aux: Dict[str, Any]
+    cursor: Any
+
 Payload: TypeAlias = Dict[str, Any]
 Info: TypeAlias = Dict[str, Any]
 
-class PrepareCommand(ABC):
+class Command(ABC):
+    """
+    Commands are instantiated once per worker and reused across activity
+    executions, so `execute` must be safe to call from several threads.
+    """
+
+    def warm_up(self) -> None:
+        """Acquire expensive resources ahead of the first execution."""
+
+    def close(self) -> None:
+        """Release resources on worker shutdown."""
+
+class PrepareCommand(Command):
     @abstractmethod
     def execute(self, payload: Payload) -> Payload:
         ...
 
-class SubmitCommand(ABC):
+class PassThroughPrepare(PrepareCommand):
+    def execute(self, payload: Payload) -> Payload:
+        return payload
+
+def _or_error(fn, item):
+    try:
+        return fn(item)
+    except Exception as e:
+        return e
+
+def _reraise_base(outcome):
+    """A gathered outcome, re-raising cancellation and other non-Exception BaseExceptions."""
+    if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+class SubmitCommand(Command):
     @abstractmethod
     def execute(self, payload: Payload) -> Plan:
         ...
 
-class GetStatusCommand(ABC):
+    def execute_many(self, payloads: List[Payload]) -> List[Union[Plan, Exception]]:
+        """
+        Plans for several payloads, in order; a failed item gets its exception
+        in place of a plan so it does not fail the others. Override to use a
+        backend batch API.
+        """
+        return [_or_error(self.execute, payload) for payload in payloads]
+
+class GetStatusCommand(Command):
     @abstractmethod
     def execute(self, plan: Plan) -> JobState:
         ...
 
-class CallbackCommand(ABC):
+    def execute_many(self, plans: List[Plan]) -> List[Union[JobState, Exception]]:
+        """
+        Status for several plans, in order; as with `SubmitCommand.execute_many`,
+        a failed item gets its exception in place of a state. Override to use a
+        backend batch API.
+        """
+        return [_or_error(self.execute, plan) for plan in plans]
+
+class CallbackCommand(Command):
     @abstractmethod
     def execute(self, job_state: JobState) -> Info:
         ...
+
+class CancelCommand(Command):
+    @abstractmethod
+    def execute(self, plan: Plan) -> Info:
+        """Stop the plan's backend job. Cancelling a finished job must not raise."""
+        ...
+
+
+# Async variants run on the worker's event loop instead of the sync command
+# pool, so a command awaiting the network does not hold a thread. They must
+# not block: offload blocking calls with `dispatch.run_blocking`.
+
+class AsyncPrepareCommand(Command):
+    @abstractmethod
+    async def execute(self, payload: Payload) -> Payload:
+        ...
+
+class AsyncSubmitCommand(Command):
+    @abstractmethod
+    async def execute(self, payload: Payload) -> Plan:
+        ...
+
+    async def execute_many(self, payloads: List[Payload]) -> List[Union[Plan, Exception]]:
+        """Same contract as `SubmitCommand.execute_many`, submitted concurrently."""
+        outcomes = await asyncio.gather(*(self.execute(p) for p in payloads), return_exceptions=True)
+        return [_reraise_base(outcome) for outcome in outcomes]
+
+class AsyncGetStatusCommand(Command):
+    @abstractmethod
+    async def execute(self, plan: Plan) -> JobState:
+        ...
+
+    async def execute_many(self, plans: List[Plan]) -> List[Union[JobState, Exception]]:
+        """Same contract as `GetStatusCommand.execute_many`, polled concurrently."""
+        outcomes = await asyncio.gather(*(self.execute(plan) for plan in plans), return_exceptions=True)
+        return [_reraise_base(outcome) for outcome in outcomes]
+
+class AsyncCallbackCommand(Command):
+    @abstractmethod
+    async def execute(self, job_state: JobState) -> Info:
+        ...
+
+class AsyncCancelCommand(Command):
+    @abstractmethod
+    async def execute(self, plan: Plan) -> Info:
+        ...
@@ -0,0 +1,43 @@
+import asyncio
+import functools
+import inspect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def executor() -> ThreadPoolExecutor:
+    """Bounded pool for sync commands; sized by SYNC_COMMAND_THREADS (default 32)."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("SYNC_COMMAND_THREADS") or 32),
+                thread_name_prefix="sync-command",
+            )
+        return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking call on the bounded pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def invoke(method: Callable[..., Any], *args) -> Any:
+    """Await `method` if it is a coroutine function, else run it on the pool."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_blocking(method, *args)
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        pool, _executor = _executor, None
+    if pool is not None:
+        pool.shutdown(wait=False)
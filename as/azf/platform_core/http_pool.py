@@ -0,0 +1,111 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class PoolPolicy:
+    pool_maxsize: int = 10
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    retries: int = 2
+    backoff_factor: float = 0.2
+    status_forcelist: Tuple[int, ...] = (502, 503, 504)
+    # POST is not idempotent: only idempotent verbs are retried by default.
+    allowed_methods: frozenset = field(default_factory=lambda: Retry.DEFAULT_ALLOWED_METHODS)
+
+    @classmethod
+    def from_env(cls) -> "PoolPolicy":
+        return cls(
+            pool_maxsize=int(_env_float("HTTP_POOL_MAXSIZE", cls.pool_maxsize)),
+            connect_timeout=_env_float("HTTP_CONNECT_TIMEOUT", cls.connect_timeout),
+            read_timeout=_env_float("HTTP_READ_TIMEOUT", cls.read_timeout),
+            retries=int(_env_float("HTTP_RETRIES", cls.retries)),
+            backoff_factor=_env_float("HTTP_BACKOFF_FACTOR", cls.backoff_factor),
+        )
+
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+_policies: Dict[str, PoolPolicy] = {}
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def configure(url: str, policy: PoolPolicy) -> None:
+    """Set the pool policy for the host of `url`; drops an existing session for it."""
+    key = _host_key(url)
+    with _lock:
+        _policies[key] = policy
+        session = _sessions.pop(key, None)
+    if session is not None:
+        session.close()
+
+
+def policy_for(url: str) -> PoolPolicy:
+    key = _host_key(url)
+    with _lock:
+        return _policies.get(key) or PoolPolicy.from_env()
+
+
+def session_for(url: str) -> requests.Session:
+    """Return the worker-wide keep-alive session for the host of `url`."""
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is not None:
+            return session
+        policy = _policies.get(key) or PoolPolicy.from_env()
+        retry = Retry(
+            total=policy.retries,
+            backoff_factor=policy.backoff_factor,
+            status_forcelist=policy.status_forcelist,
+            allowed_methods=policy.allowed_methods,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=policy.pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sessions[key] = session
+        return session
+
+
+def request(method: str, url: str, *, timeout: Optional[object] = None, **kwargs) -> requests.Response:
+    if timeout is None:
+        timeout = policy_for(url).timeout()
+    return session_for(url).request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def close_all() -> None:
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
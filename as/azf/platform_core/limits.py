@@ -0,0 +1,259 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+import requests
+
+from . import dispatch
+from .breaker import CircuitBreaker, breaker_for
+from .registry import get_platform_commands
+
+
+class Limiter:
+    """
+    Token bucket (`rate_per_s`, `burst`) plus an in-flight cap for one
+    platform's backend calls. Either limit may be None. `backoff` pauses the
+    bucket, e.g. for a 429's Retry-After, so every caller slows down at once.
+
+    Sync callers wait on a condition. Async callers queue FIFO on futures
+    that a release wakes, as `asyncio.Semaphore` does, plus a timed wait while
+    the bucket refills, so a throttled coroutine neither holds a thread nor
+    spins the event loop.
+    """
+
+    def __init__(
+        self,
+        rate_per_s: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_s = rate_per_s
+        self.burst = burst or max(1, int(rate_per_s or 1))
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._refilled = clock()
+        self._paused_until = 0.0
+        # Async waiters in arrival order: [loop, future] of the current wait.
+        self._waiters: Deque[List[Any]] = deque()
+        self.in_flight = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.waited_s = 0.0
+
+    def _try_enter(self) -> Optional[float]:
+        """Admit the caller (returns 0), or return seconds to wait; None = wait for a release."""
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return None
+        if self.rate_per_s:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_per_s)
+            self._refilled = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate_per_s
+            self._tokens -= 1
+        self.in_flight += 1
+        self.admitted += 1
+        return 0.0
+
+    def _release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+            self._wake_head()
+
+    def _wake_head(self) -> None:
+        # Caller holds the lock; releases may come from any thread.
+        if self._waiters:
+            loop, future = self._waiters[0]
+            if future is not None:
+                loop.call_soon_threadsafe(_resolve, future)
+
+    @contextmanager
+    def slot(self):
+        started = self._clock()
+        with self._cond:
+            while (wait := self._try_enter()) != 0:
+                self._cond.wait(wait)
+            self.waited_s += self._clock() - started
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        started = self._clock()
+        loop = asyncio.get_running_loop()
+        entry: Optional[List[Any]] = None
+        try:
+            while True:
+                with self._cond:
+                    # Only the head of the queue (or a caller when none is queued) may enter.
+                    at_head = entry is None and not self._waiters or bool(self._waiters) and self._waiters[0] is entry
+                    wait = self._try_enter() if at_head else None
+                    if wait == 0:
+                        if entry is not None:
+                            self._waiters.popleft()
+                            self._wake_head()
+                        self.waited_s += self._clock() - started
+                        break
+                    if entry is None:
+                        entry = [loop, None]
+                        self._waiters.append(entry)
+                    future = entry[1] = loop.create_future()
+                # None: wait for a release; otherwise the bucket refills after `wait` seconds.
+                await asyncio.wait([future], timeout=wait)
+        except BaseException:
+            with self._cond:
+                if entry is not None and entry in self._waiters:
+                    was_head = self._waiters[0] is entry
+                    self._waiters.remove(entry)
+                    if was_head:
+                        self._wake_head()
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def backoff(self, seconds: float) -> None:
+        with self._cond:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._tokens = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "in_flight": self.in_flight,
+                "waited_s": self.waited_s,
+            }
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _setting(name: str, cast, default):
+    """Env override of a Provider default; unset keeps the default, 0 disables the limit."""
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    return cast(value) or None
+
+
+_lock = threading.Lock()
+_limiters: Dict[str, Optional[Limiter]] = {}
+
+
+def limiter_for(platform: str) -> Optional[Limiter]:
+    """
+    Worker-wide limiter for `platform`, or None when it has no limits. The
+    Provider's `rate_limit_per_s`, `rate_limit_burst` and `max_in_flight` are
+    overridden by <PLATFORM>_RATE_LIMIT_PER_S, _RATE_LIMIT_BURST, _MAX_IN_FLIGHT.
+    """
+    key = platform.lower()
+    with _lock:
+        if key not in _limiters:
+            prov = get_platform_commands(platform)
+            env = key.upper().replace("-", "_")
+            rate = _setting(f"{env}_RATE_LIMIT_PER_S", float, prov.rate_limit_per_s)
+            burst = _setting(f"{env}_RATE_LIMIT_BURST", int, prov.rate_limit_burst)
+            in_flight = _setting(f"{env}_MAX_IN_FLIGHT", int, prov.max_in_flight)
+            _limiters[key] = Limiter(rate, burst, in_flight) if (rate or in_flight) else None
+        return _limiters[key]
+
+
+def _http_error(exc: BaseException) -> Tuple[Optional[int], Any]:
+    """(status, headers) of a requests or async_http error; (None, None) otherwise."""
+    response = getattr(exc, "response", None)
+    if response is not None:
+        return response.status_code, response.headers
+    return getattr(exc, "status", None), getattr(exc, "headers", None)
+
+
+def throttle_delay(exc: BaseException) -> Optional[float]:
+    """Seconds to back off if `exc` is a 429 / 503 with Retry-After, else None."""
+    status, headers = _http_error(exc)
+    if status != 429 and not (status == 503 and headers and "Retry-After" in headers):
+        return None
+    try:
+        return float((headers or {}).get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+# Failures to reach the backend at all; other exceptions without an HTTP status
+# (bad payloads, missing fields, undecodable bodies) are not outages.
+_TRANSPORT_ERRORS = (
+    requests.ConnectionError, requests.Timeout, aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, TimeoutError,
+)
+
+
+def is_outage(exc: BaseException) -> bool:
+    """True for transport failures and 5xx / 408 answers."""
+    status = _http_error(exc)[0]
+    if status is not None:
+        return status >= 500 or status == 408
+    return isinstance(exc, _TRANSPORT_ERRORS)
+
+
+def settle(limiter: Optional[Limiter], breaker: Optional[CircuitBreaker], exc: Optional[BaseException]) -> None:
+    """
+    Feed a call's outcome back: throttling pauses the limiter, and only
+    outages (see `is_outage`) count against the breaker. A backend that
+    answered with a 4xx or 429 is up; any other error leaves it untouched.
+    """
+    delay = throttle_delay(exc) if exc is not None else None
+    if delay is not None and limiter is not None:
+        limiter.backoff(delay)
+    if breaker is None:
+        return
+    if exc is None or delay is not None:
+        breaker.on_success()
+    elif is_outage(exc):
+        breaker.on_failure()
+    elif _http_error(exc)[0] is not None:
+        breaker.on_success()
+    else:
+        breaker.on_unrelated()
+
+
+async def run_limited(platform: str, method: Callable[..., Any], *args) -> Any:
+    """
+    `dispatch.invoke` behind the platform's circuit breaker and limiter.
+    Raises CircuitOpenError without calling the backend while the circuit is open.
+    """
+    limiter, breaker = limiter_for(platform), breaker_for(platform)
+    if breaker is not None:
+        breaker.before_call()
+    try:
+        if limiter is None:
+            result = await dispatch.invoke(method, *args)
+        else:
+            async with limiter.aslot():
+                result = await dispatch.invoke(method, *args)
+    except BaseException as e:
+        # Cancellation included: a half-open probe must always be given back.
+        settle(limiter, breaker, e)
+        raise
+    settle(limiter, breaker, None)
+    return result
+
+
+def reset() -> None:
+    with _lock:
+        _limiters.clear()
@@ -0,0 +1,217 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:  # optional exporter
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - exercised where opentelemetry is absent
+    otel_metrics = otel_trace = None
+
+Tags = Dict[str, str]
+# Callback for an observable: yields (value, tags) pairs when metrics are read.
+Observer = Callable[[], Iterable[Tuple[float, Tags]]]
+
+
+class Metrics(ABC):
+    """Counters, histograms and observed gauges tagged by string key/values."""
+
+    @abstractmethod
+    def add(self, name: str, value: float, tags: Tags) -> None:
+        ...
+
+    @abstractmethod
+    def record(self, name: str, value: float, tags: Tags) -> None:
+        ...
+
+    @abstractmethod
+    def observe(self, name: str, observer: Observer) -> None:
+        ...
+
+    @contextmanager
+    def span(self, name: str, tags: Tags):
+        """Record the block's duration in `<name>.duration_s`, tagged with its outcome."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self.record(f"{name}.duration_s", time.perf_counter() - started, {**tags, "outcome": outcome})
+
+
+def _series(tags: Tags) -> str:
+    return ",".join(f"{k}={tags[k]}" for k in sorted(tags))
+
+
+class MemoryMetrics(Metrics):
+    """In-process registry; `snapshot()` reads it, e.g. from tests and benches."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._histograms: Dict[str, Dict[str, List[float]]] = {}
+        self._observers: Dict[str, Observer] = {}
+
+    def add(self, name: str, value: float, tags: Tags) -> None:
+        series = _series(tags)
+        with self._lock:
+            by_series = self._counters.setdefault(name, {})
+            by_series[series] = by_series.get(series, 0) + value
+
+    def record(self, name: str, value: float, tags: Tags) -> None:
+        series = _series(tags)
+        with self._lock:
+            h = self._histograms.setdefault(name, {}).get(series)
+            if h is None:
+                self._histograms[name][series] = [1, value, value, value]
+            else:
+                h[0] += 1
+                h[1] += value
+                h[2] = min(h[2], value)
+                h[3] = max(h[3], value)
+
+    def observe(self, name: str, observer: Observer) -> None:
+        with self._lock:
+            self._observers[name] = observer
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {name: dict(by_series) for name, by_series in self._counters.items()}
+            histograms = {
+                name: {s: {"count": h[0], "sum": h[1], "min": h[2], "max": h[3]} for s, h in by_series.items()}
+                for name, by_series in self._histograms.items()
+            }
+            observers = dict(self._observers)
+        gauges = {name: {_series(tags): value for value, tags in fn()} for name, fn in observers.items()}
+        return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+class OtelMetrics(Metrics):
+    """
+    Forwards to OpenTelemetry, by default through the global MeterProvider and
+    TracerProvider, so the exporter is whatever the host configured.
+    """
+
+    def __init__(self, meter_provider: Any = None, tracer_provider: Any = None) -> None:
+        self._meter = otel_metrics.get_meter("platform_core", meter_provider=meter_provider)
+        self._tracer = otel_trace.get_tracer("platform_core", tracer_provider=tracer_provider)
+        self._lock = threading.Lock()
+        self._instruments: Dict[str, Any] = {}
+
+    def _instrument(self, name: str, create: Callable[[str], Any]) -> Any:
+        inst = self._instruments.get(name)
+        if inst is None:
+            with self._lock:
+                inst = self._instruments.get(name)
+                if inst is None:
+                    inst = self._instruments[name] = create(name)
+        return inst
+
+    def add(self, name: str, value: float, tags: Tags) -> None:
+        self._instrument(name, self._meter.create_counter).add(value, tags)
+
+    def record(self, name: str, value: float, tags: Tags) -> None:
+        self._instrument(name, self._meter.create_histogram).record(value, tags)
+
+    def observe(self, name: str, observer: Observer) -> None:
+        def callback(options):
+            return [otel_metrics.Observation(value, tags) for value, tags in observer()]
+        self._instrument(name, lambda n: self._meter.create_observable_gauge(n, callbacks=[callback]))
+
+    @contextmanager
+    def span(self, name: str, tags: Tags):
+        with self._tracer.start_as_current_span(name, attributes=tags):
+            with super().span(name, tags):
+                yield
+
+
+_metrics: Optional[Metrics] = None
+_observers: Dict[str, Observer] = {}
+_lock = threading.Lock()
+
+
+def metrics() -> Metrics:
+    """
+    Worker-wide metrics. METRICS_BACKEND picks `otel` or `memory`; by default
+    OpenTelemetry is used when its API is installed.
+    """
+    global _metrics
+    with _lock:
+        if _metrics is None:
+            backend = os.environ.get("METRICS_BACKEND") or ("otel" if otel_metrics is not None else "memory")
+            _metrics = OtelMetrics() if backend == "otel" else MemoryMetrics()
+            for name, observer in _observers.items():
+                _metrics.observe(name, observer)
+        return _metrics
+
+
+def register_observer(name: str, observer: Observer) -> None:
+    """Publish a gauge read from `observer`; survives `reset`."""
+    with _lock:
+        _observers[name] = observer
+        sink = _metrics
+    if sink is not None:
+        sink.observe(name, observer)
+
+
+# Set while an instrumented command runs, so the calls it makes in turn (e.g.
+# `execute_many` looping over `execute`) are not measured a second time.
+_in_command: ContextVar[bool] = ContextVar("platform_core_in_command", default=False)
+
+
+def instrument(cmd: Any, platform: str, kind: str) -> Any:
+    """
+    Time `cmd.execute` / `execute_many` as `command.duration_s` and count them
+    in `command.calls`, tagged by platform, kind, method and outcome. Only the
+    outermost call is measured. Async methods stay coroutine functions.
+    """
+    for method in ("execute", "execute_many"):
+        fn = getattr(cmd, method, None)
+        if fn is not None:
+            setattr(cmd, method, _timed(fn, {"platform": platform, "kind": kind, "method": method}))
+    return cmd
+
+
+def _timed(fn: Callable[..., Any], tags: Tags) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def run_async(*args, **kwargs):
+            with _measured(tags):
+                return await fn(*args, **kwargs)
+        return run_async
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        with _measured(tags):
+            return fn(*args, **kwargs)
+    return run
+
+
+@contextmanager
+def _measured(tags: Tags):
+    if _in_command.get():
+        yield
+        return
+    token = _in_command.set(True)
+    sink = metrics()
+    outcome = "error"
+    try:
+        with sink.span("command", tags):
+            yield
+        outcome = "ok"
+    finally:
+        _in_command.reset(token)
+        sink.add("command.calls", 1, {**tags, "outcome": outcome})
+
+
+def reset() -> None:
+    global _metrics
+    with _lock:
+        _metrics = None
@@ -0,0 +1,93 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type
+
+from .state import JobState
+
+_POLICIES: Dict[str, Type["PollPolicy"]] = {}
+
+def poll_policy(name: str):
+    def _wrap(cls: Type[PollPolicy]):
+        _POLICIES[name.lower()] = cls
+        return cls
+    return _wrap
+
+
+def _unit(seed: str, attempt: int) -> float:
+    """Deterministic value in [0, 1) for (seed, attempt); safe to use under replay."""
+    digest = hashlib.sha256(f"{seed}:{attempt}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+class PollPolicy(ABC):
+    def __init__(self, *, jitter: float = 0.0, seed: str = ""):
+        if not 0 <= jitter < 1:
+            raise ValueError(f"jitter must be in [0, 1), got {jitter}")
+        self.jitter = jitter
+        self.seed = seed
+
+    @abstractmethod
+    def base_delay(self, attempt: int) -> float:
+        ...
+
+    def clamp(self, delay: float) -> float:
+        return max(0.0, delay)
+
+    def next_delay(self, attempt: int, job_state: Optional[JobState] = None) -> float:
+        """
+        Seconds to wait after poll number `attempt` (0-based). A provider hint
+        on the job state wins over the schedule. Jitter spreads the capped
+        delay over +/- `jitter` of it, narrowed to the caps, so delays stay
+        within them without piling up on either bound.
+        """
+        hint = getattr(job_state, "next_poll_after_s", None)
+        if hint is not None:
+            return self.clamp(float(hint))
+        delay = self.clamp(self.base_delay(attempt))
+        if self.jitter:
+            low = self.clamp(delay * (1 - self.jitter))
+            high = self.clamp(delay * (1 + self.jitter))
+            delay = low + (high - low) * _unit(self.seed, attempt)
+        return delay
+
+
+@poll_policy("fixed")
+class FixedPoll(PollPolicy):
+    def __init__(self, poll_s: float = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.poll_s = float(poll_s)
+
+    def base_delay(self, attempt: int) -> float:
+        return self.poll_s
+
+
+@poll_policy("exponential")
+class ExponentialPoll(PollPolicy):
+    def __init__(self, min_s: float = 2, max_s: float = 300, factor: float = 2.0, jitter: float = 0.2, **kwargs):
+        super().__init__(jitter=jitter, **kwargs)
+        self.min_s = float(min_s)
+        self.max_s = float(max_s)
+        self.factor = float(factor)
+
+    def base_delay(self, attempt: int) -> float:
+        # Cap the exponent so long waits don't overflow before clamping.
+        return self.min_s * self.factor ** min(attempt, 64)
+
+    def clamp(self, delay: float) -> float:
+        return min(self.max_s, max(self.min_s, delay))
+
+
+def make_poll_policy(spec: Optional[Dict[str, Any]], *, poll_s: float = 10, seed: str = "") -> PollPolicy:
+    """Build a policy from a request's `poll_policy` spec, e.g. {"kind": "exponential", "max_s": 120}."""
+    if not spec:
+        return FixedPoll(poll_s, seed=seed)
+    params = dict(spec)
+    kind = str(params.pop("kind", "fixed")).lower()
+    try:
+        cls = _POLICIES[kind]
+    except KeyError as e:
+        raise ValueError(f"Unsupported poll policy '{kind}'") from e
+    if cls is FixedPoll:
+        params.setdefault("poll_s", poll_s)
+    params.setdefault("seed", seed)
+    return cls(**params)
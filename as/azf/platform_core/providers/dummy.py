@@ -1,55 +1,164 @@
 import os
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 
-from ..tokens import get_graph_token
-from ..commands import PrepareCommand, SubmitCommand, GetStatusCommand, Plan
+from .. import http_pool
+from ..tokens import get_graph_token, _GRAPH_SCOPE
+from ..commands import PassThroughPrepare, SubmitCommand, GetStatusCommand, CancelCommand, Info, Plan
 from ..state import JobState, JobPhase
 from ..registry import platform, Provider
 
+def _poll_hint(res, body: Dict[str, Any]) -> Optional[float]:
+    hint = body.get("next_poll_after_s", res.headers.get("Retry-After"))
+    try:
+        return float(hint) if hint is not None else None
+    except (TypeError, ValueError):
+        return None
+
 class DummySubmit(SubmitCommand):
+    batch_size = 100
+
     def __init__(self):
-        pass
+        self.base = os.environ["DUMMY_BASE_URL"].rstrip("/")
+
+    def warm_up(self) -> None:
+        http_pool.session_for(self.base)
 
     def execute(self, payload: Dict[str, Any]) -> Plan:
-        base = os.environ["DUMMY_BASE_URL"].rstrip("/")
-        headers = {"Content-Type": "application/json", **get_graph_token()}
+        base = self.base
+        scopes = [_GRAPH_SCOPE]
+        headers = {"Content-Type": "application/json", **get_graph_token(scopes)}
 
-        res = requests.post(f"{base}/submit", json=payload, headers=headers, timeout=30)
+        res = http_pool.post(f"{base}/submit", json=payload, headers=headers)
         res.raise_for_status()
         job_id = (res.json() or {}).get("job_id")
         if not job_id:
             raise RuntimeError("Dummy submit did not return 'job_id'")
 
-        return {
-            "platform": "dummy",
-            "job_id": str(job_id),
-            "aux": {"base": base, "headers": headers},
-        }
+        return _plan("dummy", job_id, base, scopes)
+
+    def execute_many(self, payloads: List[Dict[str, Any]]) -> List[Union[Plan, Exception]]:
+        """
+        One `POST /submit/batch` per chunk of `batch_size` payloads. A chunk the
+        backend fails gives its exception to each of its items; plans from the
+        chunks it accepted are kept.
+        """
+        scopes = [_GRAPH_SCOPE]
+        headers = {"Content-Type": "application/json", **get_graph_token(scopes)}
+        results: List[Union[Plan, Exception]] = []
+        for start in range(0, len(payloads), self.batch_size):
+            chunk = payloads[start:start + self.batch_size]
+            try:
+                res = http_pool.post(f"{self.base}/submit/batch", json={"items": chunk}, headers=headers)
+                res.raise_for_status()
+                results.extend(_batch_plans("dummy", res.json(), len(chunk), self.base, scopes))
+            except Exception as e:
+                results.extend([e] * len(chunk))
+        return results
+
+def _plan(platform_name: str, job_id: Any, base: str, scopes: List[str]) -> Plan:
+    return {
+        "platform": platform_name,
+        "job_id": str(job_id),
+        # Only an auth reference is persisted; headers are resolved per poll.
+        "aux": {"base": base, "scopes": scopes},
+    }
+
+def _batch_plans(platform_name: str, body: Any, expected: int, base: str, scopes: List[str]) -> List[Union[Plan, Exception]]:
+    items = (body or {}).get("results") or []
+    if len(items) != expected:
+        raise RuntimeError(f"Dummy batch submit returned {len(items)} results for {expected} payloads")
+    return [
+        _plan(platform_name, item["job_id"], base, scopes) if item.get("job_id")
+        else RuntimeError(f"Dummy submit rejected payload: {item.get('error') or 'no job_id'}")
+        for item in items
+    ]
 
 class DummyGetStatus(GetStatusCommand):
+    batch_size = 100
+
     def execute(self, plan: Plan) -> JobState:
         base = plan["aux"]["base"]
-        headers = plan["aux"]["headers"]
+        headers = get_graph_token(plan["aux"].get("scopes") or [_GRAPH_SCOPE])
         job_id = plan["job_id"]
 
-        res = requests.get(f"{base}/status/{job_id}", headers=headers, timeout=15)
+        res = http_pool.get(f"{base}/status/{job_id}", headers=headers)
         res.raise_for_status()
         j = res.json() or {}
+        return _to_job_state(j, _poll_hint(res, j))
 
-        status = (j.get("status") or "").lower()
-        phase = {
-            "pending":   JobPhase.PENDING,
-            "running":   JobPhase.RUNNING,
-            "succeeded": JobPhase.SUCCEEDED,
-            "failed":    JobPhase.FAILED,
-            "error":     JobPhase.ERROR,
-        }.get(status, JobPhase.ERROR)
-        msg = j.get("message") if phase is not JobPhase.ERROR or status == "error" else f"Unknown status: {status}"
-        return JobState(phase, raw_status=j, message=msg)
+    def execute_many(self, plans: List[Plan]) -> List[Union[JobState, Exception]]:
+        """
+        One `GET /status?ids=...` per backend and chunk of `batch_size` jobs. A
+        malformed plan, or a chunk the backend fails, gets its exception in
+        place of a state; the other items are unaffected.
+        """
+        states: List[Union[JobState, Exception, None]] = [None] * len(plans)
+        for base, scopes, chunk, ids in _status_chunks(plans, self.batch_size, states):
+            try:
+                headers = get_graph_token(scopes)
+                res = http_pool.get(f"{base}/status", params={"ids": ids}, headers=headers)
+                res.raise_for_status()
+                _fill_states(states, plans, chunk, res)
+            except Exception as e:
+                for i in chunk:
+                    states[i] = e
+        return states
+
+def _status_chunks(
+    plans: List[Plan], batch_size: int, states: List[Any]
+) -> Iterator[Tuple[str, List[str], List[int], str]]:
+    """
+    (base, scopes, plan indexes, comma-joined job ids) per backend and chunk of
+    `batch_size` plans; a malformed plan gets its exception in `states` instead.
+    """
+    groups: Dict[Tuple[str, Tuple[str, ...]], List[int]] = {}
+    for i, plan in enumerate(plans):
+        try:
+            if not plan["job_id"]:
+                raise ValueError("Plan has no 'job_id'")
+            scopes = tuple(plan["aux"].get("scopes") or [_GRAPH_SCOPE])
+            groups.setdefault((plan["aux"]["base"], scopes), []).append(i)
+        except Exception as e:
+            states[i] = e
+    for (base, scopes), idxs in groups.items():
+        for start in range(0, len(idxs), batch_size):
+            chunk = idxs[start:start + batch_size]
+            yield base, list(scopes), chunk, ",".join(plans[i]["job_id"] for i in chunk)
+
+def _fill_states(states: List[Any], plans: List[Plan], chunk: List[int], res: Any) -> None:
+    """States for `chunk` from a `GET /status?ids=...` response; ids it does not know become ERROR."""
+    jobs = (res.json() or {}).get("jobs") or {}
+    for i in chunk:
+        j = jobs.get(plans[i]["job_id"])
+        if j is None:
+            states[i] = JobState(JobPhase.ERROR, raw_status=None, message=f"Unknown job: {plans[i]['job_id']}")
+        else:
+            states[i] = _to_job_state(j, _poll_hint(res, j))
+
+def _to_job_state(j: Dict[str, Any], hint: Optional[float]) -> JobState:
+    status = (j.get("status") or "").lower()
+    phase = {
+        "pending":   JobPhase.PENDING,
+        "running":   JobPhase.RUNNING,
+        "succeeded": JobPhase.SUCCEEDED,
+        "failed":    JobPhase.FAILED,
+        "error":     JobPhase.ERROR,
+        "cancelled": JobPhase.CANCELLED,
+    }.get(status, JobPhase.ERROR)
+    msg = j.get("message") if phase is not JobPhase.ERROR or status == "error" else f"Unknown status: {status}"
+    return JobState(phase, raw_status=j, message=msg, next_poll_after_s=hint)
+
+class DummyCancel(CancelCommand):
+    def execute(self, plan: Plan) -> Info:
+        base = plan["aux"]["base"]
+        headers = get_graph_token(plan["aux"].get("scopes") or [_GRAPH_SCOPE])
+        res = http_pool.post(f"{base}/cancel/{plan['job_id']}", headers=headers)
+        res.raise_for_status()
+        return res.json() or {}
 
 @platform("dummy")
 class DummyProvider(Provider):
-    prepare  = PrepareCommand
+    prepare  = PassThroughPrepare
     submit   = DummySubmit
     status   = DummyGetStatus
+    cancel   = DummyCancel
@@ -0,0 +1,82 @@
+import os
+from typing import Dict, Any, List, Union
+
+from .. import async_http
+from ..tokens import aget_graph_token, _GRAPH_SCOPE
+from ..commands import AsyncSubmitCommand, AsyncGetStatusCommand, AsyncCancelCommand, Info, Plan
+from ..state import JobState
+from ..registry import platform, Provider
+from .dummy import _batch_plans, _fill_states, _plan, _poll_hint, _status_chunks, _to_job_state
+
+class AsyncDummySubmit(AsyncSubmitCommand):
+    batch_size = 100
+
+    def __init__(self):
+        self.base = os.environ["DUMMY_BASE_URL"].rstrip("/")
+
+    async def execute(self, payload: Dict[str, Any]) -> Plan:
+        scopes = [_GRAPH_SCOPE]
+        headers = {"Content-Type": "application/json", **await aget_graph_token(scopes)}
+
+        res = await async_http.post(f"{self.base}/submit", json=payload, headers=headers)
+        res.raise_for_status()
+        job_id = (res.json() or {}).get("job_id")
+        if not job_id:
+            raise RuntimeError("Dummy submit did not return 'job_id'")
+
+        return _plan("dummy-async", job_id, self.base, scopes)
+
+    async def execute_many(self, payloads: List[Dict[str, Any]]) -> List[Union[Plan, Exception]]:
+        """Same batching as `DummySubmit.execute_many`, without holding a thread."""
+        scopes = [_GRAPH_SCOPE]
+        headers = {"Content-Type": "application/json", **await aget_graph_token(scopes)}
+        results: List[Union[Plan, Exception]] = []
+        for start in range(0, len(payloads), self.batch_size):
+            chunk = payloads[start:start + self.batch_size]
+            try:
+                res = await async_http.post(f"{self.base}/submit/batch", json={"items": chunk}, headers=headers)
+                res.raise_for_status()
+                results.extend(_batch_plans("dummy-async", res.json(), len(chunk), self.base, scopes))
+            except Exception as e:
+                results.extend([e] * len(chunk))
+        return results
+
+class AsyncDummyGetStatus(AsyncGetStatusCommand):
+    batch_size = 100
+
+    async def execute(self, plan: Plan) -> JobState:
+        base = plan["aux"]["base"]
+        headers = await aget_graph_token(plan["aux"].get("scopes") or [_GRAPH_SCOPE])
+
+        res = await async_http.get(f"{base}/status/{plan['job_id']}", headers=headers)
+        res.raise_for_status()
+        j = res.json() or {}
+        return _to_job_state(j, _poll_hint(res, j))
+
+    async def execute_many(self, plans: List[Plan]) -> List[Union[JobState, Exception]]:
+        """Same batching as `DummyGetStatus.execute_many`, without holding a thread."""
+        states: List[Union[JobState, Exception, None]] = [None] * len(plans)
+        for base, scopes, chunk, ids in _status_chunks(plans, self.batch_size, states):
+            try:
+                headers = await aget_graph_token(scopes)
+                res = await async_http.get(f"{base}/status", params={"ids": ids}, headers=headers)
+                res.raise_for_status()
+                _fill_states(states, plans, chunk, res)
+            except Exception as e:
+                for i in chunk:
+                    states[i] = e
+        return states
+
+class AsyncDummyCancel(AsyncCancelCommand):
+    async def execute(self, plan: Plan) -> Info:
+        base = plan["aux"]["base"]
+        headers = await aget_graph_token(plan["aux"].get("scopes") or [_GRAPH_SCOPE])
+        res = await async_http.post(f"{base}/cancel/{plan['job_id']}", headers=headers)
+        res.raise_for_status()
+        return res.json() or {}
+
+@platform("dummy-async")
+class AsyncDummyProvider(Provider):
+    submit   = AsyncDummySubmit
+    status   = AsyncDummyGetStatus
+    cancel   = AsyncDummyCancel
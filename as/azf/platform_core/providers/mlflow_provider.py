@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import mlflow
+from mlflow.exceptions import MlflowException
 from typing import Any, Dict, List, TypeAlias
 
-from .commands import (
+from ..commands import (
     PrepareCommand,
     SubmitCommand,
     GetStatusCommand,
     CallbackCommand,
+    CancelCommand,
 )
-from .registry import platform, Provider
-from .state import JobState, JobPhase
+from ..registry import platform, Provider
+from ..state import JobState, JobPhase
+from ..ttlcache import TTLCache
 
 
 Plan: TypeAlias = Dict[str, Any]
@@ -21,31 +25,61 @@ Payload: TypeAlias = Dict[str, Any]
 Info: TypeAlias = Dict[str, Any]
 
 
-class MlflowPrepare(PrepareCommand):
-    def execute(self, payload: Payload) -> Payload:
-        exp_name = payload.get("experiment_name")
-        catalog = payload.get("catalog")
-        schema = payload.get("schema")
-        volume = payload.get("volume")
+# Worker-local UC experiment name -> id. Experiment ids never change for a
+# name, so the TTL only bounds how long a deleted experiment can be served.
+_EXPERIMENT_IDS = TTLCache(
+    maxsize=int(os.environ.get("MLFLOW_EXPERIMENT_CACHE_SIZE") or 1024),
+    ttl_s=float(os.environ.get("MLFLOW_EXPERIMENT_CACHE_TTL_S") or 3600),
+)
 
-        if not exp_name:
-            raise ValueError("Missing 'experiment_name' in payload.")
-        if not (catalog and schema and volume):
-            raise ValueError("Missing Unity Catalog location. Provide 'catalog', 'schema', and 'volume'.")
 
-        uc_exp_name = f"{catalog}.{schema}.{exp_name}"
-        artifact_location = f"dbfs:/Volumes/{catalog}/{schema}/{volume}"
+def experiment_cache() -> TTLCache:
+    return _EXPERIMENT_IDS
 
-        existing = mlflow.get_experiment_by_name(uc_exp_name)
+
+def _resolve_experiment(name: str, artifact_location: str) -> str:
+    existing = mlflow.get_experiment_by_name(name)
+    if existing is not None:
+        return existing.experiment_id
+    try:
+        return mlflow.create_experiment(name=name, artifact_location=artifact_location)
+    except MlflowException as e:
+        # Another worker created it between our lookup and create.
+        if e.error_code != "RESOURCE_ALREADY_EXISTS":
+            raise
+        existing = mlflow.get_experiment_by_name(name)
         if existing is None:
-            exp_id = mlflow.create_experiment(name=uc_exp_name, artifact_location=artifact_location)
-        else:
-            exp_id = existing.experiment_id
+            raise
+        return existing.experiment_id
+
 
-        new_payload: Payload = dict(payload)
-        new_payload["experiment_id"] = exp_id
-        new_payload["experiment_name"] = uc_exp_name
-        return new_payload
+def _prepare(payload: Payload) -> Payload:
+    exp_name = payload.get("experiment_name")
+    catalog = payload.get("catalog")
+    schema = payload.get("schema")
+    volume = payload.get("volume")
+
+    if not exp_name:
+        raise ValueError("Missing 'experiment_name' in payload.")
+    if not (catalog and schema and volume):
+        raise ValueError("Missing Unity Catalog location. Provide 'catalog', 'schema', and 'volume'.")
+
+    uc_exp_name = f"{catalog}.{schema}.{exp_name}"
+    artifact_location = f"dbfs:/Volumes/{catalog}/{schema}/{volume}"
+
+    exp_id = _EXPERIMENT_IDS.get_or_load(
+        uc_exp_name, lambda: _resolve_experiment(uc_exp_name, artifact_location)
+    )
+
+    new_payload: Payload = dict(payload)
+    new_payload["experiment_id"] = exp_id
+    new_payload["experiment_name"] = uc_exp_name
+    return new_payload
+
+
+class MlflowPrepare(PrepareCommand):
+    def execute(self, payload: Payload) -> Payload:
+        return _prepare(payload)
 
 
 class MlflowSubmit(SubmitCommand):
@@ -60,73 +94,267 @@ class MlflowSubmit(SubmitCommand):
         plan.update({"experiment_id": exp_id})
         return plan
 
+    def execute_many(self, payloads: List[Payload]) -> List[Plan | Exception]:
+        """
+        Plans in order, one exception per invalid payload. Payloads that still
+        name their experiment instead of carrying `experiment_id` are prepared
+        here; the experiment cache resolves each distinct experiment once.
+        """
+        plans: List[Plan | Exception] = []
+        for payload in payloads:
+            try:
+                if not payload.get("experiment_id") and payload.get("experiment_name"):
+                    payload = _prepare(payload)
+                plans.append(self.execute(payload))
+            except Exception as e:
+                plans.append(e)
+        return plans
+
+
+def _is_active_status(status: str | None) -> bool:
+    s = (status or "").upper()
+    return s in {"SCHEDULED", "RUNNING"}
+
+
+def _is_failed_status(status: str | None) -> bool:
+    s = (status or "").upper()
+    return s in {"FAILED", "KILLED"}
+
+
+def _is_finished_status(status: str | None) -> bool:
+    s = (status or "").upper()
+    return s in {"FINISHED", "FAILED", "KILLED"}
+
+
+_ACTIVE_FILTER = "attributes.status IN ('SCHEDULED', 'RUNNING')"
+# Per timestamp (start / end): the high-water mark and the runs seen within
+# `overlap_ms` of it, keyed by a short hash of the run id.
+_EMPTY_CURSOR = {"start": 0, "start_seen": {}, "end": 0, "end_seen": {}, "total": 0, "failed": 0}
+
 
 class MlflowGetStatus(GetStatusCommand):
+    """
+    Plans scan incrementally by default: the active count comes from a search
+    for SCHEDULED / RUNNING runs, and the plan's `cursor` only counts new runs
+    and failures, from runs started or ended since its high-water marks. Those
+    timestamps are set by clients and runs are not committed in timestamp
+    order, so each poll re-scans `overlap_ms` behind the marks; a run committed
+    later than that behind a mark is not counted in total / failed. At most
+    `max_seen` runs are remembered per mark; when the window holds that many,
+    the re-scan narrows to the oldest one remembered. Poll cost follows changes
+    and active runs rather than experiment size. Set `"scan": "full"` in the
+    payload to list every run on every poll.
+    """
+
+    page_size = 1000
+    overlap_ms = 5 * 60 * 1000
+    max_seen = 1000
+
+    def __init__(self):
+        self._client = None
+
+    def warm_up(self) -> None:
+        self._client = mlflow.MlflowClient()
+
+    def close(self) -> None:
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = mlflow.MlflowClient()
+        return self._client
+
     def execute(self, plan: Plan) -> JobState:
-        exp_id = plan.get("experiment_id")
-        filter_string = plan.get("filter_string")
-        if not exp_id:
-            return JobState(
-                phase=JobPhase.ERROR,
-                raw_status=None,
-                message="Missing 'experiment_id' in plan",
-                output=None,
+        return self.execute_many([plan])[0]
+
+    def execute_many(self, plans: List[Plan]) -> List[JobState]:
+        """At most two searches per scan mode across every experiment in `plans`."""
+        states: List[JobState | None] = [None] * len(plans)
+        full, incremental = [], []
+        for i, plan in enumerate(plans):
+            if not plan.get("experiment_id"):
+                states[i] = _missing_experiment()
+            elif plan.get("scan") == "full":
+                full.append(i)
+            else:
+                incremental.append(i)
+        if full:
+            self._full_scan(plans, full, states)
+        if incremental:
+            self._incremental_scan(plans, incremental, states)
+        return states
+
+    def _full_scan(self, plans: List[Plan], idxs: List[int], states: list) -> None:
+        exp_ids = sorted({plans[i]["experiment_id"] for i in idxs})
+        try:
+            runs = mlflow.search_runs(experiment_ids=exp_ids, output_format="list")
+        except Exception as e:
+            for i in idxs:
+                states[i] = _search_error(e)
+            return
+        runs_by_exp = _by_experiment(runs)
+        for i in idxs:
+            exp_runs = runs_by_exp.get(plans[i]["experiment_id"], [])
+            states[i] = self._state_from_counts(
+                plans[i],
+                total=len(exp_runs),
+                active=sum(1 for r in exp_runs if _is_active_status(r.info.status)),
+                failed=sum(1 for r in exp_runs if _is_failed_status(r.info.status)),
             )
 
+    def _incremental_scan(self, plans: List[Plan], idxs: List[int], states: list) -> None:
+        cursors = {i: {**_EMPTY_CURSOR, **(plans[i].get("cursor") or {})} for i in idxs}
+        exp_ids = sorted({plans[i]["experiment_id"] for i in idxs})
+        since_start = min(_lower(c, "start", self.overlap_ms, self.max_seen) for c in cursors.values())
+        since_end = min(_lower(c, "end", self.overlap_ms, self.max_seen) for c in cursors.values())
         try:
-            runs = mlflow.search_runs(experiment_ids=[exp_id])
+            started = _by_experiment(self._search(exp_ids, f"attributes.start_time >= {since_start}", "start_time"))
+            ended = _by_experiment(self._search(exp_ids, f"attributes.end_time >= {since_end}", "end_time"))
+            active = _by_experiment(self._search(exp_ids, _ACTIVE_FILTER, "start_time"))
         except Exception as e:
-            return JobState(
-                phase=JobPhase.ERROR,
-                raw_status=None,
-                message=f"Error searching runs: {e}",
-                output=None,
+            for i in idxs:
+                states[i] = _search_error(e)
+            return
+
+        for i in idxs:
+            exp_id = plans[i]["experiment_id"]
+            cursor = _advance(
+                cursors[i], started.get(exp_id, []), ended.get(exp_id, []), self.overlap_ms, self.max_seen
+            )
+            n_active = len(active.get(exp_id, []))
+            states[i] = self._state_from_counts(
+                plans[i],
+                # A run started before the overlap window can still be active.
+                total=max(cursor["total"], n_active),
+                active=n_active,
+                failed=cursor["failed"],
+                cursor=cursor,
             )
 
-        if not runs:
+    def _search(self, exp_ids: List[str], filter_string: str, order_attribute: str) -> list:
+        client = self.client
+        runs, token = [], None
+        while True:
+            page = client.search_runs(
+                experiment_ids=exp_ids,
+                filter_string=filter_string,
+                order_by=[f"attributes.{order_attribute} ASC"],
+                max_results=self.page_size,
+                page_token=token,
+            )
+            runs.extend(page)
+            token = page.token
+            if not token:
+                return runs
+
+    def _state_from_counts(self, plan: Plan, *, total: int, active: int, failed: int, cursor=None) -> JobState:
+        exp_id = plan["experiment_id"]
+        if not total:
             # 👉 As requested: pending until one run starts (no internal waiting)
             return JobState(
                 phase=JobPhase.PENDING,
                 raw_status={"active": 0, "total": 0},
                 message="No runs found for this experiment yet.",
                 output=None,
+                cursor=cursor,
             )
 
-        def _is_active_status(status: str | None) -> bool:
-            s = (status or "").upper()
-            return s in {"SCHEDULED", "RUNNING"}
-
-
-        def _is_failed_status(status: str | None) -> bool:
-            s = (status or "").upper()
-            return s in {"FAILED", "KILLED"}
-
-        active = [r for r in runs if _is_active_status(r.info.status)]
-        failed = [r for r in runs if _is_failed_status(r.info.status)]
-
         if active:
             return JobState(
                 phase=JobPhase.RUNNING,
-                raw_status={"active": len(active), "total": len(runs)},
+                raw_status={"active": active, "total": total},
                 message=None,
                 output=None,
+                cursor=cursor,
             )
 
         model_ids = mlflow.search_logged_models(
             experiment_ids=[exp_id],
-            filter_string=filter_string, 
+            filter_string=plan.get("filter_string"), 
             output_format="list"
         )
 
         phase = JobPhase.FAILED if failed and not model_ids else JobPhase.SUCCEEDED
         return JobState(
             phase=phase,
-            raw_status={"active": 0, "total": len(runs)},
+            raw_status={"active": 0, "total": total},
             message=None,
             output={"model_ids": model_ids},
+            cursor=cursor,
         )
 
 
+def _by_experiment(runs: list) -> Dict[str, list]:
+    out: Dict[str, list] = {}
+    for run in runs:
+        out.setdefault(run.info.experiment_id, []).append(run)
+    return out
+
+
+def _seen_key(run_id: str) -> str:
+    return hashlib.blake2b(run_id.encode(), digest_size=6).hexdigest()
+
+
+def _lower(cursor: Dict[str, Any], key: str, overlap_ms: int, max_seen: int) -> int:
+    lower, seen = max(cursor[key] - overlap_ms, 0), cursor[f"{key}_seen"]
+    if len(seen) >= max_seen:
+        # Runs older than those remembered were dropped: re-scanning them would recount.
+        lower = max(lower, min(seen.values()))
+    return int(lower)
+
+
+def _fold(cursor: Dict[str, Any], key: str, runs: list, attribute: str, overlap_ms: int, max_seen: int):
+    """Runs not yet seen at or above the lower bound, and the moved mark / bounded seen set."""
+    lower, seen = _lower(cursor, key, overlap_ms, max_seen), cursor[f"{key}_seen"]
+    new = [
+        r for r in runs
+        if getattr(r.info, attribute) is not None and getattr(r.info, attribute) >= lower and _seen_key(r.info.run_id) not in seen
+    ]
+    seen = {**seen, **{_seen_key(r.info.run_id): getattr(r.info, attribute) for r in new}}
+    mark = max([cursor[key], *seen.values()])
+    seen = {k: ts for k, ts in seen.items() if ts >= mark - overlap_ms}
+    if len(seen) > max_seen:
+        # Keep the newest, plus any sharing the oldest kept timestamp, so none left out is re-scanned.
+        oldest = sorted(seen.values(), reverse=True)[max_seen - 1]
+        seen = {k: ts for k, ts in seen.items() if ts >= oldest}
+    return new, mark, seen
+
+
+def _advance(cursor: Dict[str, Any], started: list, ended: list, overlap_ms: int, max_seen: int) -> Dict[str, Any]:
+    """Fold runs started/ended around the cursor's high-water marks into its counts."""
+    new_started, start, start_seen = _fold(cursor, "start", started, "start_time", overlap_ms, max_seen)
+    finished = [r for r in ended if _is_finished_status(r.info.status)]
+    new_ended, end, end_seen = _fold(cursor, "end", finished, "end_time", overlap_ms, max_seen)
+    return {
+        **cursor,
+        "start": start,
+        "start_seen": start_seen,
+        "end": end,
+        "end_seen": end_seen,
+        "total": cursor["total"] + len(new_started),
+        "failed": cursor["failed"] + sum(1 for r in new_ended if _is_failed_status(r.info.status)),
+    }
+
+
+def _missing_experiment() -> JobState:
+    return JobState(
+        phase=JobPhase.ERROR,
+        raw_status=None,
+        message="Missing 'experiment_id' in plan",
+        output=None,
+    )
+
+
+def _search_error(e: Exception) -> JobState:
+    return JobState(
+        phase=JobPhase.ERROR,
+        raw_status=None,
+        message=f"Error searching runs: {e}",
+        output=None,
+    )
+
+
 class MlflowCallback(CallbackCommand):
     def execute(self, job_state: JobState) -> Info:
         """
@@ -139,9 +367,54 @@ class MlflowCallback(CallbackCommand):
         return out
 
 
+class MlflowCancel(CancelCommand):
+    """Marks the experiment's SCHEDULED and RUNNING runs as KILLED."""
+
+    page_size = 1000
+
+    def __init__(self):
+        self._client = None
+
+    def warm_up(self) -> None:
+        self._client = mlflow.MlflowClient()
+
+    def close(self) -> None:
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = mlflow.MlflowClient()
+        return self._client
+
+    def execute(self, plan: Plan) -> Info:
+        exp_id = plan.get("experiment_id")
+        if not exp_id:
+            raise ValueError("Missing 'experiment_id' in plan")
+        client = self.client
+        # Collect first: terminating while paging would shift the result pages.
+        active, token = [], None
+        while True:
+            page = client.search_runs(
+                experiment_ids=[exp_id],
+                filter_string=_ACTIVE_FILTER,
+                order_by=["attributes.start_time ASC"],
+                max_results=self.page_size,
+                page_token=token,
+            )
+            active.extend(run.info.run_id for run in page)
+            token = page.token
+            if not token:
+                break
+        for run_id in active:
+            client.set_terminated(run_id, status="KILLED")
+        return {"terminated": active}
+
+
 @platform("mlflow")
 class MlflowProvider(Provider):
     prepare = MlflowPrepare
     submit = MlflowSubmit
     status = MlflowGetStatus
     callback = MlflowCallback
+    cancel = MlflowCancel
@@ -1,14 +1,40 @@
-
-from typing import Dict, Type, Any
-from .commands import PrepareCommand, SubmitCommand, GetStatusCommand, CallbackCommand
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+from . import metrics
+from .commands import (
+    Command, PrepareCommand, PassThroughPrepare, SubmitCommand, GetStatusCommand, CallbackCommand, CancelCommand,
+)
 
 _REGISTRY: Dict[str, "Provider"] = {}
 
+# Providers are imported on first use so a cold start only pays for the
+# platforms it serves (mlflow alone is a multi-second import).
+_LAZY: Dict[str, str] = {
+    "dummy": ".providers.dummy",
+    "dummy-async": ".providers.dummy_async",
+    "mlflow": ".providers.mlflow_provider",
+}
+ENTRY_POINT_GROUP = "platform_core.providers"
+_load_lock = threading.Lock()
+
 class Provider:
-    prepare: Type[PrepareCommand]
+    # Succeeded jobs may be served from the result cache for identical payloads.
+    cacheable: bool = False
+    # Backend call limits, per worker; see limits.limiter_for for env overrides.
+    rate_limit_per_s: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+    # Circuit breaker, per worker; see breaker.breaker_for. A threshold of 0 disables it.
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout_s: float = 30.0
+    prepare: Type[PrepareCommand] = PassThroughPrepare
     submit: Type[SubmitCommand]
     status: Type[GetStatusCommand]
     callback: Type[CallbackCommand]
+    # Optional: stops a job on timeout or cancel request; see cancel_activity.
+    cancel: Optional[Type[CancelCommand]] = None
 
 def platform(name: str):
     def _wrap(cls: Type[Provider]):
@@ -16,9 +42,64 @@ def platform(name: str):
         return cls
     return _wrap
 
+def register_lazy(name: str, module: str) -> None:
+    """Map a platform name to the module whose import registers it."""
+    _LAZY[name.lower()] = module
+
+def _load(name: str) -> Optional[Type[Provider]]:
+    with _load_lock:
+        if name in _REGISTRY:
+            return _REGISTRY[name]
+        module = _LAZY.get(name)
+        if module is not None:
+            importlib.import_module(module, __package__)
+            return _REGISTRY.get(name)
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            if ep.name.lower() == name:
+                loaded = ep.load()
+                if isinstance(loaded, type) and issubclass(loaded, Provider):
+                    _REGISTRY.setdefault(name, loaded)
+                return _REGISTRY.get(name)
+    return None
+
 def get_platform_commands(platform: str) -> Type[Provider]:
-    try:
-        prov = _REGISTRY[platform.lower()]
-    except KeyError as e:
-        raise ValueError(f"Unsupported platform '{platform}'") from e
+    key = platform.lower()
+    prov = _REGISTRY.get(key) or _load(key)
+    if prov is None:
+        raise ValueError(f"Unsupported platform '{platform}'")
     return prov
+
+
+COMMAND_KINDS = ("prepare", "submit", "status", "callback", "cancel")
+_instances: Dict[Tuple[str, str], Command] = {}
+_instances_lock = threading.Lock()
+
+def get_command(platform: str, kind: str) -> Any:
+    """Worker-scoped, shared instance of the platform's `kind` command, instrumented by `metrics`."""
+    key = (platform.lower(), kind)
+    cmd = _instances.get(key)
+    if cmd is None:
+        with _instances_lock:
+            cmd = _instances.get(key)
+            if cmd is None:
+                cls = getattr(get_platform_commands(platform), kind, None)
+                if cls is None:
+                    raise ValueError(f"Platform '{platform}' has no '{kind}' command")
+                cmd = _instances[key] = metrics.instrument(cls(), key[0], kind)
+    return cmd
+
+def warm_up(platforms: Iterable[str]) -> None:
+    """Instantiate and warm every command of `platforms`; call on worker start."""
+    for name in platforms:
+        prov = get_platform_commands(name)
+        for kind in COMMAND_KINDS:
+            if getattr(prov, kind, None) is not None:
+                get_command(name, kind).warm_up()
+
+def close() -> None:
+    """Close and drop all cached command instances; call on worker shutdown."""
+    with _instances_lock:
+        commands = list(_instances.values())
+        _instances.clear()
+    for cmd in commands:
+        cmd.close()
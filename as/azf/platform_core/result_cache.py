@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+
+from . import codec
+from .claimcheck import BlobStore, store_from_env
+from .state import JobState
+from .ttlcache import TTLCache
+
+# Payload keys that differ per submission without changing the job itself.
+_VOLATILE_KEYS = ("notify_url",)
+
+
+def cache_key(platform: str, payload: Any) -> str:
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k not in _VOLATILE_KEYS}
+    return codec.canonical_hash({"platform": platform.lower(), "payload": payload})
+
+
+class ResultCache(ABC):
+    """Terminal JobStates of succeeded jobs, keyed by `cache_key`."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[JobState]:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, state: JobState) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+class MemoryResultCache(ResultCache):
+    """Worker-local LRU with TTL; each worker warms its own copy."""
+
+    def __init__(self, maxsize: int = 1024, ttl_s: float = 86400, clock: Callable[[], float] = time.monotonic):
+        self._cache = TTLCache(maxsize=maxsize, ttl_s=ttl_s, clock=clock)
+
+    def get(self, key: str) -> Optional[JobState]:
+        data = self._cache.get(key)
+        return JobState.from_json(data) if data is not None else None
+
+    def put(self, key: str, state: JobState) -> None:
+        # Stored encoded so callers can't mutate cached entries.
+        self._cache.put(key, codec.dumps_bytes(state.to_json(drop_raw_status=False)))
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+class BlobResultCache(ResultCache):
+    """
+    Shared across workers through a BlobStore. Expired entries are deleted on
+    read; bound the container's size with a storage lifecycle policy.
+    """
+
+    def __init__(self, store: BlobStore, ttl_s: float = 86400, clock: Callable[[], float] = time.time):
+        self.store = store
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key: str) -> Optional[JobState]:
+        try:
+            entry = codec.loads(self.store.get(key))
+        except KeyError:
+            entry = None
+        if entry is not None and self._clock() - entry["stored_at"] > self.ttl_s:
+            self.store.delete(key)
+            with self._lock:
+                self.expired += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return JobState.from_json(entry["state"])
+
+    def put(self, key: str, state: JobState) -> None:
+        self.store.delete(key)
+        entry = {"stored_at": self._clock(), "state": state.to_json(drop_raw_status=False)}
+        self.store.put(key, codec.dumps_bytes(entry))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache: Optional[ResultCache] = None
+_configured = False
+_lock = threading.Lock()
+
+
+def result_cache() -> Optional[ResultCache]:
+    """
+    Worker-wide result cache, or None when RESULT_CACHE_STORE is unset.
+    `memory` keeps up to RESULT_CACHE_MAX_ENTRIES per worker; other values
+    name a blob store as for CLAIM_CHECK_STORE. Entries live RESULT_CACHE_TTL_S.
+    """
+    global _cache, _configured
+    with _lock:
+        if not _configured:
+            ttl_s = float(os.environ.get("RESULT_CACHE_TTL_S") or 86400)
+            if os.environ.get("RESULT_CACHE_STORE") == "memory":
+                _cache = MemoryResultCache(int(os.environ.get("RESULT_CACHE_MAX_ENTRIES") or 1024), ttl_s)
+            else:
+                store = store_from_env("RESULT_CACHE", container="job-results")
+                _cache = BlobResultCache(store, ttl_s) if store is not None else None
+            _configured = True
+        return _cache
+
+
+def reset() -> None:
+    global _cache, _configured
+    with _lock:
+        _cache, _configured = None, False
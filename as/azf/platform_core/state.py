@@ -1,6 +1,9 @@
+import os
 from enum import Enum
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Union
+
+from . import codec
 
 class JobPhase(str, Enum):
     PENDING = "PENDING"
@@ -9,21 +12,96 @@ class JobPhase(str, Enum):
     FAILED = "FAILED"
     ERROR = "ERROR"
     TIMEOUT = "TIMEOUT"
+    # Stopped on request; the backend job was asked to cancel.
+    CANCELLED = "CANCELLED"
+    # The platform could not be reached (outage or open circuit). Non-terminal.
+    UNAVAILABLE = "UNAVAILABLE"
 
 TERMINAL = {
     JobPhase.SUCCEEDED,
     JobPhase.FAILED,
     JobPhase.ERROR,
-    JobPhase.TIMEOUT
+    JobPhase.TIMEOUT,
+    JobPhase.CANCELLED,
 }
 
-@dataclass
+# Wire schema of JobState.to_json; bump when keys change meaning.
+SCHEMA_VERSION = 1
+# Set JOBSTATE_DROP_RAW_STATUS=1 to keep provider payloads out of history.
+# Progress counts survive the drop: raw_status is cut down to PROGRESS_KEYS.
+DROP_RAW_STATUS = os.environ.get("JOBSTATE_DROP_RAW_STATUS", "").lower() in ("1", "true", "yes")
+# raw_status keys a provider may report for progress (runs active / total).
+PROGRESS_KEYS = ("active", "total")
+
+_WIRE_KEYS = (
+    ("p", "phase"),
+    ("r", "raw_status"),
+    ("m", "message"),
+    ("o", "output"),
+    ("n", "next_poll_after_s"),
+    ("c", "cursor"),
+)
+
+@dataclass(slots=True)
 class JobState:
     phase: JobPhase
     raw_status: Any
     message: Optional[str] = None
     output: Optional[Any] = None
+    # Provider hint: seconds until the next status poll is worthwhile.
+    next_poll_after_s: Optional[float] = None
+    # Opaque provider cursor; the orchestrator carries it into the next poll's plan.
+    cursor: Optional[Any] = None
 
     @property
     def is_terminal(self) -> bool:
         return self.phase in TERMINAL
+
+    def to_json(self, *, drop_raw_status: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Compact wire form used by the Durable serializer: one-letter keys,
+        None fields omitted, and a schema version under "v". Dropping
+        raw_status keeps only its PROGRESS_KEYS.
+        """
+        drop = DROP_RAW_STATUS if drop_raw_status is None else drop_raw_status
+        wire: Dict[str, Any] = {"v": SCHEMA_VERSION}
+        for short, name in _WIRE_KEYS:
+            value = getattr(self, name)
+            if drop and short == "r":
+                value = _progress_counts(value)
+            if value is not None:
+                wire[short] = value.value if short == "p" else value
+        return wire
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes, Dict[str, Any]]) -> "JobState":
+        if not isinstance(data, dict):
+            data = codec.loads(data)
+        version = data.get("v")
+        if version is None:
+            # Long-key form, as produced by `to_dict`.
+            return cls(**{**data, "phase": JobPhase(data["phase"]), "raw_status": data.get("raw_status")})
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Unsupported JobState schema version {version}")
+        fields = {name: data[short] for short, name in _WIRE_KEYS if short in data}
+        fields["phase"] = JobPhase(fields["phase"])
+        fields.setdefault("raw_status", None)
+        return cls(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Long-key form for callbacks and other external consumers. The poll
+        hint and cursor are internal to polling and stay out of it.
+        """
+        return {
+            "phase": self.phase.value,
+            "raw_status": self.raw_status,
+            "message": self.message,
+            "output": self.output,
+        }
+
+
+def _progress_counts(raw_status: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(raw_status, dict):
+        return None
+    return {k: raw_status[k] for k in PROGRESS_KEYS if k in raw_status} or None
@@ -1,6 +1,11 @@
+import threading
+import time
+from concurrent.futures import Future
 from azure.identity import DefaultAzureCredential
 from functools import lru_cache
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dispatch import run_blocking
 
 _GRAPH_SCOPE = "https://graph.microsoft.com/.default"
 
@@ -8,6 +13,106 @@ _GRAPH_SCOPE = "https://graph.microsoft.com/.default"
 def _credential():
     return DefaultAzureCredential(exclude_interactive_browser_credential=False)
 
+
+class TokenCache:
+    """
+    Worker-local cache of access tokens keyed by the scope tuple.
+
+    Tokens are served until `min_valid_s` before `expires_on`. Once inside the
+    `refresh_before_s` window a hit still returns the cached token but kicks off
+    a background refresh, so callers only block on a cold or expired entry.
+    Concurrent acquisitions for the same scopes share one in-flight request.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Any],
+        *,
+        refresh_before_s: float = 300,
+        min_valid_s: float = 30,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._fetch = fetch
+        self._refresh_before_s = refresh_before_s
+        self._min_valid_s = min_valid_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens: Dict[Tuple[str, ...], Any] = {}
+        self._inflight: Dict[Tuple[str, ...], Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, scopes: List[str]) -> Any:
+        key = tuple(scopes)
+        with self._lock:
+            token = self._fresh(key)
+            if token is not None:
+                return token
+            self.misses += 1
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if owner:
+            self._acquire(key, fut)
+        return fut.result()
+
+    def peek(self, scopes: List[str]) -> Optional[Any]:
+        """The cached token if still valid; never blocks on a fetch."""
+        with self._lock:
+            return self._fresh(tuple(scopes))
+
+    def _fresh(self, key: Tuple[str, ...]) -> Optional[Any]:
+        # Caller holds the lock.
+        token = self._tokens.get(key)
+        if token is None:
+            return None
+        remaining = getattr(token, "expires_on", 0) - self._clock()
+        if remaining <= self._min_valid_s:
+            return None
+        self.hits += 1
+        if remaining <= self._refresh_before_s and key not in self._inflight:
+            fut = self._inflight[key] = Future()
+            threading.Thread(target=self._acquire, args=(key, fut), daemon=True).start()
+        return token
+
+    def _acquire(self, key: Tuple[str, ...], fut: Future) -> None:
+        try:
+            token = self._fetch(list(key))
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(e)
+            return
+        with self._lock:
+            self._tokens[key] = token
+            self._inflight.pop(key, None)
+            self.refreshes += 1
+        fut.set_result(token)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "refreshes": self.refreshes, "size": len(self._tokens)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self.hits = self.misses = self.refreshes = 0
+
+
+_TOKEN_CACHE = TokenCache(lambda scopes: _credential().get_token(scopes=scopes))
+
+def token_cache() -> TokenCache:
+    return _TOKEN_CACHE
+
 def get_graph_token(scopes: list[str] = [_GRAPH_SCOPE]) -> Dict[str, str]:
-    token = _credential().get_token(scopes=scopes)
+    token = _TOKEN_CACHE.get(scopes)
+    return {"Authorization": f"Bearer {token.token}"}
+
+async def aget_graph_token(scopes: list[str] = [_GRAPH_SCOPE]) -> Dict[str, str]:
+    """`get_graph_token` for event-loop callers: only a cache miss leaves the loop."""
+    token = _TOKEN_CACHE.peek(scopes)
+    if token is None:
+        token = await run_blocking(_TOKEN_CACHE.get, scopes)
     return {"Authorization": f"Bearer {token.token}"}
@@ -0,0 +1,6 @@
+import os
+import sys
+
+_AZF_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "azf"))
+if _AZF_DIR not in sys.path:
+    sys.path.insert(0, _AZF_DIR)
@@ -0,0 +1,58 @@
+"""
+Concurrent status polls through `get_status_activity`: the sync dummy provider
+(bounded thread pool) vs the async one (event loop), against a slow backend.
+
+    python -m bench.bench_async_status --polls 2000 --latency-ms 100 --threads 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict
+
+from bench.bench_command_overhead import _BenchCredential
+from bench.dummy_backend import DummyBackend
+from platform_core import async_http, dispatch, http_pool, registry, tokens
+
+
+async def _poll_all(platform: str, plans, get_status_activity) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(get_status_activity({"platform": platform, "plan": p}) for p in plans))
+    elapsed = time.perf_counter() - start
+    await async_http.close()
+    return elapsed
+
+
+def run(polls: int = 2000, latency_s: float = 0.1, threads: int = 32) -> Dict[str, Dict[str, float]]:
+    os.environ["SYNC_COMMAND_THREADS"] = str(threads)
+    tokens._credential = _BenchCredential
+    from function_app import get_status_activity
+
+    results = {}
+    with DummyBackend(latency_s=latency_s) as backend:
+        os.environ["DUMMY_BASE_URL"] = backend.url
+        http_pool.configure(backend.url, http_pool.PoolPolicy(pool_maxsize=threads))
+        aux = {"base": backend.url}
+        plans = [{"job_id": backend.submit({}), "aux": aux} for _ in range(polls)]
+        for platform in ("dummy", "dummy-async"):
+            elapsed = asyncio.run(_poll_all(platform, plans, get_status_activity))
+            results[platform] = {"polls_per_s": polls / elapsed, "elapsed_s": elapsed}
+        registry.close()
+        dispatch.shutdown()
+        http_pool.close_all()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+    print(json.dumps(run(args.polls, args.latency_ms / 1000.0, args.threads), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Load test: many finished jobs calling back the same slow receiver, one POST
+per result versus results batched per URL.
+
+Each POST costs the receiver `latency_ms`; with the per-host in-flight cap the
+unbatched run needs `jobs / max_in_flight` round trips, the batched run about
+`jobs / max_batch`. A share of POSTs fail first to exercise retries.
+
+    python -m bench.bench_callbacks --jobs 500 --latency-ms 20 --batch-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict
+
+from bench.dummy_backend import DummyBackend
+from platform_core import async_http
+from platform_core.callbacks import CallbackDelivery
+
+
+async def _deliver_all(delivery: CallbackDelivery, url: str, jobs: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(delivery.deliver(url, {"job": i, "phase": "SUCCEEDED"}) for i in range(jobs)))
+    elapsed = time.perf_counter() - started
+    await async_http.close()
+    return elapsed
+
+
+def run(jobs: int = 500, latency_s: float = 0.02, batch_window_s: float = 0.05, max_batch: int = 50,
+        max_in_flight: int = 8, failures: int = 10) -> Dict[str, Any]:
+    results = {}
+    for label, window in (("unbatched", 0.0), ("batched", batch_window_s)):
+        with DummyBackend(inbox_latency_s=latency_s, inbox_failures=failures) as backend:
+            delivery = CallbackDelivery(
+                backoff_s=0.01, max_in_flight=max_in_flight, batch_window_s=window, max_batch=max_batch
+            )
+            elapsed = asyncio.run(_deliver_all(delivery, f"{backend.url}/_inbox", jobs))
+            results[label] = {"wall_s": elapsed, "receiver_requests": backend.requests["inbox"], **delivery.stats()}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--batch-ms", type=float, default=50.0)
+    parser.add_argument("--max-batch", type=int, default=50)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jobs, args.latency_ms / 1000.0, args.batch_ms / 1000.0, args.max_batch,
+                         args.max_in_flight), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Orchestration history size with and without claim-check offloading, for a
+job with a large training config whose status output lists many model ids.
+
+    python -m bench.bench_claim_check --config-kb 256 --model-ids 10000 --polls 50
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import Any, Dict, List
+
+import bench  # noqa: F401  (puts azf/ on sys.path)
+from bench.durable_sim import OrchestrationSimulator
+from platform_core import claimcheck
+from platform_core.commands import GetStatusCommand, SubmitCommand
+from platform_core.registry import Provider, platform
+from platform_core.state import JobPhase, JobState
+
+
+class _BenchSubmit(SubmitCommand):
+    def execute(self, payload):
+        return {"platform": "bench-claims", "job_id": "bench-job", "config": payload["config"]}
+
+
+class _BenchStatus(GetStatusCommand):
+    polls_until_done = 50
+    model_ids = 10000
+
+    def __init__(self):
+        self.polls = 0
+
+    def execute(self, plan):
+        self.polls += 1
+        if self.polls < self.polls_until_done:
+            return JobState(JobPhase.RUNNING, raw_status={"poll": self.polls})
+        output = {"model_ids": [f"models:/m-{i:08d}" for i in range(self.model_ids)]}
+        return JobState(JobPhase.SUCCEEDED, raw_status={"poll": self.polls}, output=output)
+
+
+@platform("bench-claims")
+class _BenchProvider(Provider):
+    submit = _BenchSubmit
+    status = _BenchStatus
+
+
+def simulate(config_kb: int, model_ids: int, polls: int, store_dir: str = "") -> Dict[str, Any]:
+    import function_app
+    from platform_core import registry
+
+    if store_dir:
+        os.environ["CLAIM_CHECK_STORE"] = store_dir
+    else:
+        os.environ.pop("CLAIM_CHECK_STORE", None)
+    claimcheck.reset()
+    registry.close()
+    _BenchStatus.polls_until_done, _BenchStatus.model_ids = polls, model_ids
+
+    activities = {
+        name: getattr(function_app, name)
+        for name in ("prepare_activity", "submit_activity", "get_status_activity")
+    }
+    activities["callback_activity"] = lambda args: None
+    orchestrator = function_app.orchestrate_submission.build().get_user_function().orchestrator_function
+    sim = OrchestrationSimulator(orchestrator, activities)
+    sim.run({
+        "platform": "bench-claims",
+        "payload": claimcheck.claims().offload({"config": "x" * (config_kb * 1024)}),
+        "callback_url": "http://callback.invalid",
+        "poll_s": 10,
+        "timeout_s": polls * 100,
+        "checkpoint_polls": 0,
+    })
+    stats = sim.stats.as_dict()
+    return {
+        "claim_check": bool(store_dir),
+        "history_bytes": stats["history_bytes"],
+        "replayed_bytes": stats["replayed_bytes"],
+        **claimcheck.claims().stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--config-kb", type=int, default=256)
+    parser.add_argument("--model-ids", type=int, default=10000)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as store_dir:
+        rows: List[Dict[str, Any]] = [
+            simulate(args.config_kb, args.model_ids, args.polls, store)
+            for store in ("", store_dir)
+        ]
+    rows[1]["history_bytes_saved"] = rows[0]["history_bytes"] - rows[1]["history_bytes"]
+    rows[1]["replayed_bytes_saved"] = rows[0]["replayed_bytes"] - rows[1]["replayed_bytes"]
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
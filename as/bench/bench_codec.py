@@ -0,0 +1,82 @@
+"""
+JobState encode/decode throughput and bytes per poll event, for the long-key
+dataclass form vs the compact wire form (with and without raw_status).
+
+    python -m bench.bench_codec --events 20000
+"""
+
+import argparse
+import dataclasses
+import json
+import time
+from typing import Any, Callable, Dict
+
+from azure.functions._durable_functions import _deserialize_custom_object, _serialize_custom_object
+
+import bench  # noqa: F401  (puts azf/ on sys.path)
+from platform_core import codec
+from platform_core.state import JobPhase, JobState
+
+
+def _sample() -> JobState:
+    return JobState(
+        JobPhase.RUNNING,
+        raw_status={"job_id": "job-123456", "status": "running", "progress": 0.42},
+        next_poll_after_s=15.0,
+    )
+
+
+def _measure(encode: Callable[[JobState], Any], decode: Callable[[Any], JobState], events: int) -> Dict[str, float]:
+    state = _sample()
+    t0 = time.perf_counter()
+    for _ in range(events):
+        encoded = encode(state)
+    t1 = time.perf_counter()
+    for _ in range(events):
+        decode(encoded)
+    t2 = time.perf_counter()
+    return {
+        "encode_per_s": events / (t1 - t0),
+        "decode_per_s": events / (t2 - t1),
+        "bytes_per_event": len(encoded),
+    }
+
+
+def _durable(drop_raw_status: bool):
+    def encode(state):
+        data = {"__class__": "JobState", "__module__": "platform_core.state",
+                "__data__": state.to_json(drop_raw_status=drop_raw_status)}
+        return codec.dumps(data)
+    return encode
+
+
+def run(events: int = 20000) -> Dict[str, Any]:
+    long_form = {
+        "encode": lambda s: json.dumps(dataclasses.asdict(s)),
+        "decode": lambda d: JobState(**json.loads(d)),
+    }
+    results = {
+        "backend": codec.BACKEND,
+        "long_keys_json": _measure(long_form["encode"], long_form["decode"], events),
+        "durable_default_path": _measure(
+            lambda s: json.dumps(s, default=_serialize_custom_object),
+            lambda d: json.loads(d, object_hook=_deserialize_custom_object),
+            events,
+        ),
+        "wire": _measure(_durable(False), lambda d: JobState.from_json(codec.loads(d)["__data__"]), events),
+        "wire_without_raw_status": _measure(
+            _durable(True), lambda d: JobState.from_json(codec.loads(d)["__data__"]), events
+        ),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.events), indent=2))
+
+
+if __name__ == "__main__":
+    main()
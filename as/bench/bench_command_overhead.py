@@ -0,0 +1,94 @@
+"""
+Per-activity command overhead: a fresh command per call (the old activity
+pattern) vs the registry's shared, warm instance.
+
+    python -m bench.bench_command_overhead --calls 2000
+"""
+
+import argparse
+import json
+import os
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+from bench.bench_http_pool import percentile
+from bench.dummy_backend import DummyBackend
+from platform_core import http_pool, registry, tokens
+
+
+class _BenchCredential:
+    """Local stand-in for DefaultAzureCredential; the bench never leaves localhost."""
+
+    def get_token(self, *scopes, **kwargs):
+        return SimpleNamespace(token="bench-token", expires_on=int(time.time()) + 3600)
+
+
+def _run(get_status: Callable[[], object], plan: Dict[str, object], calls: int) -> Dict[str, float]:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        get_status().execute(plan)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    return {
+        "calls_per_s": calls / elapsed,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+    }
+
+
+def _acquire(platform: str, calls: int) -> Dict[str, float]:
+    """Cost of getting a ready-to-use status command, without the request itself."""
+    provider = registry.get_platform_commands(platform)
+
+    def fresh():
+        cmd = provider.status()
+        cmd.warm_up()
+        return cmd
+
+    out = {}
+    for label, get in (("per_call", fresh), ("warm", lambda: registry.get_command(platform, "status"))):
+        get()
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            get()
+        out[f"{label}_us"] = (time.perf_counter() - t0) / calls * 1e6
+    registry.close()
+    return out
+
+
+def run(calls: int = 2000) -> Dict[str, Dict[str, float]]:
+    results = {}
+    tokens._credential = _BenchCredential
+    with DummyBackend() as backend:
+        os.environ["DUMMY_BASE_URL"] = backend.url
+        plan = registry.get_command("dummy", "submit").execute({})
+        provider = registry.get_platform_commands("dummy")
+        registry.close()
+
+        results["per_call"] = _run(provider.status, plan, calls)
+        registry.warm_up(["dummy"])
+        results["warm"] = _run(lambda: registry.get_command("dummy", "status"), plan, calls)
+        registry.close()
+        http_pool.close_all()
+    results["acquire_dummy"] = _acquire("dummy", calls)
+    # Client construction only resolves the store; nothing is contacted.
+    os.environ.setdefault("MLFLOW_TRACKING_URI", "http://127.0.0.1:5000")
+    try:
+        results["acquire_mlflow"] = _acquire("mlflow", calls)
+    except ImportError:
+        pass
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.calls), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Pooled vs unpooled status polling against the local stand-in backend.
+
+    python -m bench.bench_http_pool --polls 2000 --threads 8
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import requests
+
+from bench.dummy_backend import DummyBackend
+from platform_core import http_pool
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def _run(get: Callable[[str], requests.Response], url: str, polls: int, threads: int) -> Dict[str, float]:
+    def one(_):
+        t0 = time.perf_counter()
+        get(url).raise_for_status()
+        return time.perf_counter() - t0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, range(polls)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_s": polls / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run(polls: int = 2000, threads: int = 8, latency_s: float = 0.0) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with DummyBackend(latency_s=latency_s) as backend:
+        job_id = backend.submit({})
+        url = f"{backend.url}/status/{job_id}"
+
+        before = backend.connections
+        results["unpooled"] = _run(lambda u: requests.get(u, timeout=15), url, polls, threads)
+        results["unpooled"]["connections"] = backend.connections - before
+
+        http_pool.configure(url, http_pool.PoolPolicy(pool_maxsize=threads))
+        before = backend.connections
+        results["pooled"] = _run(http_pool.get, url, polls, threads)
+        results["pooled"]["connections"] = backend.connections - before
+        http_pool.close_all()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.polls, args.threads, args.latency_ms / 1000.0), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+End-to-end load test: N concurrent orchestrate_submission instances, with the
+real activities, against a local dummy backend.
+
+Instances run on WallClockRuntime, which replays each orchestrator the way the
+Durable runtime does, so history size and replay CPU are measured alongside
+throughput. Each scenario reports activity calls and history per job, replay
+CPU, backend requests/s and end-to-end latency percentiles; `--out` writes
+them as JSON for tracking regressions between runs.
+
+    python -m bench.bench_pipeline --jobs 1 100 10000 --out pipeline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform as py_platform
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from bench.bench_command_overhead import _BenchCredential
+from bench.bench_http_pool import percentile
+from bench.dummy_backend import DummyBackend
+from bench.durable_sim import WallClockRuntime
+from platform_core import async_http, breaker, limits, registry, tokens
+
+
+async def _run_jobs(runtime: WallClockRuntime, req: Dict[str, Any], jobs: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    phases: Dict[str, int] = {}
+
+    async def one(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            state = await runtime.run_async({**req, "payload": {"job": i}}, instance_id=f"bench-{i}")
+            phase = getattr(state.phase, "value", state.phase)
+        except Exception as e:  # an activity failure fails the orchestration
+            phase = f"failed:{type(e).__name__}"
+        latencies.append(time.perf_counter() - started)
+        phases[phase] = phases.get(phase, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(jobs)))
+    wall_s = time.perf_counter() - started
+    await async_http.close()
+    return {"wall_s": wall_s, "latencies": latencies, "phases": phases}
+
+
+def run_scenario(
+    jobs: int,
+    *,
+    platform: str = "dummy-async",
+    latency_s: float = 0.005,
+    job_duration_s: float = 0.5,
+    error_rate: float = 0.0,
+    poll_s: float = 0.2,
+    max_in_flight: Optional[int] = 256,
+) -> Dict[str, Any]:
+    from function_app import get_status_activity, prepare_activity, submit_activity, orchestrate_submission
+
+    tokens._credential = _BenchCredential
+    # The single-process backend times out connections long before 10k jobs'
+    # worth of polls; the platform's in-flight cap queues them in the worker.
+    env = f"{platform.upper().replace('-', '_')}_MAX_IN_FLIGHT"
+    if max_in_flight:
+        os.environ[env] = str(max_in_flight)
+    else:
+        os.environ.pop(env, None)
+    breaker.reset()
+    limits.reset()
+    activities = {
+        "prepare_activity": prepare_activity,
+        "submit_activity": submit_activity,
+        "get_status_activity": get_status_activity,
+    }
+    orchestrator = orchestrate_submission.build().get_user_function().orchestrator_function
+    runtime = WallClockRuntime(orchestrator, activities)
+    req = {
+        "platform": platform,
+        "poll_policy": {"kind": "fixed", "poll_s": poll_s},
+        "timeout_s": 3600,
+    }
+    with DummyBackend(latency_s=latency_s, job_duration_s=job_duration_s, error_rate=error_rate) as backend:
+        os.environ["DUMMY_BASE_URL"] = backend.url
+        registry.close()
+        outcome = asyncio.run(_run_jobs(runtime, req, jobs))
+        backend_requests = backend.total_requests
+    registry.close()
+
+    stats = runtime.stats
+    latencies = outcome["latencies"]
+    return {
+        "jobs": jobs,
+        "platform": platform,
+        "backend": {"latency_s": latency_s, "job_duration_s": job_duration_s, "error_rate": error_rate},
+        "poll_s": poll_s,
+        "max_in_flight": max_in_flight,
+        "wall_s": outcome["wall_s"],
+        "jobs_per_s": jobs / outcome["wall_s"],
+        "phases": outcome["phases"],
+        "activity_calls_per_job": {name: n / jobs for name, n in stats.activity_calls.items()},
+        "episodes_per_job": stats.episodes / jobs,
+        "history_events_per_job": stats.history_events / jobs,
+        "history_bytes_per_job": stats.history_bytes / jobs,
+        "replay_cpu_s": stats.replay_cpu_s,
+        "replay_cpu_us_per_job": stats.replay_cpu_s / jobs * 1e6,
+        "backend_requests": backend_requests,
+        "backend_requests_per_s": backend_requests / outcome["wall_s"],
+        "latency_s": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies),
+        },
+    }
+
+
+def run(jobs: List[int], out: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+    results = {
+        "bench": "pipeline",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": py_platform.python_version(),
+        "scenarios": [run_scenario(n, **kwargs) for n in jobs],
+    }
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--platform", default="dummy-async")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--job-duration-s", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--poll-s", type=float, default=0.2)
+    parser.add_argument("--max-in-flight", type=int, default=256, help="platform in-flight cap; 0 for none")
+    parser.add_argument("--out", help="write the results as JSON to this path")
+    args = parser.parse_args()
+    results = run(
+        args.jobs,
+        args.out,
+        platform=args.platform,
+        latency_s=args.latency_ms / 1000.0,
+        job_duration_s=args.job_duration_s,
+        error_rate=args.error_rate,
+        poll_s=args.poll_s,
+        max_in_flight=args.max_in_flight,
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Completion detection lag and status traffic: polling versus pushed events.
+
+    python -m bench.bench_push_latency --duration-s 95 --poll-s 10
+"""
+
+import argparse
+import json
+from datetime import timedelta
+from typing import Any, Dict
+
+import bench  # noqa: F401  (puts azf/ on sys.path)
+from bench.durable_sim import OrchestrationSimulator
+from function_app import JOB_STATE_CHANGED, orchestrate_submission
+from platform_core.state import JobPhase, JobState
+
+
+def simulate(duration_s: float, poll_s: int, push: bool, webhook_delay_s: float = 0.2) -> Dict[str, Any]:
+    sim = OrchestrationSimulator(orchestrate_submission.build().get_user_function().orchestrator_function, {})
+    finished_at = sim.now + timedelta(seconds=duration_s)
+    observed = {}
+
+    def status(_args):
+        phase = JobPhase.SUCCEEDED if sim.now >= finished_at else JobPhase.RUNNING
+        return JobState(phase, raw_status={})
+
+    def callback(_args):
+        observed["at"] = sim.now
+
+    sim.activities.update({
+        "prepare_activity": lambda args: args["payload"],
+        "submit_activity": lambda args: {"platform": args["platform"], "job_id": "bench-job"},
+        "get_status_activity": status,
+        "callback_activity": callback,
+    })
+    if push:
+        sim.raise_event_at(finished_at + timedelta(seconds=webhook_delay_s), JOB_STATE_CHANGED, {"status": "succeeded"})
+
+    sim.run({
+        "platform": "dummy", "payload": {}, "callback_url": "http://callback.invalid",
+        "poll_s": poll_s, "timeout_s": int(duration_s * 4) + 60, "push_events": push,
+    })
+    return {
+        "mode": "push" if push else "poll",
+        "detection_lag_s": (observed["at"] - finished_at).total_seconds(),
+        "status_calls": sim.stats.activity_calls.get("get_status_activity", 0),
+        "history_events": sim.stats.history_events,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration-s", type=float, default=95)
+    parser.add_argument("--poll-s", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps([simulate(args.duration_s, args.poll_s, push) for push in (False, True)], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Load test: status polls from many concurrent orchestrations against a backend
+with limited capacity, with and without a per-platform limiter.
+
+Without limits every poll is sent at once: the overloaded backend slows down
+for everyone and answers 429, and the retries add more load. With
+`max_in_flight` at the backend's capacity, polls queue in the worker instead.
+
+    python -m bench.bench_rate_limit --duration-s 5 --concurrency 100 --capacity 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict
+
+from bench.bench_command_overhead import _BenchCredential
+from bench.dummy_backend import DummyBackend
+from platform_core import async_http, limits, registry, tokens
+
+
+async def _poll_for(plans, concurrency: int, duration_s: float, retry_delay_s: float) -> Dict[str, Any]:
+    from function_app import get_status_activity
+
+    deadline = time.perf_counter() + duration_s
+    completed = failures = 0
+
+    async def worker(offset: int):
+        nonlocal completed, failures
+        i = offset
+        while time.perf_counter() < deadline:
+            try:
+                await get_status_activity({"platform": "dummy-async", "plan": plans[i % len(plans)]})
+                completed += 1
+                i += concurrency
+            except async_http.HTTPStatusError:
+                # Stand-in for the activity retry an orchestration would schedule.
+                failures += 1
+                await asyncio.sleep(retry_delay_s)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    await async_http.close()
+    return {"goodput_per_s": completed / duration_s, "completed": completed, "failed_attempts": failures}
+
+
+def run(duration_s: float = 5.0, concurrency: int = 100, capacity: int = 20, latency_s: float = 0.02,
+        retry_delay_s: float = 0.05) -> Dict[str, Any]:
+    tokens._credential = _BenchCredential
+    results = {}
+    with DummyBackend(latency_s=latency_s, capacity=capacity, retry_after_s=0.05) as backend:
+        os.environ["DUMMY_BASE_URL"] = backend.url
+        plans = [{"job_id": backend.submit({}), "aux": {"base": backend.url}} for _ in range(concurrency)]
+        for label, max_in_flight in (("unlimited", None), ("limited", capacity)):
+            if max_in_flight:
+                os.environ["DUMMY_ASYNC_MAX_IN_FLIGHT"] = str(max_in_flight)
+            else:
+                os.environ.pop("DUMMY_ASYNC_MAX_IN_FLIGHT", None)
+            limits.reset()
+            before_requests, before_throttled = backend.total_requests, backend.throttled
+            row = asyncio.run(_poll_for(plans, concurrency, duration_s, retry_delay_s))
+            row["backend_requests"] = backend.total_requests - before_requests
+            row["backend_429s"] = backend.throttled - before_throttled
+            results[label] = row
+        registry.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration-s", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--capacity", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.duration_s, args.concurrency, args.capacity, args.latency_ms / 1000.0), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Replay cost of orchestrate_submission per job, with and without continue_as_new.
+
+    python -m bench.bench_replay_cost --polls 360 --checkpoint-polls 0 50
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List
+
+import bench  # noqa: F401  (puts azf/ on sys.path)
+from bench.durable_sim import OrchestrationSimulator
+from function_app import orchestrate_submission
+from platform_core.state import JobPhase, JobState
+
+
+def simulate_job(polls: int, checkpoint_polls: int, poll_s: int = 10) -> Dict[str, Any]:
+    seen = {"polls": 0}
+
+    def status(_args):
+        seen["polls"] += 1
+        phase = JobPhase.SUCCEEDED if seen["polls"] >= polls else JobPhase.RUNNING
+        return JobState(phase, raw_status={"poll": seen["polls"]})
+
+    activities = {
+        "prepare_activity": lambda args: args["payload"],
+        "submit_activity": lambda args: {"platform": args["platform"], "job_id": "bench-job"},
+        "get_status_activity": status,
+        "callback_activity": lambda args: None,
+    }
+    sim = OrchestrationSimulator(orchestrate_submission.build().get_user_function().orchestrator_function, activities)
+    result = sim.run({
+        "platform": "dummy",
+        "payload": {},
+        "callback_url": "http://callback.invalid",
+        "poll_s": poll_s,
+        "timeout_s": polls * poll_s * 2,
+        "checkpoint_polls": checkpoint_polls,
+    })
+    assert result.phase == JobPhase.SUCCEEDED
+    return {"polls": polls, "checkpoint_polls": checkpoint_polls, **sim.stats.as_dict()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polls", type=int, default=360, help="status polls until the job succeeds")
+    parser.add_argument("--checkpoint-polls", type=int, nargs="+", default=[0, 50],
+                        help="0 disables continue_as_new")
+    args = parser.parse_args()
+    rows: List[Dict[str, Any]] = [simulate_job(args.polls, cp) for cp in args.checkpoint_polls]
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
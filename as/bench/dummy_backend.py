@@ -0,0 +1,264 @@
+"""
+Local stand-in for the dummy provider backend (`DUMMY_BASE_URL`).
+
+Speaks HTTP/1.1 with keep-alive so connection reuse is observable, and counts
+requests and accepted connections. Jobs become RUNNING on submit and SUCCEEDED
+(or FAILED if the payload says `"fail": true`) after `job_duration_s`; payloads
+saying `"invalid": true` are rejected with 400. `POST /submit/batch` takes
+{"items": [...]} and answers one {"job_id"} or {"error"} per item, and
+`POST /cancel/{job_id}` stops a running job as "cancelled". Payloads
+with a `notify_url` get a webhook POST when they finish; POSTs to `/_inbox` are
+recorded in `inbox`, so the backend can also stand in for a webhook receiver;
+the first `inbox_failures` of them are answered 503, each after `inbox_latency_s`.
+With a `capacity`, requests beyond that many in flight slow everyone down and
+are answered 429 with `Retry-After: retry_after_s`.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 makes concurrent clients wait on SYN retries.
+    request_queue_size = 1024
+
+
+class DummyBackend:
+    def __init__(
+        self,
+        *,
+        latency_s: float = 0.0,
+        job_duration_s: float = 0.0,
+        error_rate: float = 0.0,
+        capacity: Optional[int] = None,
+        retry_after_s: float = 1.0,
+        inbox_latency_s: float = 0.0,
+        inbox_failures: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency_s = latency_s
+        self.job_duration_s = job_duration_s
+        self.error_rate = error_rate
+        self.capacity = capacity
+        self.retry_after_s = retry_after_s
+        self.inbox_latency_s = inbox_latency_s
+        self.inbox_failures = inbox_failures
+        self.in_flight = 0
+        self.throttled = 0
+        self.clock = clock
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 0
+        self.requests: Dict[str, int] = {}
+        self.connections = 0
+        self.inbox: List[Dict[str, Any]] = []
+        self._inbox_event = threading.Condition(self._lock)
+        self._timers: List[threading.Timer] = []
+        self._server = _Server((host, port), self._handler_cls())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "DummyBackend":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "DummyBackend":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    # -- job model ---------------------------------------------------------
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        with self._lock:
+            self._next_id += 1
+            job_id = f"job-{self._next_id}"
+            self._jobs[job_id] = {"submitted": self.clock(), "payload": payload or {}}
+        notify_url = (payload or {}).get("notify_url")
+        if notify_url:
+            duration = payload.get("duration_s", self.job_duration_s)
+            timer = threading.Timer(duration, self._notify, args=(job_id, notify_url))
+            timer.daemon = True
+            self._timers.append(timer)
+            timer.start()
+        return job_id
+
+    def _notify(self, job_id: str, notify_url: str) -> None:
+        try:
+            requests.post(notify_url, json=self.job_status(job_id), timeout=5)
+        except requests.RequestException:
+            pass
+
+    def wait_for_inbox(self, count: int, timeout_s: float = 5.0) -> List[Dict[str, Any]]:
+        with self._inbox_event:
+            self._inbox_event.wait_for(lambda: len(self.inbox) >= count, timeout_s)
+            return list(self.inbox)
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.get("cancelled"):
+            return {"job_id": job_id, "status": "cancelled"}
+        duration = job["payload"].get("duration_s", self.job_duration_s)
+        if self.clock() - job["submitted"] < duration:
+            return {"job_id": job_id, "status": "running"}
+        status = "failed" if job["payload"].get("fail") else "succeeded"
+        return {"job_id": job_id, "status": status}
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a running job; finished jobs keep their status."""
+        status = self.job_status(job_id)
+        if status is not None and status["status"] == "running":
+            with self._lock:
+                self._jobs[job_id]["cancelled"] = True
+            status = {"job_id": job_id, "status": "cancelled"}
+        return status
+
+    # -- HTTP --------------------------------------------------------------
+
+    def _count(self, endpoint: str) -> bool:
+        """Record a request; returns True when an injected error should be served."""
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def _handler_cls(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with backend._lock:
+                    backend.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _body(self) -> Any:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                return json.loads(raw) if raw else None
+
+            def _send(self, code: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _serve(self, endpoint: str) -> bool:
+                with backend._lock:
+                    backend.in_flight += 1
+                    load = backend.in_flight / backend.capacity if backend.capacity else 0
+                try:
+                    if backend.latency_s:
+                        # Past capacity every request slows down, rejected ones included.
+                        time.sleep(backend.latency_s * max(1.0, load))
+                    if load > 1:
+                        with backend._lock:
+                            backend.throttled += 1
+                            backend.requests[endpoint] = backend.requests.get(endpoint, 0) + 1
+                        self._send(429, {"error": "throttled"}, {"Retry-After": str(backend.retry_after_s)})
+                        return False
+                    if backend._count(endpoint):
+                        self._send(503, {"error": "injected"})
+                        return False
+                    return True
+                finally:
+                    with backend._lock:
+                        backend.in_flight -= 1
+
+            def do_POST(self):
+                path = urlsplit(self.path).path
+                body = self._body()
+                if path == "/_inbox":
+                    if backend.inbox_latency_s:
+                        time.sleep(backend.inbox_latency_s)
+                    with backend._inbox_event:
+                        backend.requests["inbox"] = backend.requests.get("inbox", 0) + 1
+                        failed = backend.inbox_failures > 0
+                        if failed:
+                            backend.inbox_failures -= 1
+                        else:
+                            backend.inbox.append(body)
+                            backend._inbox_event.notify_all()
+                    if failed:
+                        self._send(503, {"error": "injected"})
+                    else:
+                        self._send(202, {})
+                    return
+                if path == "/submit":
+                    if self._serve("submit"):
+                        if (body or {}).get("invalid"):
+                            self._send(400, {"error": "invalid payload"})
+                        else:
+                            self._send(200, {"job_id": backend.submit(body)})
+                    return
+                if path == "/submit/batch":
+                    if self._serve("submit_batch"):
+                        results = [
+                            {"error": "invalid payload"} if (item or {}).get("invalid") else {"job_id": backend.submit(item)}
+                            for item in (body or {}).get("items") or []
+                        ]
+                        self._send(200, {"results": results})
+                    return
+                if path.startswith("/cancel/"):
+                    if self._serve("cancel"):
+                        status = backend.cancel(path[len("/cancel/"):])
+                        self._send(200 if status else 404, status or {"error": "unknown job"})
+                    return
+                self._send(404, {"error": "not found"})
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/status":
+                    if self._serve("status_batch"):
+                        ids = [i for i in ",".join(parse_qs(parts.query).get("ids", [])).split(",") if i]
+                        jobs = {i: s for i in ids if (s := backend.job_status(i)) is not None}
+                        self._send(200, {"jobs": jobs})
+                    return
+                if parts.path.startswith("/status/"):
+                    if self._serve("status"):
+                        status = backend.job_status(parts.path[len("/status/"):])
+                        self._send(200 if status else 404, status or {"error": "unknown job"})
+                    return
+                self._send(404, {"error": "not found"})
+
+        return Handler
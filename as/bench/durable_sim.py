@@ -0,0 +1,318 @@
+"""
+Deterministic, in-process stand-in for the Durable Functions replay loop.
+
+Every wake-up ("episode") re-runs the orchestrator generator from the start,
+feeding it completed results from history, exactly like the real runtime.
+Time is virtual: timers advance the clock instantly. The simulator counts the
+history events each generation accumulates and how many of them are replayed,
+which is where orchestration cost grows with job length. Payload sizes are
+tracked the same way (`history_bytes`, `replayed_bytes`) as the JSON size of
+inputs, activity inputs/results and event data.
+
+`WallClockRuntime` applies the same replay model to many concurrent instances
+in real time, for load tests against a live backend.
+"""
+
+import asyncio
+import copy
+import dataclasses
+import inspect
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(eq=False)
+class SimTask:
+    kind: str
+    name: Any
+    input: Any = None
+    result: Any = None
+    cancelled: bool = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+@dataclass
+class SimStats:
+    generations: int = 0
+    episodes: int = 0
+    activity_calls: Dict[str, int] = field(default_factory=dict)
+    timers: int = 0
+    history_events: int = 0
+    peak_history_events: int = 0
+    replayed_events: int = 0
+    replay_cpu_s: float = 0.0
+    history_bytes: int = 0
+    peak_history_bytes: int = 0
+    replayed_bytes: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "generations": self.generations,
+            "episodes": self.episodes,
+            "activity_calls": dict(self.activity_calls),
+            "timers": self.timers,
+            "history_events": self.history_events,
+            "peak_history_events": self.peak_history_events,
+            "replayed_events": self.replayed_events,
+            "replay_cpu_s": self.replay_cpu_s,
+            "history_bytes": self.history_bytes,
+            "peak_history_bytes": self.peak_history_bytes,
+            "replayed_bytes": self.replayed_bytes,
+        }
+
+
+def _json_default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def payload_bytes(value: Any) -> int:
+    """Size of `value` as the runtime would persist it in history."""
+    return len(json.dumps(value, default=_json_default, separators=(",", ":")))
+
+
+class SimContext:
+    def __init__(self, instance_id: str, input_: Any, now: datetime):
+        self.instance_id = instance_id
+        self._input = input_
+        self.current_utc_datetime = now
+        self.is_replaying = True
+        self.custom_status = None
+        self.continued_with: Optional[Any] = None
+
+    def get_input(self) -> Any:
+        return copy.deepcopy(self._input)
+
+    def call_activity(self, name: str, input_: Any = None) -> SimTask:
+        return SimTask("activity", name, copy.deepcopy(input_))
+
+    def create_timer(self, fire_at: datetime) -> SimTask:
+        return SimTask("timer", fire_at)
+
+    def wait_for_external_event(self, name: str) -> SimTask:
+        return SimTask("event", name)
+
+    def task_any(self, tasks: List[SimTask]) -> SimTask:
+        return SimTask("any", None, list(tasks))
+
+    def set_custom_status(self, status: Any) -> None:
+        self.custom_status = status
+
+    def continue_as_new(self, input_: Any) -> None:
+        self.continued_with = copy.deepcopy(input_)
+
+
+@dataclass
+class _Record:
+    result: Any
+    completed_at: datetime
+    events: int
+    winner: Optional[int] = None
+    size: int = 0
+
+
+class _Generation:
+    """History of one orchestration generation (until continue_as_new)."""
+
+    def __init__(self, input_: Any):
+        self.input = input_
+        self.history: List[_Record] = []
+        self.events = 1  # ExecutionStarted
+        self.size = payload_bytes(input_)
+
+    def append(self, record: _Record) -> None:
+        self.history.append(record)
+        self.events += record.events
+        self.size += record.size
+
+
+class OrchestrationSimulator:
+    def __init__(
+        self,
+        orchestrator: Callable[[Any], Any],
+        activities: Dict[str, Callable[[Any], Any]],
+        *,
+        start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc),
+        max_episodes: int = 1_000_000,
+    ):
+        self.orchestrator = orchestrator
+        self.activities = activities
+        self.now = start
+        self.max_episodes = max_episodes
+        self.stats = SimStats()
+        self.custom_status: Any = None
+        self._events: List[Tuple[datetime, str, Any]] = []
+
+    def raise_event_at(self, when: datetime, name: str, data: Any = None) -> None:
+        """Buffer an external event that becomes visible at virtual time `when`."""
+        self._events.append((when, name, data))
+        self._events.sort(key=lambda e: e[0])
+
+    def run(self, input_: Any, instance_id: str = "sim-instance") -> Any:
+        while True:
+            self.stats.generations += 1
+            ctx, output = self._run_generation(input_, instance_id)
+            if ctx.continued_with is None:
+                return output
+            input_ = ctx.continued_with
+
+    def _run_generation(self, input_: Any, instance_id: str):
+        gen = _Generation(input_)
+        while True:
+            ctx, done, value, pending = self._episode(gen, instance_id)
+            if done:
+                return ctx, value
+            gen.append(self._execute(pending))
+
+    def _now(self) -> datetime:
+        return self.now
+
+    def _episode(self, gen: "_Generation", instance_id: str):
+        """Replay `gen`'s history once; returns (ctx, done, output, pending task)."""
+        if self.stats.episodes >= self.max_episodes:
+            raise RuntimeError("Simulation exceeded max_episodes")
+        self.stats.episodes += 1
+        self.stats.replayed_events += gen.events
+        self.stats.replayed_bytes += gen.size
+        gen.events += 2  # OrchestratorStarted / OrchestratorCompleted
+
+        ctx = SimContext(instance_id, gen.input, self._now())
+        done, value, pending = self._replay(ctx, gen.history)
+        self.custom_status = ctx.custom_status
+        if done:
+            gen.events += 1  # ExecutionCompleted / ContinuedAsNew
+            self._close_generation(gen.events, gen.size + payload_bytes(value) + payload_bytes(ctx.continued_with))
+        return ctx, done, value, pending
+
+    def _replay(self, ctx: SimContext, history: List[_Record]):
+        started = time.perf_counter()
+        gen = self.orchestrator(ctx)
+        try:
+            task = next(gen)
+            for record in history:
+                ctx.current_utc_datetime = record.completed_at
+                if record.winner is not None:
+                    winner = task.input[record.winner]
+                    winner.result = record.result
+                    task = gen.send(winner)
+                else:
+                    task.result = record.result
+                    task = gen.send(record.result)
+            ctx.is_replaying = False
+            ctx.current_utc_datetime = self._now()
+            return False, None, task
+        except StopIteration as stop:
+            return True, stop.value, None
+        finally:
+            self.stats.replay_cpu_s += time.perf_counter() - started
+
+    def _execute(self, task: SimTask) -> _Record:
+        if task.kind == "activity":
+            calls = self.stats.activity_calls
+            calls[task.name] = calls.get(task.name, 0) + 1
+            result = self.activities[task.name](task.input)
+            if inspect.iscoroutine(result):
+                result = asyncio.run(result)
+            return _Record(copy.deepcopy(result), self.now, 2, size=payload_bytes(task.input) + payload_bytes(result))
+        if task.kind == "timer":
+            self.stats.timers += 1
+            self.now = max(self.now, task.name)
+            return _Record(None, self.now, 2)
+        if task.kind == "event":
+            when, data = self._take_event(task.name, None)
+            self.now = max(self.now, when)
+            return _Record(data, self.now, 1, size=payload_bytes(data))
+        if task.kind == "any":
+            return self._execute_any(task.input)
+        raise TypeError(f"Unsupported task kind '{task.kind}'")
+
+    def _take_event(self, name: str, before: Optional[datetime]):
+        for i, (when, ev_name, data) in enumerate(self._events):
+            if ev_name == name and (before is None or when <= before):
+                del self._events[i]
+                return when, data
+        if before is None:
+            raise RuntimeError(f"Orchestration waits forever on event '{name}'")
+        return None
+
+    def _execute_any(self, children: List[SimTask]) -> _Record:
+        timers = [(c.name, i) for i, c in enumerate(children) if c.kind == "timer"]
+        first_timer, timer_idx = min(timers) if timers else (None, None)
+        for i, child in enumerate(children):
+            if child.kind not in ("event", "timer"):
+                raise TypeError(f"Unsupported task_any child '{child.kind}'")
+            if child.kind == "event":
+                hit = self._take_event(child.name, first_timer)
+                if hit is not None:
+                    self.now = max(self.now, hit[0])
+                    return _Record(hit[1], self.now, len(children) + 1, winner=i, size=payload_bytes(hit[1]))
+        self.stats.timers += 1
+        self.now = max(self.now, first_timer)
+        return _Record(None, self.now, len(children) + 1, winner=timer_idx)
+
+    def _close_generation(self, events: int, size: int) -> None:
+        self.stats.history_events += events
+        self.stats.peak_history_events = max(self.stats.peak_history_events, events)
+        self.stats.history_bytes += size
+        self.stats.peak_history_bytes = max(self.stats.peak_history_bytes, size)
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+class WallClockRuntime(OrchestrationSimulator):
+    """
+    Runs many orchestrations concurrently on one event loop in real time, for
+    load tests against a live backend. Replay and history accounting are the
+    simulator's; activities are awaited and timers sleep until they fire.
+    Stats accumulate over every instance run. External events are not supported.
+    """
+
+    def __init__(self, orchestrator: Callable[[Any], Any], activities: Dict[str, Callable[[Any], Any]], **kwargs):
+        super().__init__(orchestrator, activities, start=datetime.now(timezone.utc), **kwargs)
+
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def run_async(self, input_: Any, instance_id: str = "sim-instance") -> Any:
+        while True:
+            self.stats.generations += 1
+            gen = _Generation(input_)
+            while True:
+                ctx, done, value, pending = self._episode(gen, instance_id)
+                if done:
+                    break
+                gen.append(await self._execute_async(pending))
+            if ctx.continued_with is None:
+                return value
+            input_ = ctx.continued_with
+
+    async def _execute_async(self, task: SimTask) -> _Record:
+        if task.kind == "activity":
+            calls = self.stats.activity_calls
+            calls[task.name] = calls.get(task.name, 0) + 1
+            result = self.activities[task.name](task.input)
+            if inspect.isawaitable(result):
+                result = await result
+            return _Record(copy.deepcopy(result), self._now(), 2, size=payload_bytes(task.input) + payload_bytes(result))
+        if task.kind == "timer":
+            self.stats.timers += 1
+            await asyncio.sleep(max(0.0, (task.name - self._now()).total_seconds()))
+            return _Record(None, self._now(), 2)
+        if task.kind == "any":
+            timers = [(c.name, i) for i, c in enumerate(task.input) if c.kind == "timer"]
+            if len(timers) != len(task.input):
+                raise TypeError("WallClockRuntime only races timers")
+            fire_at, winner = min(timers)
+            self.stats.timers += 1
+            await asyncio.sleep(max(0.0, (fire_at - self._now()).total_seconds()))
+            return _Record(None, self._now(), len(task.input) + 1, winner=winner)
+        raise TypeError(f"Unsupported task kind '{task.kind}'")
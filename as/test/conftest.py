@@ -5,10 +5,11 @@ import time
 
 _TESTS_DIR = os.path.dirname(__file__)
 _AZF_DIR = os.path.abspath(os.path.join(_TESTS_DIR, "..", "azf"))
+_AS_DIR = os.path.abspath(os.path.join(_TESTS_DIR, ".."))
 if _AZF_DIR not in sys.path:
     sys.path.insert(0, _AZF_DIR)
-
-import platform_core.providers.dummy  # noqa: F401
+if _AS_DIR not in sys.path:
+    sys.path.append(_AS_DIR)
 
 def pytest_configure(config):
     config.addinivalue_line(
@@ -21,24 +22,65 @@ def _env_dummy_base_url(monkeypatch):
     monkeypatch.setenv("DUMMY_BASE_URL", "http://dummy")
     yield
 
+class _FakeAccessToken:
+    def __init__(self, token="test-token", expires_in=3600):
+        self.token = token
+        self.expires_on = int(time.time()) + expires_in
+
+class _FakeCredential:
+    def __init__(self):
+        self.calls = 0
+        self.expires_in = 3600
+
+    def get_token(self, *scopes, **kwargs):
+        if not scopes and "scopes" in kwargs:
+            _ = kwargs["scopes"]
+        self.calls += 1
+        return _FakeAccessToken(expires_in=self.expires_in)
+
+@pytest.fixture(autouse=True)
+def _reset_command_instances():
+    from platform_core import registry
+    registry.close()
+    yield
+    registry.close()
+
+@pytest.fixture(autouse=True)
+def _reset_token_cache():
+    from platform_core.tokens import token_cache
+    token_cache().clear()
+    yield
+    token_cache().clear()
+
+@pytest.fixture
+def claim_store(tmp_path, monkeypatch):
+    """Enable claim-check offloading of anything above 64 bytes into tmp_path."""
+    from platform_core import claimcheck
+    monkeypatch.setenv("CLAIM_CHECK_STORE", str(tmp_path / "claims"))
+    monkeypatch.setenv("CLAIM_CHECK_THRESHOLD_BYTES", "64")
+    claimcheck.reset()
+    yield claimcheck.claims()
+    claimcheck.reset()
+
+@pytest.fixture
+def dummy_backend():
+    from bench.dummy_backend import DummyBackend
+    with DummyBackend() as backend:
+        yield backend
+    from platform_core import http_pool
+    http_pool.close_all()
+
+@pytest.fixture
+def fake_credential():
+    return _FakeCredential()
+
 @pytest.fixture(autouse=True)
-def _patch_credential(monkeypatch, request):
+def _patch_credential(monkeypatch, request, fake_credential):
     if request.node.get_closest_marker("no_token_patch"):
         yield
         return
 
-    class _FakeAccessToken:
-        def __init__(self, token="test-token", expires_in=3600):
-            self.token = token
-            self.expires_on = int(time.time()) + expires_in
-
-    class _FakeCredential:
-        def get_token(self, *scopes, **kwargs):
-            if not scopes and "scopes" in kwargs:
-                _ = kwargs["scopes"]
-            return _FakeAccessToken()
-
-    fake_cred = _FakeCredential()
+    fake_cred = fake_credential
 
     try:
         import platform_core.tokens as tokens_mod
@@ -54,3 +96,26 @@ def _patch_credential(monkeypatch, request):
 
     yield
 
+
+@pytest.fixture(autouse=True)
+def _reset_breakers():
+    from platform_core import breaker
+    breaker.reset()
+    yield
+    breaker.reset()
+
+@pytest.fixture(autouse=True)
+def _reset_callback_delivery():
+    from platform_core import callbacks
+    callbacks.reset()
+    yield
+    callbacks.reset()
+
+@pytest.fixture
+def memory_metrics(monkeypatch):
+    """Route metrics to a fresh in-memory registry."""
+    from platform_core import metrics
+    monkeypatch.setenv("METRICS_BACKEND", "memory")
+    metrics.reset()
+    yield metrics.metrics()
+    metrics.reset()
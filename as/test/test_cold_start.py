@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+_AZF_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "azf"))
+
+# Generous enough for slow CI runners; a provider SDK leaking into the
+# function_app import graph blows through it.
+_BUDGET_MS = float(os.environ.get("FUNCTION_APP_IMPORT_BUDGET_MS", "1500"))
+
+
+def _import_times(module: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_AZF_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name] = int(cumulative)
+    return times
+
+
+def test_function_app_cold_start_import_budget():
+    times = _import_times("function_app")
+    assert "function_app" in times
+    assert not any(name.split(".")[0] == "mlflow" for name in times)
+    assert not any(name.startswith("platform_core.providers") for name in times)
+    cumulative_ms = times["function_app"] / 1000.0
+    assert cumulative_ms < _BUDGET_MS, f"function_app import took {cumulative_ms:.0f} ms (budget {_BUDGET_MS:.0f} ms)"
+
+
+def test_provider_is_imported_on_first_use():
+    code = (
+        "import sys; from platform_core.registry import get_platform_commands as g; "
+        "before = [m for m in sys.modules if m.startswith('platform_core.providers')]; "
+        "g('dummy'); "
+        "after = [m for m in sys.modules if m.startswith('platform_core.providers')]; "
+        "print(len(before), len(after) > 0)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=_AZF_DIR, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["0", "True"]
@@ -5,25 +5,39 @@ from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from types import SimpleNamespace
 from typing import Callable, Dict, Any, Iterable, List
-from unittest.mock import AsyncMock, Mock, call
-from platform_core.state import JobState
+from unittest.mock import ANY, AsyncMock, Mock, call
+from platform_core.state import JobPhase, JobState
 import pytest
 import azure.functions as func
 import azure.durable_functions as df
 from azure.durable_functions.testing import orchestrator_generator_wrapper
 
 from function_app import (
+    CANCEL_REQUESTED,
+    JOB_STATE_CHANGED,
     http_start,
+    http_start_batch,
+    orchestrate_batch,
+    http_job_event,
     orchestrate_submission,
+    prepare_activity,
     submit_activity,
+    submit_many_activity,
     get_status_activity,
     callback_activity,
+    cancel_activity,
+    http_cancel,
+    http_progress,
 )
 
 
 class FakeTask:
     def __init__(self, result=None):
         self.result = result
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
 
 @pytest.fixture
 def fake_task_cls():
@@ -93,7 +107,10 @@ def test_http_start_adds_platform_and_starts_instance(http_start_func, make_http
 
     client.start_new.assert_called_once_with(
         "orchestrate_submission",
-        client_input={"payload": {"foo": "bar"}, "callback_url": "http://callback.example/test", "platform": "dummy"},
+        client_input={
+            "payload": {"foo": "bar"}, "callback_url": "http://callback.example/test", "platform": "dummy",
+            "requested_at": ANY,
+        },
     )
     client.create_check_status_response.assert_called_once_with(req, "iid-123")
     assert result == "check-status-response"
@@ -189,18 +206,26 @@ def test_submit_activity_invokes_platform_submit(monkeypatch):
 
     submit_cmd = Mock()
     submit_cmd.execute.return_value = {"job_id": "jid-123"}
-    registry = Mock()
-    registry.submit.return_value = submit_cmd
+    lookups = []
+
+    def get_command(platform, kind):
+        lookups.append((platform, kind))
+        return submit_cmd
 
-    monkeypatch.setattr(function_app, "get_platform_commands", lambda platform: registry)
+    monkeypatch.setattr(function_app, "get_command", get_command)
 
     args = {"platform": "dummy", "payload": {"k": "v"}}
-    result = submit_activity(args)
+    result = asyncio.run(submit_activity(args))
 
-    registry.submit.assert_called_once_with()
+    assert lookups == [("dummy", "submit")]
     submit_cmd.execute.assert_called_once_with({"k": "v"})
     assert result == {"job_id": "jid-123"}
 
+
+def test_prepare_activity_passes_payload_through_by_default():
+    args = {"platform": "dummy", "payload": {"k": "v"}}
+    assert asyncio.run(prepare_activity(args)) == {"k": "v"}
+
 @pytest.mark.parametrize(
     "phase,message,raw,expected_phase",
     [
@@ -220,15 +245,18 @@ def test_get_status_activity_maps_jobstate(monkeypatch, phase, message, raw, exp
 
     status_cmd = Mock()
     status_cmd.execute.return_value = fake_state
-    registry = Mock()
-    registry.status.return_value = status_cmd
+    lookups = []
 
-    monkeypatch.setattr(function_app, "get_platform_commands", lambda platform: registry)
+    def get_command(platform, kind):
+        lookups.append((platform, kind))
+        return status_cmd
+
+    monkeypatch.setattr(function_app, "get_command", get_command)
 
     args = {"platform": "dummy", "plan": {"job_id": "jid-123"}}
-    result = get_status_activity(args)
+    result = asyncio.run(get_status_activity(args))
 
-    registry.status.assert_called_once_with()
+    assert lookups == [("dummy", "status")]
     status_cmd.execute.assert_called_once_with({"job_id": "jid-123"})
 
     # Adapted to object-style response (not dict)
@@ -236,22 +264,1033 @@ def test_get_status_activity_maps_jobstate(monkeypatch, phase, message, raw, exp
     assert result.raw_status == raw
     assert result.message == message
 
-def test_callback_activity_posts_json(monkeypatch):
+def test_get_status_activity_reports_outages_and_fails_fast_while_circuit_is_open(monkeypatch):
     import function_app
 
-    post_mock = Mock()
-    monkeypatch.setattr(function_app, "requests", SimpleNamespace(post=post_mock))
+    monkeypatch.setenv("DUMMY_BREAKER_FAILURES", "1")
+    monkeypatch.setenv("DUMMY_BREAKER_RESET_S", "45")
+    status_cmd = Mock()
+    status_cmd.execute.side_effect = ConnectionError("backend down")
+    monkeypatch.setattr(function_app, "get_command", lambda platform, kind: status_cmd)
+
+    args = {"platform": "dummy", "plan": {"job_id": "jid-123"}}
+    outage = asyncio.run(get_status_activity(args))
+    assert outage.phase is JobPhase.UNAVAILABLE
+    assert outage.message == "ConnectionError: backend down"
+    result = asyncio.run(get_status_activity(args))
+
+    assert status_cmd.execute.call_count == 1
+    assert result.phase is JobPhase.UNAVAILABLE
+    assert not result.is_terminal
+    assert "Circuit open for platform 'dummy'" in result.message
+    assert 44 < result.next_poll_after_s <= 45
+
+def test_get_status_activity_still_raises_non_outage_errors(monkeypatch):
+    import function_app
+
+    status_cmd = Mock()
+    status_cmd.execute.side_effect = ValueError("bad plan")
+    monkeypatch.setattr(function_app, "get_command", lambda platform, kind: status_cmd)
+
+    with pytest.raises(ValueError, match="bad plan"):
+        asyncio.run(get_status_activity({"platform": "dummy", "plan": {"job_id": "jid"}}))
+
+def test_activities_pass_large_values_as_claim_checks(monkeypatch, claim_store):
+    import function_app
+
+    big_payload = {"config": "c" * 500}
+    seen = {}
+
+    def execute_submit(payload):
+        seen["payload"] = payload
+        return {"job_id": "j", "aux": {"blob": "b" * 500}}
+
+    def execute_status(plan):
+        seen["plan"] = plan
+        return JobState(JobPhase.SUCCEEDED, raw_status={}, output={"model_ids": ["m"] * 200})
+
+    commands = {"submit": Mock(execute=execute_submit), "status": Mock(execute=execute_status)}
+    monkeypatch.setattr(function_app, "get_command", lambda platform, kind: commands[kind])
+
+    payload_ref = claim_store.offload(big_payload)
+    plan_ref = asyncio.run(submit_activity({"platform": "dummy", "payload": payload_ref}))
+    state = asyncio.run(get_status_activity({"platform": "dummy", "plan": {**plan_ref, "cursor": 3}}))
+
+    assert seen["payload"] == big_payload
+    assert seen["plan"] == {"job_id": "j", "aux": {"blob": "b" * 500}, "cursor": 3}
+    assert set(plan_ref) == {"$claim", "bytes"}
+    assert set(state.output) == {"$claim", "bytes"}
+    assert claim_store.resolve(state).output == {"model_ids": ["m"] * 200}
+    assert claim_store.stats()["offloaded"] == 3
+
+
+def _cache_ctx(make_ctx, start_time, fake_task_cls, cached_state, states=()):
+    statuses = _status_sequence_side_effect(fake_task_cls, states)
+
+    def side_effect(name, args):
+        if name == "lookup_result_activity":
+            return fake_task_cls({"key": "k-1", "state": cached_state})
+        if name in ("store_result_activity", "callback_activity"):
+            return fake_task_cls(None)
+        return statuses(name, args)
+
+    req_input = {"platform": "dummy", "payload": {"x": 1}, "callback_url": "http://cb", "cache": True}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=side_effect)
+    ctx.instance_id = "iid-cache"
+    return ctx
+
+
+def test_orchestrator_cache_hit_skips_submit_and_polling(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    cached = JobState(JobPhase.SUCCEEDED, raw_status={}, output=["m-1"])
+    ctx = _cache_ctx(make_ctx, start_time, fake_task_cls, cached)
+
+    run_orchestrator(orchestrator_func, ctx)
+
+    names = [c.args[0] for c in ctx.call_activity.call_args_list]
+    assert names == ["prepare_activity", "lookup_result_activity", "callback_activity"]
+    assert ctx.call_activity.call_args_list[-1].args[1]["result"] is cached
+    ctx.create_timer.assert_not_called()
+
+
+def test_orchestrator_cache_miss_stores_success(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    done = JobState(JobPhase.SUCCEEDED, raw_status={})
+    ctx = _cache_ctx(make_ctx, start_time, fake_task_cls, None, [JobState(JobPhase.RUNNING, raw_status={}), done])
+
+    run_orchestrator(orchestrator_func, ctx)
+
+    calls = ctx.call_activity.call_args_list
+    assert [c.args[0] for c in calls] == [
+        "prepare_activity", "lookup_result_activity", "submit_activity",
+        "get_status_activity", "get_status_activity", "store_result_activity", "callback_activity",
+    ]
+    assert calls[5].args[1] == {"key": "k-1", "state": done}
+
+
+def test_result_activities_round_trip_for_cacheable_platforms(monkeypatch):
+    from function_app import lookup_result_activity, store_result_activity
+    from platform_core import registry, result_cache
+
+    monkeypatch.setenv("RESULT_CACHE_STORE", "memory")
+    result_cache.reset()
+    args = {"platform": "dummy", "payload": {"x": 1, "notify_url": "http://a/1/events"}}
+    assert asyncio.run(lookup_result_activity(args)) == {"key": None, "state": None}
+
+    monkeypatch.setattr(registry.get_platform_commands("dummy"), "cacheable", True)
+    miss = asyncio.run(lookup_result_activity(args))
+    assert miss["key"] and miss["state"] is None
+
+    done = JobState(JobPhase.SUCCEEDED, raw_status={"ok": True}, output=[1])
+    asyncio.run(store_result_activity({"key": miss["key"], "state": done}))
+    rerun = {"platform": "dummy", "payload": {"x": 1, "notify_url": "http://a/2/events"}}
+    assert asyncio.run(lookup_result_activity(rerun)) == {"key": miss["key"], "state": done}
+    result_cache.reset()
+
+
+def test_callback_activity_posts_json_and_reports_delivery(dummy_backend):
+    from platform_core import async_http
 
     args = {
-        "callback_url": "http://callback.example/receive",
-        "result": {"phase": "SUCCEEDED", "data": {"a": 1}},
+        "callback_url": f"{dummy_backend.url}/_inbox",
+        "result": JobState(JobPhase.SUCCEEDED, raw_status={"a": 1}),
+    }
+
+    async def main():
+        try:
+            return await callback_activity(args)
+        finally:
+            await async_http.close()
+
+    delivery = asyncio.run(main())
+
+    assert dummy_backend.inbox == [{"phase": "SUCCEEDED", "raw_status": {"a": 1}, "message": None, "output": None}]
+    assert delivery["delivered"] and delivery["status"] == 202
+    assert delivery["attempts"] == 1 and delivery["batch_size"] == 1
+
+def _status_sequence_side_effect(fake_task_cls, states):
+    seq_iter = iter(states)
+
+    def side_effect(name, args):
+        if name == "get_status_activity":
+            return fake_task_cls(next(seq_iter))
+        if name == "submit_activity":
+            return fake_task_cls({"platform": "dummy", "job_id": "jid"})
+        return fake_task_cls(args.get("payload"))
+    return side_effect
+
+
+def test_orchestrator_records_summary_once_outside_replay(orchestrator_func, make_ctx, start_time, fake_task_cls, memory_metrics):
+    states = [JobState(phase="RUNNING", raw_status={}), JobState(phase="SUCCEEDED", raw_status={})]
+    req_input = {
+        "platform": "dummy", "payload": {}, "poll_s": 10,
+        "requested_at": (start_time - timedelta(seconds=5)).isoformat(),
+    }
+    replay = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, list(states)))
+    replay.is_replaying = True
+    run_orchestrator(orchestrator_func, replay)
+    assert memory_metrics.snapshot()["histograms"] == {}
+
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.is_replaying = False
+    run_orchestrator(orchestrator_func, ctx)
+
+    summary = {
+        name: series["phase=SUCCEEDED,platform=dummy"]["sum"]
+        for name, series in memory_metrics.snapshot()["histograms"].items()
+    }
+    assert summary == {
+        "orchestration.polls": 2,
+        "orchestration.wall_s": 10.0,
+        "orchestration.detection_lag_s": 10.0,
+        "orchestration.queue_to_first_poll_s": 5.0,
+    }
+
+def test_orchestrator_publishes_progress_only_when_it_changes(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [
+        JobState(phase="RUNNING", raw_status={"active": 2, "total": 3}),
+        JobState(phase="RUNNING", raw_status={"active": 1, "total": 3}),
+        JobState(phase="RUNNING", raw_status={"active": 1, "total": 3}),
+        JobState(phase="SUCCEEDED", raw_status={"active": 0, "total": 3}),
+    ]
+    req_input = {"platform": "dummy", "payload": {}, "poll_s": 10}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-progress"
+    run_orchestrator(orchestrator_func, ctx)
+
+    assert [c.args[0] for c in ctx.set_custom_status.call_args_list] == [
+        {"phase": "RUNNING", "active": 2, "total": 3},
+        {"phase": "RUNNING", "active": 1, "total": 3},
+        {"phase": "SUCCEEDED", "active": 0, "total": 3},
+    ]
+
+
+def test_orchestrator_exponential_policy_spaces_out_polls(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="RUNNING", raw_status={}) for _ in range(4)] + [JobState(phase="SUCCEEDED", raw_status={})]
+    req_input = {
+        "platform": "dummy", "payload": {}, "callback_url": "http://cb",
+        "poll_policy": {"kind": "exponential", "min_s": 5, "max_s": 20, "jitter": 0},
+    }
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-exp"
+    run_orchestrator(orchestrator_func, ctx)
+
+    fire_times = [c.args[0] for c in ctx.create_timer.call_args_list]
+    gaps = [(b - a).total_seconds() for a, b in zip([start_time] + fire_times, fire_times)]
+    assert gaps == [5, 10, 20, 20]
+
+
+def test_orchestrator_honors_hint_and_never_sleeps_past_deadline(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [
+        JobState(phase="RUNNING", raw_status={}, next_poll_after_s=3),
+        JobState(phase="RUNNING", raw_status={}, next_poll_after_s=500),
+        JobState(phase="RUNNING", raw_status={}),
+    ]
+    req_input = {"platform": "dummy", "payload": {}, "callback_url": "http://cb", "poll_s": 10, "timeout_s": 60}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-hint"
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    fire_times = [c.args[0] for c in ctx.create_timer.call_args_list]
+    assert fire_times == [start_time + timedelta(seconds=3), start_time + timedelta(seconds=60)]
+    assert values[-1].phase == "TIMEOUT"
+
+
+def test_orchestrator_continues_as_new_after_poll_budget(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="RUNNING", raw_status={}) for _ in range(3)]
+    req_input = {
+        "platform": "dummy", "payload": {"big": "x" * 100}, "callback_url": "http://cb",
+        "poll_s": 10, "timeout_s": 600, "checkpoint_polls": 2,
+    }
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-can"
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    assert values[-1] is None
+    names = [c.args[0] for c in ctx.call_activity.call_args_list]
+    assert names.count("get_status_activity") == 2
+    assert "callback_activity" not in names
+
+    ctx.continue_as_new.assert_called_once()
+    next_input = ctx.continue_as_new.call_args.args[0]
+    assert "payload" not in next_input
+    assert next_input["callback_url"] == "http://cb"
+    assert next_input["checkpoint"] == {
+        "plan": {"platform": "dummy", "job_id": "jid"},
+        "deadline": (start_time + timedelta(seconds=600)).isoformat(),
+        "attempt": 2,
+        "started_at": start_time.isoformat(),
+        "first_poll_at": start_time.isoformat(),
+        "observed_at": (start_time + timedelta(seconds=10)).isoformat(),
+        "polls": 2,
+    }
+
+
+def test_orchestrator_resumes_from_checkpoint_and_keeps_deadline(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    deadline = start_time + timedelta(seconds=15)
+    plan = {"platform": "dummy", "job_id": "jid-resumed"}
+    req_input = {
+        "platform": "dummy", "callback_url": "http://cb", "poll_s": 10, "checkpoint_polls": 5,
+        "checkpoint": {"plan": plan, "deadline": deadline.isoformat(), "attempt": 7},
+    }
+    states = [JobState(phase="RUNNING", raw_status={}) for _ in range(3)]
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-can"
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    names = [c.args[0] for c in ctx.call_activity.call_args_list]
+    assert names == ["get_status_activity"] * 3 + ["cancel_activity", "callback_activity"]
+    assert all(c.args[1]["plan"] == plan for c in ctx.call_activity.call_args_list[:4])
+    assert [c.args[0] for c in ctx.create_timer.call_args_list] == [start_time + timedelta(seconds=10), deadline]
+    assert values[-1].phase == "TIMEOUT"
+    ctx.continue_as_new.assert_not_called()
+
+
+def test_continue_as_new_bounds_history_per_generation():
+    from bench.bench_replay_cost import simulate_job
+
+    unbounded = simulate_job(polls=60, checkpoint_polls=0)
+    bounded = simulate_job(polls=60, checkpoint_polls=10)
+
+    assert unbounded["activity_calls"] == bounded["activity_calls"]
+    assert bounded["generations"] == 6
+    assert bounded["peak_history_events"] * 5 < unbounded["peak_history_events"]
+    assert bounded["replayed_events"] * 3 < unbounded["replayed_events"]
+
+
+def test_pipeline_bench_runs_concurrent_jobs_end_to_end(tmp_path, monkeypatch):
+    from bench.bench_pipeline import run
+    from platform_core import limits
+
+    monkeypatch.setenv("DUMMY_ASYNC_MAX_IN_FLIGHT", "256")  # so the bench's own setting is undone afterwards
+    out = tmp_path / "pipeline.json"
+    try:
+        results = run([5], str(out), latency_s=0.0, job_duration_s=0.05, poll_s=0.02)
+    finally:
+        limits.reset()
+
+    (scenario,) = json.loads(out.read_text())["scenarios"]
+    assert scenario == results["scenarios"][0]
+    assert scenario["phases"] == {"SUCCEEDED": 5}
+    assert scenario["activity_calls_per_job"]["submit_activity"] == 1
+    assert scenario["activity_calls_per_job"]["get_status_activity"] >= 2
+    assert scenario["backend_requests"] == 5 * (1 + scenario["activity_calls_per_job"]["get_status_activity"])
+    assert 0 < scenario["latency_s"]["p50"] <= scenario["latency_s"]["max"]
+
+
+def test_http_start_push_events_preallocates_instance_and_notify_url(http_start_func, make_http_request):
+    body = {"payload": {"foo": "bar"}, "callback_url": "http://cb", "push_events": True}
+    req = make_http_request(url="http://host/api/orchestrators/dummy", route_params={"platform": "dummy"}, body=body)
+
+    client = Mock(spec=df.DurableOrchestrationClient)
+    client.start_new = AsyncMock(side_effect=lambda name, instance_id=None, client_input=None: instance_id)
+    client.create_check_status_response = Mock(return_value="check-status-response")
+    asyncio.run(http_start_func(req, client))
+
+    kwargs = client.start_new.call_args.kwargs
+    iid = kwargs["instance_id"]
+    assert iid
+    assert kwargs["client_input"]["payload"] == {
+        "foo": "bar", "notify_url": f"http://host/api/orchestrators/dummy/{iid}/events",
+    }
+    client.create_check_status_response.assert_called_once_with(req, iid)
+
+
+def _idempotent_client(runtime_status=None, last_updated=None, input_=None):
+    from azure.durable_functions.models.DurableOrchestrationStatus import DurableOrchestrationStatus
+
+    client = Mock(spec=df.DurableOrchestrationClient)
+    client.get_status = AsyncMock(return_value=DurableOrchestrationStatus(
+        runtimeStatus=runtime_status, lastUpdatedTime=last_updated, input=input_,
+    ))
+    client.start_new = AsyncMock(side_effect=lambda name, instance_id=None, client_input=None: instance_id)
+    client.create_check_status_response = Mock(side_effect=lambda req, iid: iid)
+    return client
+
+
+def test_http_start_idempotency_key_gives_deterministic_instance_id(http_start_func, make_http_request):
+    started = []
+    for payload in ({"a": 1}, {"a": 2}):
+        req = make_http_request(route_params={"platform": "dummy"}, body={"payload": payload},
+                                headers={"Idempotency-Key": "order-42"})
+        client = _idempotent_client()
+        started.append(asyncio.run(http_start_func(req, client)))
+        client.get_status.assert_awaited_once_with(started[-1], show_input=True)
+        assert client.start_new.call_args.kwargs["instance_id"] == started[-1]
+
+    assert started[0] == started[1]
+    assert started[0].startswith("idem-")
+
+
+@pytest.mark.parametrize("runtime_status", ["Pending", "Running", "ContinuedAsNew"])
+def test_http_start_returns_existing_live_instance(http_start_func, make_http_request, runtime_status):
+    req = make_http_request(route_params={"platform": "dummy"}, body={"payload": {}},
+                            headers={"Idempotency-Key": "k"})
+    client = _idempotent_client(runtime_status)
+
+    iid = asyncio.run(http_start_func(req, client))
+
+    client.start_new.assert_not_called()
+    client.create_check_status_response.assert_called_once_with(req, iid)
+
+
+@pytest.mark.parametrize(
+    "runtime_status,age,reused",
+    [
+        ("Completed", timedelta(minutes=5), True),
+        ("Completed", timedelta(days=2), False),
+        ("Failed", timedelta(minutes=5), False),
+        ("Terminated", timedelta(minutes=5), False),
+    ],
+)
+def test_http_start_reuses_only_recent_completions(http_start_func, make_http_request, runtime_status, age, reused):
+    req = make_http_request(route_params={"platform": "dummy"}, body={"payload": {}},
+                            headers={"Idempotency-Key": "k"})
+    updated = (datetime.now(timezone.utc) - age).isoformat()
+    client = _idempotent_client(runtime_status, updated)
+
+    asyncio.run(http_start_func(req, client))
+
+    assert client.start_new.called is not reused
+
+
+def test_http_start_rejects_a_reused_key_with_a_different_payload(http_start_func, make_http_request):
+    from platform_core.codec import canonical_hash
+
+    def start(payload):
+        req = make_http_request(route_params={"platform": "dummy"}, body={"payload": payload},
+                                headers={"Idempotency-Key": "k"})
+        client = _idempotent_client("Running", input_=json.dumps({"payload_hash": canonical_hash({"a": 1})}))
+        return asyncio.run(http_start_func(req, client)), client
+
+    same, _ = start({"a": 1})
+    assert same.startswith("idem-")
+    resp, client = start({"a": 2})
+    assert resp.status_code == 409
+    client.create_check_status_response.assert_not_called()
+
+
+def test_http_start_returns_the_instance_that_won_a_start_race(http_start_func, make_http_request):
+    from azure.durable_functions.models.DurableOrchestrationStatus import DurableOrchestrationStatus
+
+    req = make_http_request(route_params={"platform": "dummy"}, body={"payload": {}},
+                            headers={"Idempotency-Key": "k"})
+    client = _idempotent_client()
+    # Not found on the first check; a concurrent request has started it by the time we try.
+    client.get_status.side_effect = [
+        DurableOrchestrationStatus(),
+        DurableOrchestrationStatus(runtimeStatus="Running"),
+    ]
+    client.start_new.side_effect = Exception("An orchestration with the status Running already exists")
+
+    iid = asyncio.run(http_start_func(req, client))
+
+    assert iid.startswith("idem-")
+    client.start_new.assert_awaited_once()
+    client.create_check_status_response.assert_called_once_with(req, iid)
+
+
+def test_http_start_conflict_without_a_live_instance_still_fails(http_start_func, make_http_request):
+    req = make_http_request(route_params={"platform": "dummy"}, body={"payload": {}},
+                            headers={"Idempotency-Key": "k"})
+    client = _idempotent_client()
+    client.start_new.side_effect = Exception("storage unavailable")
+
+    with pytest.raises(Exception, match="storage unavailable"):
+        asyncio.run(http_start_func(req, client))
+
+
+def test_http_start_idempotent_flag_hashes_canonical_payload(http_start_func, make_http_request):
+    def start(payload):
+        req = make_http_request(route_params={"platform": "dummy"}, body={"payload": payload, "idempotent": True})
+        return asyncio.run(http_start_func(req, _idempotent_client()))
+
+    assert start({"a": 1, "b": [1, 2]}) == start({"b": [1, 2], "a": 1})
+    assert start({"a": 1, "b": [1, 2]}) != start({"a": 2, "b": [1, 2]})
+
+
+def test_http_start_idempotent_push_events_use_the_deterministic_id(http_start_func, make_http_request):
+    req = make_http_request(url="http://host/api/orchestrators/dummy", route_params={"platform": "dummy"},
+                            body={"payload": {}, "push_events": True}, headers={"Idempotency-Key": "k"})
+    client = _idempotent_client()
+
+    iid = asyncio.run(http_start_func(req, client))
+
+    assert iid.startswith("idem-")
+    assert client.start_new.call_args.kwargs["client_input"]["payload"]["notify_url"].endswith(f"/{iid}/events")
+
+
+def test_http_job_event_raises_bodiless_wake_up_event(make_http_request):
+    handler = http_job_event.build().get_user_function().client_function
+    req = make_http_request(route_params={"platform": "dummy", "instance_id": "iid-9"}, body={"status": "succeeded"})
+    client = _job_event_client("Running")
+
+    resp = asyncio.run(handler(req, client))
+
+    client.raise_event.assert_awaited_once_with("iid-9", JOB_STATE_CHANGED, None)
+    assert resp.status_code == 202
+
+
+def _job_event_client(runtime_status, raise_error=None):
+    from azure.durable_functions.models.DurableOrchestrationStatus import DurableOrchestrationStatus
+
+    client = Mock(spec=df.DurableOrchestrationClient)
+    client.get_status = AsyncMock(return_value=DurableOrchestrationStatus(runtimeStatus=runtime_status))
+    client.raise_event = AsyncMock(side_effect=raise_error)
+    return client
+
+
+@pytest.mark.parametrize("runtime_status,raise_error,expected_code", [
+    (None, None, 404),
+    ("Completed", None, 410),
+    ("Running", Exception("instance is not running"), 410),
+])
+def test_http_job_event_answers_late_webhooks_without_failing(make_http_request, runtime_status, raise_error, expected_code):
+    handler = http_job_event.build().get_user_function().client_function
+    req = make_http_request(route_params={"platform": "dummy", "instance_id": "iid-9"})
+    client = _job_event_client(runtime_status, raise_error)
+
+    resp = asyncio.run(handler(req, client))
+
+    assert resp.status_code == expected_code
+    assert client.raise_event.await_count == (1 if runtime_status == "Running" else 0)
+
+
+def _push_ctx(make_ctx, start_time, fake_task_cls, states, event_results):
+    """event_results: per wait, the pushed body, or None when the safety-net timer should win."""
+    req_input = {"platform": "dummy", "payload": {}, "callback_url": "http://cb", "push_events": True,
+                 "safety_net_s": 900, "timeout_s": 3600}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-push"
+    pushes = iter(event_results)
+    timers, fire_times = [], []
+
+    def create_timer(fire_at):
+        fire_times.append(fire_at)
+        timers.append(fake_task_cls(None))
+        return timers[-1]
+
+    def task_any(tasks):
+        event, timer = tasks
+        pushed = next(pushes)
+        if pushed is None:
+            ctx.current_utc_datetime = fire_times[-1]
+            return fake_task_cls(timer)
+        event.result = pushed
+        return fake_task_cls(event)
+
+    ctx.create_timer.side_effect = create_timer
+    ctx.wait_for_external_event.side_effect = lambda name: fake_task_cls(None)
+    ctx.task_any.side_effect = task_any
+    return ctx, timers, fire_times
+
+
+def test_orchestrator_push_event_triggers_immediate_poll(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="RUNNING", raw_status={}), JobState(phase="SUCCEEDED", raw_status={})]
+    ctx, timers, fire_times = _push_ctx(make_ctx, start_time, fake_task_cls, states, [{"status": "succeeded"}])
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    ctx.wait_for_external_event.assert_called_once_with(JOB_STATE_CHANGED)
+    assert fire_times == [start_time + timedelta(seconds=900)]
+    assert timers[0].cancelled
+    assert values[-1].phase == "SUCCEEDED"
+
+
+def test_orchestrator_never_trusts_pushed_job_state(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="RUNNING", raw_status={}), JobState(phase="FAILED", raw_status={"status": "failed"})]
+    forged = {"phase": "SUCCEEDED", "raw_status": {"status": "succeeded"}, "output": {"model_ids": ["forged"]}}
+    ctx, _, _ = _push_ctx(make_ctx, start_time, fake_task_cls, states, [forged])
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    names = [c.args[0] for c in ctx.call_activity.call_args_list]
+    assert names.count("get_status_activity") == 2
+    assert values[-1] == JobState(phase="FAILED", raw_status={"status": "failed"})
+
+
+def test_orchestrator_push_falls_back_to_polling_on_safety_net(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="RUNNING", raw_status={}), JobState(phase="RUNNING", raw_status={}),
+              JobState(phase="SUCCEEDED", raw_status={})]
+    ctx, timers, fire_times = _push_ctx(make_ctx, start_time, fake_task_cls, states, [None, None])
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    assert fire_times == [start_time + timedelta(seconds=900), start_time + timedelta(seconds=1800)]
+    assert not any(t.cancelled for t in timers)
+    assert values[-1].phase == "SUCCEEDED"
+
+
+def test_push_events_cut_detection_lag_and_status_traffic():
+    from bench.bench_push_latency import simulate
+
+    polled = simulate(duration_s=95, poll_s=10, push=False)
+    pushed = simulate(duration_s=95, poll_s=10, push=True, webhook_delay_s=0.2)
+
+    assert polled["detection_lag_s"] == 5.0
+    assert pushed["detection_lag_s"] == 0.2
+    assert pushed["status_calls"] == 2
+    assert polled["status_calls"] == 11
+
+
+def test_orchestrator_cancel_request_stops_polling_and_cancels_job(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="RUNNING", raw_status={})]
+    req_input = {"platform": "dummy", "payload": {}, "callback_url": "http://cb", "cancellable": True}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-cancel"
+    timers = []
+
+    def create_timer(fire_at):
+        timers.append(fake_task_cls(None))
+        return timers[-1]
+
+    def task_any(tasks):
+        cancel, _timer = tasks
+        cancel.result = {"reason": "user abort"}
+        return fake_task_cls(cancel)
+
+    ctx.create_timer.side_effect = create_timer
+    ctx.wait_for_external_event.side_effect = lambda name: fake_task_cls(None)
+    ctx.task_any.side_effect = task_any
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    ctx.wait_for_external_event.assert_called_once_with(CANCEL_REQUESTED)
+    assert timers[0].cancelled
+    calls = {c.args[0]: c.args[1] for c in ctx.call_activity.call_args_list}
+    assert calls["cancel_activity"] == {"platform": "dummy", "plan": {"platform": "dummy", "job_id": "jid"}}
+    assert calls["callback_activity"]["result"].phase is JobPhase.CANCELLED
+    assert values[-1] == JobState(JobPhase.CANCELLED, raw_status=None, message="user abort")
+
+
+def test_cancel_activity_reports_outcome_without_raising(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    plan = {"job_id": dummy_backend.submit({"duration_s": 60}), "aux": {"base": dummy_backend.url}}
+
+    done = asyncio.run(cancel_activity({"platform": "dummy", "plan": plan}))
+    unknown = asyncio.run(cancel_activity({"platform": "dummy", "plan": dict(plan, job_id="nope")}))
+
+    assert done == {"cancelled": True, "info": {"job_id": plan["job_id"], "status": "cancelled"}}
+    assert unknown["cancelled"] is False and unknown["error"].startswith("HTTPError")
+
+
+def _cancel_client(runtime_status, input_):
+    from azure.durable_functions.models.DurableOrchestrationStatus import DurableOrchestrationStatus
+
+    client = Mock(spec=df.DurableOrchestrationClient)
+    client.get_status = AsyncMock(return_value=DurableOrchestrationStatus(
+        runtimeStatus=runtime_status, input=json.dumps(input_),
+    ))
+    client.raise_event = AsyncMock()
+    return client
+
+
+@pytest.mark.parametrize("runtime_status,input_", [
+    ("Completed", {"cancellable": True}),
+    ("Running", {"platform": "dummy"}),
+])
+def test_http_cancel_rejects_finished_or_non_cancellable_instances(make_http_request, runtime_status, input_):
+    handler = http_cancel.build().get_user_function().client_function
+    req = make_http_request(route_params={"platform": "dummy", "instance_id": "iid"})
+    client = _cancel_client(runtime_status, input_)
+
+    resp = asyncio.run(handler(req, client))
+
+    assert resp.status_code == 409
+    client.raise_event.assert_not_called()
+
+
+def test_http_cancel_signals_every_batch_item(make_http_request):
+    handler = http_cancel.build().get_user_function().client_function
+    req = make_http_request(route_params={"platform": "dummy", "instance_id": "b1"}, body={"reason": "budget"})
+    client = _cancel_client("Running", {"cancellable": True, "items": [{}, {}]})
+    client.raise_event.side_effect = [None, Exception("instance completed")]
+
+    resp = asyncio.run(handler(req, client))
+
+    assert resp.status_code == 202
+    client.get_status.assert_awaited_once_with("b1", show_input=True)
+    assert [c.args for c in client.raise_event.call_args_list] == [
+        ("b1-0", CANCEL_REQUESTED, {"reason": "budget"}), ("b1-1", CANCEL_REQUESTED, {"reason": "budget"}),
+    ]
+
+
+def test_http_cancel_treats_a_race_with_completion_as_finished(make_http_request):
+    handler = http_cancel.build().get_user_function().client_function
+    req = make_http_request(route_params={"platform": "dummy", "instance_id": "iid"})
+    client = _cancel_client("Running", {"cancellable": True})
+    client.raise_event.side_effect = Exception("instance completed")
+
+    resp = asyncio.run(handler(req, client))
+
+    assert resp.status_code == 409
+
+
+@pytest.mark.parametrize("runtime_status,expected_code", [("Running", 200), (None, 404)])
+def test_http_progress_returns_custom_status_only(make_http_request, runtime_status, expected_code):
+    from azure.durable_functions.models.DurableOrchestrationStatus import DurableOrchestrationStatus
+
+    handler = http_progress.build().get_user_function().client_function
+    req = make_http_request(method="GET", route_params={"instance_id": "iid"})
+    client = Mock(spec=df.DurableOrchestrationClient)
+    progress = {"phase": "RUNNING", "active": 1, "total": 4}
+    client.get_status = AsyncMock(return_value=DurableOrchestrationStatus(
+        runtimeStatus=runtime_status, customStatus=progress,
+    ))
+
+    resp = asyncio.run(handler(req, client))
+
+    client.get_status.assert_awaited_once_with("iid")
+    assert resp.status_code == expected_code
+    if expected_code == 200:
+        assert json.loads(resp.get_body()) == {"instance_id": "iid", "runtime_status": "Running", "progress": progress}
+
+
+def _batch_client():
+    client = Mock(spec=df.DurableOrchestrationClient)
+    client.start_new = AsyncMock(side_effect=lambda name, instance_id=None, client_input=None: instance_id)
+    client.create_http_management_payload = Mock(
+        side_effect=lambda iid: {"id": iid, "statusQueryGetUri": f"http://host/status/{iid}"}
+    )
+    return client
+
+
+def test_http_start_batch_returns_one_handle_and_item_ids(make_http_request):
+    handler = http_start_batch.build().get_user_function().client_function
+    body = {"items": [{"a": 1}, {"a": 2}, {"a": 3}], "callback_url": "http://cb", "max_concurrency": 2}
+    req = make_http_request(url="http://host/api/orchestrators/dummy/batch", route_params={"platform": "dummy"}, body=body)
+    client = _batch_client()
+
+    resp = asyncio.run(handler(req, client))
+
+    client.start_new.assert_awaited_once()
+    assert client.start_new.call_args.args == ("orchestrate_batch",)
+    iid = client.start_new.call_args.kwargs["instance_id"]
+    assert client.start_new.call_args.kwargs["client_input"]["platform"] == "dummy"
+    assert resp.status_code == 202
+    assert resp.headers["Location"] == f"http://host/status/{iid}"
+    out = json.loads(resp.get_body())
+    assert out["id"] == iid
+    assert out["items"] == [f"{iid}-0", f"{iid}-1", f"{iid}-2"]
+
+
+def test_http_start_batch_push_events_sets_item_notify_urls(make_http_request):
+    handler = http_start_batch.build().get_user_function().client_function
+    body = {"items": [{"a": 1}], "push_events": True}
+    req = make_http_request(url="http://host/api/orchestrators/dummy/batch", route_params={"platform": "dummy"}, body=body)
+    client = _batch_client()
+
+    asyncio.run(handler(req, client))
+
+    iid = client.start_new.call_args.kwargs["instance_id"]
+    items = client.start_new.call_args.kwargs["client_input"]["items"]
+    assert items == [{"a": 1, "notify_url": f"http://host/api/orchestrators/dummy/{iid}-0/events"}]
+
+
+@pytest.mark.parametrize("body", [{}, {"items": []}, {"items": {"a": 1}}])
+def test_http_start_batch_rejects_missing_items(make_http_request, body):
+    handler = http_start_batch.build().get_user_function().client_function
+    req = make_http_request(route_params={"platform": "dummy"}, body=body)
+    client = _batch_client()
+
+    resp = asyncio.run(handler(req, client))
+
+    assert resp.status_code == 400
+    client.start_new.assert_not_called()
+
+
+def _batch_ctx(make_ctx, start_time, fake_task_cls, req_input):
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=lambda name, args: fake_task_cls(None))
+    ctx.instance_id = "batch-1"
+    in_flight_peaks = []
+
+    def call_sub_orchestrator(name, input_, instance_id):
+        assert name == "orchestrate_submission"
+        return fake_task_cls(JobState(phase="SUCCEEDED", raw_status={}, output=input_["payload"]))
+
+    def task_any(tasks):
+        in_flight_peaks.append(len(tasks))
+        return fake_task_cls(tasks[0])
+
+    def task_all(tasks):
+        in_flight_peaks.append(len(tasks))
+        return fake_task_cls([t.result for t in tasks])
+
+    ctx.call_sub_orchestrator.side_effect = call_sub_orchestrator
+    ctx.task_any.side_effect = task_any
+    ctx.task_all.side_effect = task_all
+    return ctx, in_flight_peaks
+
+
+def test_orchestrate_batch_caps_concurrency_and_aggregates_callback(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {
+        "platform": "dummy", "items": [{"n": i} for i in range(5)], "max_concurrency": 2,
+        "callback_url": "http://cb/all", "poll_s": 3, "unrelated": True,
+    }
+    ctx, peaks = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+    values = run_orchestrator(orchestrator, ctx)
+
+    sub_calls = ctx.call_sub_orchestrator.call_args_list
+    assert [c.args[2] for c in sub_calls] == [f"batch-1-{i}" for i in range(5)]
+    assert sub_calls[0].args[1] == {"poll_s": 3, "platform": "dummy", "payload": {"n": 0}, "callback_url": None}
+    assert max(peaks) <= 2
+
+    callback_calls = [c for c in ctx.call_activity.call_args_list if c.args[0] == "callback_activity"]
+    assert len(callback_calls) == 1
+    result = callback_calls[0].args[1]["result"]
+    assert result["instance_id"] == "batch-1"
+    assert [s.output for s in result["items"]] == [{"n": i} for i in range(5)]
+    assert [s.output for s in values[-1]] == [{"n": i} for i in range(5)]
+
+
+def test_orchestrate_batch_per_item_callbacks_only(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {"platform": "dummy", "items": [{"n": 0}, {"n": 1}], "item_callback_url": "http://cb/item"}
+    ctx, _ = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+    run_orchestrator(orchestrator, ctx)
+
+    assert all(c.args[1]["callback_url"] == "http://cb/item" for c in ctx.call_sub_orchestrator.call_args_list)
+    assert not [c for c in ctx.call_activity.call_args_list if c.args[0] == "callback_activity"]
+
+
+def test_orchestrate_batch_survives_a_failing_item(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {
+        "platform": "dummy", "items": [{"n": i} for i in range(3)], "max_concurrency": 1,
+        "callback_url": "http://cb/all", "item_callback_url": "http://cb/item",
+    }
+    ctx, _ = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+
+    def call_sub_orchestrator(name, input_, instance_id):
+        if input_["payload"]["n"] == 1:
+            return fake_task_cls(RuntimeError("submit_activity failed: 500 Server Error"))
+        return fake_task_cls(JobState(phase="SUCCEEDED", raw_status={}, output=input_["payload"]))
+
+    ctx.call_sub_orchestrator.side_effect = call_sub_orchestrator
+    values = run_orchestrator(orchestrator, ctx)
+
+    results = values[-1]
+    assert [r.phase for r in results] == ["SUCCEEDED", JobPhase.ERROR, "SUCCEEDED"]
+    assert "500 Server Error" in results[1].message
+    callbacks = [c.args[1] for c in ctx.call_activity.call_args_list if c.args[0] == "callback_activity"]
+    assert [c["callback_url"] for c in callbacks] == ["http://cb/item", "http://cb/all"]
+    assert callbacks[0]["result"] is results[1]
+    assert callbacks[1]["result"]["items"] == results
+
+
+def test_orchestrate_batch_bulk_submit_polls_accepted_items_only(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {
+        "platform": "dummy", "items": [{"n": i} for i in range(5)], "bulk_submit": True,
+        "submit_batch_size": 2, "timeout_s": 60, "item_callback_url": "http://cb/item", "cache": True,
+    }
+    ctx, _ = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+    cached = JobState(JobPhase.SUCCEEDED, raw_status={}, output={"job_id": "cached"})
+
+    def entry(p):
+        if p["n"] == 1:
+            return {"error": "RuntimeError: rejected"}
+        if p["n"] == 3:
+            return {"state": cached}
+        return {"plan": {"job_id": p["n"]}, "cache_key": f"k-{p['n']}"}
+
+    def call_activity(name, args):
+        if name == "submit_many_activity":
+            assert args["cache"] is True
+            return fake_task_cls([entry(p) for p in args["payloads"]])
+        return fake_task_cls(None)
+
+    ctx.call_activity.side_effect = call_activity
+    ctx.call_sub_orchestrator.side_effect = lambda name, input_, instance_id: fake_task_cls(
+        JobState(phase="SUCCEEDED", raw_status={}, output=input_["checkpoint"]["plan"])
+    )
+    values = run_orchestrator(orchestrator, ctx)
+
+    submits = [c.args[1]["payloads"] for c in ctx.call_activity.call_args_list if c.args[0] == "submit_many_activity"]
+    assert submits == [[{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}], [{"n": 4}]]
+    sub_calls = ctx.call_sub_orchestrator.call_args_list
+    assert [c.args[2] for c in sub_calls] == ["batch-1-0", "batch-1-2", "batch-1-4"]
+    item = sub_calls[0].args[1]
+    assert "payload" not in item
+    assert item["checkpoint"]["deadline"] == (start_time + timedelta(seconds=60)).isoformat()
+    assert item["checkpoint"]["cache_key"] == "k-0"
+
+    results = values[-1]
+    assert results[1].phase is JobPhase.ERROR and results[1].message == "RuntimeError: rejected"
+    assert results[3] is cached
+    assert [r.output for r in results if r.phase != JobPhase.ERROR] == [
+        {"job_id": 0}, {"job_id": 2}, {"job_id": "cached"}, {"job_id": 4}
+    ]
+    # Items settled without a sub-orchestration still get their item callback.
+    callbacks = [c.args[1] for c in ctx.call_activity.call_args_list if c.args[0] == "callback_activity"]
+    assert [(c["callback_url"], c["result"]) for c in callbacks] == [
+        ("http://cb/item", results[1]), ("http://cb/item", cached)
+    ]
+
+
+class _FailedTask(FakeTask):
+    """A task whose result raises, as a failed activity does under replay."""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    @property
+    def result(self):
+        raise self.error
+
+    @result.setter
+    def result(self, value):
+        pass
+
+
+def test_orchestrate_batch_fails_only_the_items_of_a_failed_submit_chunk(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {
+        "platform": "dummy", "items": [{"n": i} for i in range(5)], "bulk_submit": True,
+        "submit_batch_size": 2, "item_callback_url": "http://cb/item",
+    }
+    ctx, _ = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+
+    def call_activity(name, args):
+        if name == "submit_many_activity":
+            if args["payloads"][0]["n"] == 2:
+                return _FailedTask(RuntimeError("503 Server Error"))
+            return fake_task_cls([{"plan": {"job_id": p["n"]}} for p in args["payloads"]])
+        return fake_task_cls(None)
+
+    ctx.call_activity.side_effect = call_activity
+    ctx.call_sub_orchestrator.side_effect = lambda name, input_, instance_id: fake_task_cls(
+        JobState(phase="SUCCEEDED", raw_status={}, output=input_["checkpoint"]["plan"])
+    )
+    values = run_orchestrator(orchestrator, ctx)
+
+    results = values[-1]
+    assert [r.phase for r in results] == ["SUCCEEDED", "SUCCEEDED", JobPhase.ERROR, JobPhase.ERROR, "SUCCEEDED"]
+    assert results[2].message == "Submit failed: 503 Server Error"
+    assert [c.args[2] for c in ctx.call_sub_orchestrator.call_args_list] == ["batch-1-0", "batch-1-1", "batch-1-4"]
+    item_callbacks = [c.args[1] for c in ctx.call_activity.call_args_list if c.args[0] == "callback_activity"]
+    assert [c["result"] for c in item_callbacks] == [results[2], results[3]]
+
+
+def test_orchestrate_batch_bulk_chunks_never_exceed_free_slots(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {
+        "platform": "dummy", "items": [{"n": i} for i in range(5)], "bulk_submit": True,
+        "submit_batch_size": 5, "max_concurrency": 2,
+    }
+    ctx, peaks = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+    ctx.call_activity.side_effect = lambda name, args: fake_task_cls(
+        [{"plan": {"job_id": p["n"]}} for p in args["payloads"]] if name == "submit_many_activity" else None
+    )
+    ctx.call_sub_orchestrator.side_effect = lambda name, input_, instance_id: fake_task_cls(
+        JobState(phase="SUCCEEDED", raw_status={}, output=input_["checkpoint"]["plan"])
+    )
+    run_orchestrator(orchestrator, ctx)
+
+    # Submitted items start polling at once, so none waits out its deadline for a slot.
+    submits = [c.args[1]["payloads"] for c in ctx.call_activity.call_args_list if c.args[0] == "submit_many_activity"]
+    assert submits == [[{"n": 0}, {"n": 1}], [{"n": 2}], [{"n": 3}], [{"n": 4}]]
+    assert max(peaks) <= 2
+
+
+def test_submit_many_activity_reports_per_item_errors(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    entries = asyncio.run(submit_many_activity(
+        {"platform": "dummy", "payloads": [{"task": 0}, {"invalid": True}, {"task": 2}]}
+    ))
+
+    assert [sorted(e) for e in entries] == [["plan"], ["error"], ["plan"]]
+    assert entries[1]["error"].startswith("RuntimeError: Dummy submit rejected payload")
+    assert dummy_backend.requests == {"submit_batch": 1}
+
+
+def test_submit_many_activity_skips_cached_payloads(monkeypatch, dummy_backend):
+    from platform_core import registry, result_cache
+
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    monkeypatch.setenv("RESULT_CACHE_STORE", "memory")
+    monkeypatch.setattr(registry.get_platform_commands("dummy"), "cacheable", True)
+    result_cache.reset()
+    args = {"platform": "dummy", "payloads": [{"task": 0}, {"task": 1}], "cache": True}
+    first = asyncio.run(submit_many_activity(args))
+    assert [sorted(e) for e in first] == [["cache_key", "plan"], ["cache_key", "plan"]]
+
+    done = JobState(JobPhase.SUCCEEDED, raw_status={}, output=[1])
+    result_cache.result_cache().put(first[1]["cache_key"], done)
+    second = asyncio.run(submit_many_activity(args))
+    assert second[1] == {"state": done}
+    assert sorted(second[0]) == ["cache_key", "plan"]
+    assert dummy_backend.requests == {"submit_batch": 2}
+    result_cache.reset()
+
+
+def test_orchestrator_publishes_failed_callback_delivery(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    failed = {"url": "http://cb/1", "delivered": False, "status": 503, "attempts": 4, "error": "HTTP 503"}
+    status_side_effect = _status_sequence_side_effect(fake_task_cls, [JobState(phase="SUCCEEDED", raw_status={})])
+
+    def call_activity(name, args):
+        return fake_task_cls(failed) if name == "callback_activity" else status_side_effect(name, args)
+
+    req_input = {"platform": "dummy", "payload": {}, "callback_url": "http://cb/1"}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=call_activity)
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    assert values[-1].phase == "SUCCEEDED"
+    status = ctx.set_custom_status.call_args.args[0]
+    assert status["phase"] == "SUCCEEDED" and status["callback"] == failed
+
+
+def test_orchestrate_batch_publishes_undelivered_item_callbacks(make_ctx, start_time, fake_task_cls):
+    orchestrator = orchestrate_batch.build().get_user_function().orchestrator_function
+    req_input = {
+        "platform": "dummy", "items": [{"n": 0}], "bulk_submit": True,
+        "item_callback_url": "http://cb/item", "callback_url": "http://cb/all",
     }
-    callback_activity(args)
-
-    post_mock.assert_called_once()
-    (url,) = post_mock.call_args.args
-    assert url == "http://callback.example/receive"
-    kwargs = post_mock.call_args.kwargs
-    assert kwargs["headers"] == {"Content-Type": "application/json"}
-    assert kwargs["timeout"] == 30
-    assert json.loads(kwargs["data"]) == {"phase": "SUCCEEDED", "data": {"a": 1}}
\ No newline at end of file
+    ctx, _ = _batch_ctx(make_ctx, start_time, fake_task_cls, req_input)
+    failed = {"url": "http://cb/item", "delivered": False, "error": "HTTP 503"}
+    delivered = {"url": "http://cb/all", "delivered": True}
+
+    def call_activity(name, args):
+        if name == "submit_many_activity":
+            return fake_task_cls([{"error": "RuntimeError: rejected"}])
+        return fake_task_cls(failed if args["callback_url"] == "http://cb/item" else delivered)
+
+    ctx.call_activity.side_effect = call_activity
+    run_orchestrator(orchestrator, ctx)
+
+    ctx.set_custom_status.assert_called_once_with({"callback": delivered, "undelivered_item_callbacks": [failed]})
+
+
+def test_orchestrator_without_callback_url_skips_callback(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    states = [JobState(phase="SUCCEEDED", raw_status={})]
+    req_input = {"platform": "dummy", "payload": {}}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=_status_sequence_side_effect(fake_task_cls, states))
+    ctx.instance_id = "iid-item"
+    values = run_orchestrator(orchestrator_func, ctx)
+
+    assert [c.args[0] for c in ctx.call_activity.call_args_list] == ["prepare_activity", "submit_activity", "get_status_activity"]
+    assert values[-1].phase == "SUCCEEDED"
+
+
+def test_orchestrator_carries_provider_cursor_into_next_poll(orchestrator_func, make_ctx, start_time, fake_task_cls):
+    plans_seen = []
+    states = iter([
+        JobState(phase="RUNNING", raw_status={}, cursor={"start": 5}),
+        JobState(phase="RUNNING", raw_status={}, cursor={"start": 9}),
+        JobState(phase="SUCCEEDED", raw_status={}),
+    ])
+
+    def side_effect(name, args):
+        if name == "get_status_activity":
+            plans_seen.append(args["plan"])
+            return fake_task_cls(next(states))
+        if name == "submit_activity":
+            return fake_task_cls({"platform": "mlflow", "experiment_id": "1"})
+        return fake_task_cls(args.get("payload"))
+
+    req_input = {"platform": "mlflow", "payload": {}, "callback_url": "http://cb"}
+    ctx = make_ctx(req_input, now=start_time, call_activity_side_effect=side_effect)
+    ctx.instance_id = "iid-cursor"
+    run_orchestrator(orchestrator_func, ctx)
+
+    assert plans_seen == [
+        {"platform": "mlflow", "experiment_id": "1"},
+        {"platform": "mlflow", "experiment_id": "1", "cursor": {"start": 5}},
+        {"platform": "mlflow", "experiment_id": "1", "cursor": {"start": 9}},
+    ]
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+import requests
+from platform_core import registry
+from platform_core.async_http import HTTPStatusError
+from platform_core.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, all_stats, breaker_for
+from platform_core.limits import run_limited
+
+
+def _breaker(now, **kwargs):
+    return CircuitBreaker("dummy", clock=lambda: now[0], **kwargs)
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    now = [0.0]
+    breaker = _breaker(now, failure_threshold=3, reset_timeout_s=30)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.on_failure()
+    breaker.on_success()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.on_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 10.0
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after_s == pytest.approx(20)
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_admits_one_probe_then_closes_or_reopens():
+    now = [0.0]
+    breaker = _breaker(now, failure_threshold=1, reset_timeout_s=5)
+    breaker.on_failure()
+
+    now[0] = 5.0
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.on_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 10.0
+    breaker.before_call()
+    breaker.on_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["transitions"] == {
+        "closed->open": 1,
+        "open->half_open": 2,
+        "half_open->open": 1,
+        "half_open->closed": 1,
+    }
+
+
+def test_breaker_for_reads_provider_then_env(monkeypatch):
+    assert breaker_for("dummy").failure_threshold == registry.Provider.breaker_failure_threshold
+    monkeypatch.setenv("DUMMY_ASYNC_BREAKER_FAILURES", "0")
+    assert breaker_for("dummy-async") is None
+    assert set(all_stats()) == {"dummy"}
+
+
+def test_run_limited_counts_outages_but_not_client_errors(monkeypatch):
+    monkeypatch.setenv("DUMMY_BREAKER_FAILURES", "2")
+    breaker = breaker_for("dummy")
+    calls = []
+
+    def raise_status(status):
+        def call():
+            calls.append(status)
+            raise HTTPStatusError(status, "http://dummy")
+        return call
+
+    async def main():
+        for status in (404, 429, 500, 404):
+            with pytest.raises(HTTPStatusError):
+                await run_limited("dummy", raise_status(status))
+        assert breaker.state == CLOSED
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                await run_limited("dummy", _refused)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            await run_limited("dummy", raise_status(500))
+
+    asyncio.run(main())
+    assert calls == [404, 429, 500, 404]
+
+
+def test_errors_unrelated_to_the_backend_neither_trip_nor_close_the_circuit(monkeypatch):
+    monkeypatch.setenv("DUMMY_BREAKER_FAILURES", "1")
+    monkeypatch.setenv("DUMMY_BREAKER_RESET_S", "0")
+    breaker = breaker_for("dummy")
+
+    def bad_payload():
+        raise ValueError("Missing 'experiment_name' in payload.")
+
+    async def main():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await run_limited("dummy", bad_payload)
+        assert breaker.state == CLOSED
+        with pytest.raises(requests.ConnectionError):
+            await run_limited("dummy", _refused)
+        assert breaker.state == OPEN
+        # The half-open probe fails on a bad payload: the slot is released, the circuit stays half-open.
+        with pytest.raises(ValueError):
+            await run_limited("dummy", bad_payload)
+        assert breaker.state == HALF_OPEN
+        assert await run_limited("dummy", lambda: "ok") == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(main())
+
+
+def test_cancelled_half_open_probe_gives_its_slot_back(monkeypatch):
+    monkeypatch.setenv("DUMMY_BREAKER_FAILURES", "1")
+    monkeypatch.setenv("DUMMY_BREAKER_RESET_S", "0")
+    breaker = breaker_for("dummy")
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def main():
+        with pytest.raises(requests.ConnectionError):
+            await run_limited("dummy", _refused)
+        probe = asyncio.ensure_future(run_limited("dummy", hang))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        breaker.reset_timeout_s = 3600  # so the probe cannot simply expire
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert await run_limited("dummy", lambda: "ok") == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(main())
+
+
+def test_unreported_half_open_probe_expires_after_reset_timeout():
+    now = [0.0]
+    breaker = _breaker(now, failure_threshold=1, reset_timeout_s=5)
+    breaker.on_failure()
+
+    now[0] = 5.0
+    breaker.before_call()
+    now[0] = 9.0
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after_s == pytest.approx(1)
+    now[0] = 10.0
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+
+def _refused():
+    raise requests.ConnectionError("refused")
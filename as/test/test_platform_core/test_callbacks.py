@@ -0,0 +1,91 @@
+import asyncio
+
+from platform_core import async_http
+from platform_core.callbacks import CallbackDelivery
+
+
+def _run(coro_fn):
+    async def main():
+        try:
+            return await coro_fn()
+        finally:
+            await async_http.close()
+    return asyncio.run(main())
+
+
+def test_retries_failed_posts_with_backoff(dummy_backend):
+    dummy_backend.inbox_failures = 2
+    delivery = CallbackDelivery(retries=3, backoff_s=0.01)
+
+    record = _run(lambda: delivery.deliver(f"{dummy_backend.url}/_inbox", {"n": 1}))
+
+    assert record["delivered"] and record["status"] == 202
+    assert record["attempts"] == 3
+    assert dummy_backend.inbox == [{"n": 1}]
+    assert delivery.stats()["attempts"] == 3
+
+
+def test_reports_failure_once_retries_are_exhausted(dummy_backend):
+    dummy_backend.inbox_failures = 5
+    delivery = CallbackDelivery(retries=1, backoff_s=0.01)
+
+    record = _run(lambda: delivery.deliver(f"{dummy_backend.url}/_inbox", {"n": 1}))
+
+    assert not record["delivered"]
+    assert record["status"] == 503 and record["error"] == "HTTP 503"
+    assert record["attempts"] == 2
+    assert delivery.stats()["failed"] == 1
+
+
+def test_client_errors_are_not_retried(dummy_backend):
+    delivery = CallbackDelivery(retries=3, backoff_s=0.01)
+
+    record = _run(lambda: delivery.deliver(f"{dummy_backend.url}/missing", {"n": 1}))
+
+    assert record["status"] == 404 and record["attempts"] == 1
+
+
+def test_batches_results_for_the_same_url(dummy_backend):
+    delivery = CallbackDelivery(batch_window_s=0.05, max_batch=4)
+    url = f"{dummy_backend.url}/_inbox"
+
+    records = _run(lambda: asyncio.gather(*(delivery.deliver(url, {"n": i}) for i in range(6))))
+
+    assert dummy_backend.requests["inbox"] == 2
+    assert [body["results"] for body in dummy_backend.inbox] == [
+        [{"n": 0}, {"n": 1}, {"n": 2}, {"n": 3}],
+        [{"n": 4}, {"n": 5}],
+    ]
+    assert [r["batch_size"] for r in records] == [4, 4, 4, 4, 2, 2]
+    assert delivery.stats()["delivered"] == 6
+
+
+def test_caps_concurrent_posts_per_destination(dummy_backend):
+    dummy_backend.inbox_latency_s = 0.05
+    delivery = CallbackDelivery(max_in_flight=2)
+    url = f"{dummy_backend.url}/_inbox"
+    peak = [0]
+
+    async def watch():
+        limiter = delivery._limiter(url)
+        while len(dummy_backend.inbox) < 6:
+            peak[0] = max(peak[0], limiter.in_flight)
+            await asyncio.sleep(0.005)
+
+    _run(lambda: asyncio.gather(watch(), *(delivery.deliver(url, {"n": i}) for i in range(6))))
+
+    assert peak[0] == 2
+    assert len(dummy_backend.inbox) == 6
+
+
+def test_backoff_does_not_hold_the_destination_slot(dummy_backend):
+    dummy_backend.inbox_failures = 1
+    delivery = CallbackDelivery(max_in_flight=1, backoff_s=0.3)
+    url = f"{dummy_backend.url}/_inbox"
+
+    first, second = _run(lambda: asyncio.gather(delivery.deliver(url, {"n": 0}), delivery.deliver(url, {"n": 1})))
+
+    assert first["attempts"] == 2 and first["latency_s"] >= 0.3
+    # Sent while the first delivery was backing off.
+    assert second["attempts"] == 1 and second["latency_s"] < 0.2
+    assert dummy_backend.inbox == [{"n": 1}, {"n": 0}]
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from platform_core.claimcheck import CLAIM, ClaimCheck, LocalFileStore, store_from_env
+from platform_core.state import JobPhase, JobState
+
+
+@pytest.fixture
+def cc(tmp_path):
+    return ClaimCheck(LocalFileStore(str(tmp_path)), threshold_bytes=64)
+
+
+def test_small_values_pass_by_value(cc):
+    assert cc.offload({"a": 1}) == {"a": 1}
+    assert cc.stats()["offloaded"] == 0
+
+
+def test_large_value_round_trips_through_reference(cc, tmp_path):
+    value = {"model_ids": [f"m-{i}" for i in range(100)]}
+    ref = cc.offload(value)
+
+    assert set(ref) == {CLAIM, "bytes"}
+    assert len(json.dumps(ref)) < 100
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+    assert cc.resolve(ref) == value
+    assert cc.stats()["bytes_saved"] == ref["bytes"] - len(json.dumps(ref, separators=(",", ":")))
+
+
+def test_identical_values_share_one_blob(cc, tmp_path):
+    value = {"config": "x" * 200}
+    assert cc.offload(value) == cc.offload(dict(value))
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+
+def test_keys_next_to_reference_override_stored_value(cc):
+    ref = cc.offload({"job_id": "j", "aux": "y" * 100, "cursor": 1})
+    assert cc.resolve({**ref, "cursor": 7}) == {"job_id": "j", "aux": "y" * 100, "cursor": 7}
+
+
+def test_resolve_walks_containers_and_job_states(cc):
+    output = {"model_ids": ["m"] * 50}
+    state = cc.offload_state(JobState(JobPhase.SUCCEEDED, raw_status={"ok": True}, output=output))
+
+    assert state.raw_status == {"ok": True}
+    assert CLAIM in state.output
+    resolved = cc.resolve({"items": [state]})
+    assert resolved["items"][0].output == output
+    assert resolved["items"][0].phase is JobPhase.SUCCEEDED
+
+
+def test_disabled_claim_check_passes_through_and_rejects_references():
+    cc = ClaimCheck(None, threshold_bytes=1)
+    big = {"x": "y" * 100}
+    assert cc.offload(big) is big
+    with pytest.raises(RuntimeError, match="CLAIM_CHECK_STORE"):
+        cc.resolve({CLAIM: "abc", "bytes": 1})
+
+
+def test_store_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("CLAIM_CHECK_STORE", raising=False)
+    assert store_from_env() is None
+    monkeypatch.setenv("CLAIM_CHECK_STORE", f"file://{tmp_path}")
+    store = store_from_env()
+    assert isinstance(store, LocalFileStore) and store.root == tmp_path
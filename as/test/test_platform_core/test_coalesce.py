@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from platform_core import coalesce
+from platform_core.coalesce import MicroBatcher, status_batcher, submit_batcher
+from platform_core.registry import get_platform_commands
+
+
+@pytest.fixture(autouse=True)
+def _reset_batchers():
+    coalesce.reset()
+    yield
+    coalesce.reset()
+
+
+def test_concurrent_calls_share_one_batch():
+    calls = []
+
+    def execute_many(items):
+        calls.append(list(items))
+        return [i * 10 for i in items]
+
+    batcher = MicroBatcher(execute_many, window_s=0.2, max_batch=8)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(batcher.submit, range(8)))
+
+    assert results == [i * 10 for i in range(8)]
+    assert len(calls) == 1
+    assert sorted(calls[0]) == list(range(8))
+    assert batcher.stats() == {"items": 8, "batches": 1}
+
+
+def test_overflow_is_split_into_max_batch_chunks():
+    sizes = []
+
+    def execute_many(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(execute_many, window_s=0.05, max_batch=4)
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        assert sorted(pool.map(batcher.submit, range(10))) == list(range(10))
+    assert sum(sizes) == 10
+    assert max(sizes) <= 4
+
+
+def test_batch_failure_reaches_every_caller():
+    barrier = threading.Barrier(3)
+
+    def execute_many(items):
+        raise RuntimeError("backend down")
+
+    batcher = MicroBatcher(execute_many, window_s=0.1, max_batch=3)
+
+    def call(i):
+        barrier.wait()
+        with pytest.raises(RuntimeError, match="backend down"):
+            batcher.submit(i)
+        return True
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert all(pool.map(call, range(3)))
+
+
+def test_item_exception_reaches_only_its_caller():
+    batcher = MicroBatcher(lambda items: [ValueError(i) if i % 2 else i for i in items], window_s=0.05, max_batch=4)
+
+    def call(i):
+        try:
+            return batcher.submit(i)
+        except ValueError as e:
+            return f"error {e}"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(call, range(4))) == [0, "error 1", 2, "error 3"]
+
+
+def test_leader_returns_after_its_own_batch_and_hands_over():
+    second_queued, release = threading.Event(), threading.Event()
+    batches = []
+
+    def execute_many(items):
+        batches.append(list(items))
+        if items == [0]:
+            second_queued.wait(1)
+        else:
+            release.wait(1)
+        return items
+
+    batcher = MicroBatcher(execute_many, window_s=0.01, max_batch=1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(batcher.submit, 0)
+        while not batches:
+            threading.Event().wait(0.001)
+        second = pool.submit(batcher.submit, 1)
+        while batcher.stats()["items"] < 2:
+            threading.Event().wait(0.001)
+        second_queued.set()
+        # The first caller returns while the second caller's batch is still running.
+        assert first.result(1) == 0
+        assert not second.done()
+        release.set()
+        assert second.result(1) == 1
+    assert batches == [[0], [1]]
+
+
+def test_status_batcher_is_opt_in(monkeypatch):
+    monkeypatch.delenv("STATUS_COALESCE_MS", raising=False)
+    assert status_batcher("dummy") is None
+
+    monkeypatch.setenv("STATUS_COALESCE_MS", "5")
+    batcher = status_batcher("DUMMY")
+    assert batcher is status_batcher("dummy")
+    assert batcher.window_s == 0.005
+
+
+def test_coalesced_polls_hit_backend_once_per_batch(monkeypatch, dummy_backend):
+    from function_app import get_status_activity
+
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    monkeypatch.setenv("STATUS_COALESCE_MS", "200")
+    monkeypatch.setenv("STATUS_COALESCE_MAX_BATCH", "25")
+    submit_cmd = get_platform_commands("dummy").submit()
+    plans = [submit_cmd.execute({"task": i}) for i in range(50)]
+
+    async def poll_all():
+        return await asyncio.gather(*(get_status_activity({"platform": "dummy", "plan": p}) for p in plans))
+
+    states = asyncio.run(poll_all())
+
+    assert all(s.phase.value == "SUCCEEDED" for s in states)
+    assert [s.raw_status["job_id"] for s in states] == [p["job_id"] for p in plans]
+    assert dummy_backend.requests.get("status", 0) == 0
+    assert dummy_backend.requests["status_batch"] <= 4
+
+
+def test_submit_batcher_needs_a_batch_capable_sync_submit(monkeypatch):
+    monkeypatch.setenv("SUBMIT_COALESCE_MS", "5")
+    assert submit_batcher("dummy").window_s == 0.005
+    assert submit_batcher("dummy-async") is None
+
+    monkeypatch.delenv("SUBMIT_COALESCE_MS")
+    coalesce.reset()
+    assert submit_batcher("dummy") is None
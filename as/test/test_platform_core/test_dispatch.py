@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from platform_core import dispatch
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    dispatch.shutdown()
+    yield
+    dispatch.shutdown()
+
+
+def test_invoke_awaits_coroutine_functions_on_the_loop():
+    async def execute(x):
+        return threading.current_thread().name, x
+
+    thread, x = asyncio.run(dispatch.invoke(execute, 1))
+    assert (thread, x) == (threading.main_thread().name, 1)
+
+
+def test_invoke_runs_sync_functions_on_the_bounded_pool(monkeypatch):
+    monkeypatch.setenv("SYNC_COMMAND_THREADS", "2")
+    running, peak, lock = 0, 0, threading.Lock()
+
+    def execute(x):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return threading.current_thread().name
+
+    async def many():
+        return await asyncio.gather(*(dispatch.invoke(execute, i) for i in range(8)))
+
+    names = asyncio.run(many())
+    assert peak == 2
+    assert all(n.startswith("sync-command") for n in names)
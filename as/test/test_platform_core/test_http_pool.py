@@ -0,0 +1,48 @@
+import requests_mock
+from platform_core import http_pool
+from platform_core.registry import get_platform_commands
+
+
+def test_session_is_shared_per_host():
+    a = http_pool.session_for("http://host-a/x")
+    assert http_pool.session_for("HTTP://host-a/y") is a
+    assert http_pool.session_for("http://host-b/x") is not a
+    http_pool.close_all()
+
+
+def test_configure_applies_pool_size_and_timeouts():
+    url = "http://configured"
+    http_pool.configure(url, http_pool.PoolPolicy(pool_maxsize=3, connect_timeout=1, read_timeout=2, retries=5))
+    try:
+        adapter = http_pool.session_for(url).get_adapter(url)
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 5
+        assert "POST" not in adapter.max_retries.allowed_methods
+
+        with requests_mock.Mocker() as m:
+            m.get(f"{url}/ping", json={})
+            http_pool.get(f"{url}/ping")
+            assert m.request_history[0].timeout == (1, 2)
+    finally:
+        http_pool.configure(url, http_pool.PoolPolicy())
+        http_pool.close_all()
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("HTTP_POOL_MAXSIZE", "7")
+    monkeypatch.setenv("HTTP_READ_TIMEOUT", "12.5")
+    policy = http_pool.PoolPolicy.from_env()
+    assert policy.pool_maxsize == 7
+    assert policy.timeout() == (5.0, 12.5)
+
+
+def test_dummy_commands_reuse_one_connection(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    prov = get_platform_commands("dummy")
+    plan = prov.submit().execute({"task": "x"})
+    status_cmd = prov.status()
+    for _ in range(5):
+        assert status_cmd.execute(plan).phase.value == "SUCCEEDED"
+
+    assert dummy_backend.total_requests == 6
+    assert dummy_backend.connections == 1
@@ -0,0 +1,111 @@
+import asyncio
+import inspect
+
+import pytest
+from platform_core import breaker, metrics, registry
+from platform_core.metrics import MemoryMetrics, instrument
+
+
+class _Cmd:
+    def execute(self, x):
+        if x < 0:
+            raise ValueError(x)
+        return x * 2
+
+
+class _AsyncCmd:
+    async def execute(self, x):
+        return x + 1
+
+
+def test_memory_metrics_aggregates_by_series():
+    sink = MemoryMetrics()
+    sink.add("calls", 1, {"platform": "a"})
+    sink.add("calls", 2, {"platform": "a"})
+    for v in (3.0, 1.0, 2.0):
+        sink.record("lat", v, {"platform": "a", "kind": "status"})
+    sink.observe("depth", lambda: [(7, {"q": "x"})])
+
+    snap = sink.snapshot()
+    assert snap["counters"] == {"calls": {"platform=a": 3}}
+    assert snap["histograms"]["lat"] == {"kind=status,platform=a": {"count": 3, "sum": 6.0, "min": 1.0, "max": 3.0}}
+    assert snap["gauges"] == {"depth": {"q=x": 7}}
+
+
+def test_instrument_times_sync_and_async_execute(memory_metrics):
+    cmd = instrument(_Cmd(), "dummy", "submit")
+    assert cmd.execute(2) == 4
+    with pytest.raises(ValueError):
+        cmd.execute(-1)
+
+    acmd = instrument(_AsyncCmd(), "dummy-async", "status")
+    assert inspect.iscoroutinefunction(acmd.execute)
+    assert asyncio.run(acmd.execute(1)) == 2
+
+    snap = memory_metrics.snapshot()
+    assert snap["counters"]["command.calls"] == {
+        "kind=submit,method=execute,outcome=ok,platform=dummy": 1,
+        "kind=submit,method=execute,outcome=error,platform=dummy": 1,
+        "kind=status,method=execute,outcome=ok,platform=dummy-async": 1,
+    }
+    durations = snap["histograms"]["command.duration_s"]
+    assert durations["kind=submit,method=execute,outcome=ok,platform=dummy"]["count"] == 1
+    assert durations["kind=submit,method=execute,outcome=error,platform=dummy"]["count"] == 1
+
+
+def test_instrument_measures_only_the_outermost_call(memory_metrics):
+    class _Batch(_Cmd):
+        def execute_many(self, xs):
+            return [self.execute(x) for x in xs]
+
+    class _AsyncBatch(_AsyncCmd):
+        async def execute_many(self, xs):
+            return list(await asyncio.gather(*(self.execute(x) for x in xs)))
+
+    assert instrument(_Batch(), "dummy", "submit").execute_many([1, 2, 3]) == [2, 4, 6]
+    assert asyncio.run(instrument(_AsyncBatch(), "dummy-async", "submit").execute_many([1, 2])) == [2, 3]
+
+    assert memory_metrics.snapshot()["counters"]["command.calls"] == {
+        "kind=submit,method=execute_many,outcome=ok,platform=dummy": 1,
+        "kind=submit,method=execute_many,outcome=ok,platform=dummy-async": 1,
+    }
+
+
+def test_get_command_returns_instrumented_instances(memory_metrics):
+    status = registry.get_command("dummy", "status")
+    assert status.execute.__wrapped__.__self__ is status
+    assert status.execute_many.__wrapped__.__self__ is status
+
+
+def test_breaker_state_is_published_as_gauges(memory_metrics):
+    b = breaker.breaker_for("dummy")
+    for _ in range(b.failure_threshold):
+        b.on_failure()
+
+    gauges = memory_metrics.snapshot()["gauges"]
+    assert gauges["breaker.state"] == {"platform=dummy": 2}
+    assert gauges["breaker.transitions"] == {"platform=dummy,transition=closed->open": 1}
+
+
+def test_otel_backend_exports_counters_histograms_and_spans():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    reader, spans = InMemoryMetricReader(), InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(spans))
+    sink = metrics.OtelMetrics(MeterProvider(metric_readers=[reader]), tracer_provider)
+
+    sink.add("command.calls", 1, {"platform": "dummy"})
+    with sink.span("command", {"platform": "dummy"}):
+        pass
+    sink.observe("breaker.state", lambda: [(2, {"platform": "dummy"})])
+
+    data = reader.get_metrics_data()
+    names = {m.name for rm in data.resource_metrics for sm in rm.scope_metrics for m in sm.metrics}
+    assert names == {"command.calls", "command.duration_s", "breaker.state"}
+    assert [s.name for s in spans.get_finished_spans()] == ["command"]
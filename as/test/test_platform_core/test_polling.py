@@ -0,0 +1,58 @@
+import pytest
+from platform_core.polling import ExponentialPoll, FixedPoll, make_poll_policy
+from platform_core.state import JobPhase, JobState
+
+
+def test_default_policy_is_fixed_poll_s():
+    policy = make_poll_policy(None, poll_s=7)
+    assert isinstance(policy, FixedPoll)
+    assert [policy.next_delay(i) for i in range(3)] == [7, 7, 7]
+
+
+def test_exponential_backoff_respects_caps():
+    policy = make_poll_policy({"kind": "exponential", "min_s": 2, "max_s": 30, "jitter": 0}, seed="iid")
+    assert [policy.next_delay(i) for i in range(6)] == [2, 4, 8, 16, 30, 30]
+    assert policy.next_delay(10_000) == 30
+
+
+def test_jitter_is_deterministic_per_seed_and_bounded():
+    a = ExponentialPoll(min_s=10, factor=1, jitter=0.5, seed="instance-a")
+    a_again = ExponentialPoll(min_s=10, factor=1, jitter=0.5, seed="instance-a")
+    b = ExponentialPoll(min_s=10, factor=1, jitter=0.5, seed="instance-b")
+
+    delays_a = [a.next_delay(i) for i in range(20)]
+    assert delays_a == [a_again.next_delay(i) for i in range(20)]
+    assert delays_a != [b.next_delay(i) for i in range(20)]
+    assert all(5 <= d <= 15 for d in delays_a)
+
+
+def test_jitter_spreads_orchestrations_started_together():
+    first_delays = {ExponentialPoll(min_s=10, jitter=0.3, seed=f"iid-{i}").next_delay(0) for i in range(100)}
+    assert len(first_delays) > 90
+
+
+def test_jittered_delays_stay_within_caps_and_still_spread_at_them():
+    policy = ExponentialPoll(min_s=10, max_s=20, jitter=0.9, seed="iid")
+    assert all(10 <= policy.next_delay(i) <= 20 for i in range(50))
+    capped = {ExponentialPoll(min_s=10, max_s=20, jitter=0.3, seed=f"iid-{i}").next_delay(30) for i in range(100)}
+    assert len(capped) > 90
+    assert all(14 <= d <= 20 for d in capped)
+
+
+@pytest.mark.parametrize("jitter", [-0.1, 1, 1.5])
+def test_jitter_outside_unit_interval_is_rejected(jitter):
+    with pytest.raises(ValueError, match="jitter"):
+        make_poll_policy({"kind": "exponential", "jitter": jitter})
+
+
+def test_provider_hint_wins_and_is_clamped():
+    policy = ExponentialPoll(min_s=2, max_s=60, jitter=0.5)
+    hinted = JobState(JobPhase.RUNNING, {}, next_poll_after_s=45)
+    assert policy.next_delay(0, hinted) == 45
+    assert policy.next_delay(0, JobState(JobPhase.RUNNING, {}, next_poll_after_s=600)) == 60
+    assert FixedPoll(10).next_delay(3, JobState(JobPhase.RUNNING, {}, next_poll_after_s=1)) == 1
+
+
+def test_unknown_policy_raises_value_error():
+    with pytest.raises(ValueError, match="Unsupported poll policy 'nope'"):
+        make_poll_policy({"kind": "nope"})
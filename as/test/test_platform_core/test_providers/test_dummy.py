@@ -1,5 +1,6 @@
 # ... existing code ...
 
+import json
 import pytest
 import requests
 import requests_mock
@@ -29,7 +30,8 @@ def test_dummy_submit_and_status():
         plan = submit_cmd.execute({"task": "do", "params": {}})
         assert plan["job_id"] == "abc"
         assert plan["platform"] == "dummy"
-        assert "aux" in plan and "base" in plan["aux"] and "headers" in plan["aux"]
+        assert "aux" in plan and "base" in plan["aux"] and "scopes" in plan["aux"]
+        assert "headers" not in plan["aux"]
 
         m.get("http://dummy/status/abc", json={"status": "running", "message": "ok"}, status_code=200)
         s = status_cmd.execute(plan)
@@ -125,4 +127,156 @@ def test_status_invalid_json_raises():
 
         m.get("http://dummy/status/j4", text="not-json", status_code=200)
         with pytest.raises(ValueError):
-            status_cmd.execute(plan)
\ No newline at end of file
+            status_cmd.execute(plan)
+
+def test_status_resolves_auth_at_poll_time(fake_credential):
+    submit_cmd = _make_submit()
+    status_cmd = _make_status()
+    with requests_mock.Mocker() as m:
+        m.post("http://dummy/submit", json={"job_id": "j5"}, status_code=200)
+        plan = submit_cmd.execute({"task": "do", "params": {}})
+        assert "test-token" not in json.dumps(plan)
+
+        m.get("http://dummy/status/j5", json={"status": "running"}, status_code=200)
+        status_cmd.execute(plan)
+        status_cmd.execute(plan)
+
+        polls = [r for r in m.request_history if r.method == "GET"]
+        assert all(r.headers["Authorization"] == "Bearer test-token" for r in polls)
+    # submit acquired the token; both polls were served from the cache
+    assert fake_credential.calls == 1
+
+
+def test_status_poll_history_payload_shrinks():
+    submit_cmd = _make_submit()
+    with requests_mock.Mocker() as m:
+        m.post("http://dummy/submit", json={"job_id": "j6"}, status_code=200)
+        plan = submit_cmd.execute({"task": "do", "params": {}})
+
+    # A realistic bearer token is ~1.5-2.5 KB of JWT.
+    jwt = "eyJ0eXAiOiJKV1QiLCJhbGciOiJSUzI1NiJ9." + "x" * 1800 + ".sig"
+    legacy_plan = dict(plan, aux={
+        "base": plan["aux"]["base"],
+        "headers": {"Content-Type": "application/json", "Authorization": f"Bearer {jwt}"},
+    })
+
+    def poll_input_bytes(p):
+        return len(json.dumps({"platform": "dummy", "plan": p}).encode("utf-8"))
+
+    assert poll_input_bytes(plan) < 200
+    assert poll_input_bytes(plan) * 10 < poll_input_bytes(legacy_plan)
+
+
+def test_status_exposes_provider_poll_hint():
+    submit_cmd = _make_submit()
+    status_cmd = _make_status()
+    with requests_mock.Mocker() as m:
+        m.post("http://dummy/submit", json={"job_id": "j7"}, status_code=200)
+        plan = submit_cmd.execute({"task": "do", "params": {}})
+
+        m.get("http://dummy/status/j7", json={"status": "running"}, headers={"Retry-After": "42"})
+        assert status_cmd.execute(plan).next_poll_after_s == 42.0
+
+        m.get("http://dummy/status/j7", json={"status": "running", "next_poll_after_s": 5})
+        assert status_cmd.execute(plan).next_poll_after_s == 5.0
+
+        m.get("http://dummy/status/j7", json={"status": "running"})
+        assert status_cmd.execute(plan).next_poll_after_s is None
+
+
+def test_stand_in_backend_pushes_completion_to_notify_url(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    plan = _make_submit().execute({"task": "x", "duration_s": 0.05, "notify_url": f"{dummy_backend.url}/_inbox"})
+
+    inbox = dummy_backend.wait_for_inbox(1)
+    assert inbox == [{"job_id": plan["job_id"], "status": "succeeded"}]
+
+
+def test_status_execute_many_uses_batch_endpoint():
+    submit_cmd = _make_submit()
+    status_cmd = _make_status()
+    status_cmd.batch_size = 2
+    with requests_mock.Mocker() as m:
+        m.post("http://dummy/submit", json={"job_id": "a"})
+        plan_a = submit_cmd.execute({})
+        plans = [plan_a, dict(plan_a, job_id="b"), dict(plan_a, job_id="c")]
+
+        m.get("http://dummy/status", [
+            {"json": {"jobs": {"a": {"status": "running"}, "b": {"status": "succeeded"}}}},
+            {"json": {"jobs": {}}},
+        ])
+        states = status_cmd.execute_many(plans)
+
+        gets = [r for r in m.request_history if r.method == "GET"]
+        assert [r.qs["ids"] for r in gets] == [["a,b"], ["c"]]
+    assert [s.phase for s in states] == [JobPhase.RUNNING, JobPhase.SUCCEEDED, JobPhase.ERROR]
+    assert states[2].message == "Unknown job: c"
+
+
+def test_status_execute_many_isolates_malformed_plans_and_failed_chunks():
+    status_cmd = _make_status()
+    status_cmd.batch_size = 2
+    aux = {"base": "http://dummy"}
+    plans = [{"job_id": j, "aux": aux} for j in "abc"] + [{"job_id": "d"}, {"aux": aux}]
+    with requests_mock.Mocker() as m:
+        m.get("http://dummy/status", [
+            {"json": {"jobs": {"a": {"status": "running"}, "b": {"status": "succeeded"}}}},
+            {"status_code": 400},
+        ])
+        states = status_cmd.execute_many(plans)
+
+    assert [s.phase for s in states[:2]] == [JobPhase.RUNNING, JobPhase.SUCCEEDED]
+    assert isinstance(states[2], requests.HTTPError)
+    assert isinstance(states[3], KeyError) and isinstance(states[4], KeyError)
+
+
+def test_default_status_execute_many_isolates_failing_items():
+    from platform_core.commands import GetStatusCommand
+
+    class Status(GetStatusCommand):
+        def execute(self, plan):
+            if plan.get("bad"):
+                raise ValueError("malformed plan")
+            return JobState(JobPhase.RUNNING, raw_status=None)
+
+    states = Status().execute_many([{}, {"bad": True}])
+    assert states[0].phase is JobPhase.RUNNING and isinstance(states[1], ValueError)
+
+
+def test_submit_execute_many_isolates_rejected_payloads(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    submit_cmd = _make_submit()
+    submit_cmd.batch_size = 2
+
+    plans = submit_cmd.execute_many([{"task": 0}, {"invalid": True}, {"task": 2}])
+
+    assert [p["platform"] for p in (plans[0], plans[2])] == ["dummy", "dummy"]
+    assert isinstance(plans[1], RuntimeError)
+    assert "rejected" in str(plans[1])
+    assert dummy_backend.requests == {"submit_batch": 2}
+
+
+def test_submit_execute_many_keeps_plans_of_accepted_chunks():
+    submit_cmd = _make_submit()
+    submit_cmd.batch_size = 2
+    with requests_mock.Mocker() as m:
+        m.post("http://dummy/submit/batch", [
+            {"json": {"results": [{"job_id": "a"}, {"job_id": "b"}]}},
+            {"status_code": 503},
+            {"json": {"results": [{"job_id": "e"}]}},
+        ])
+        plans = submit_cmd.execute_many([{"n": n} for n in range(5)])
+
+    assert [p["job_id"] for p in (plans[0], plans[1], plans[4])] == ["a", "b", "e"]
+    assert all(isinstance(p, requests.HTTPError) for p in plans[2:4])
+
+
+def test_cancel_stops_running_job_and_leaves_finished_ones(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    cancel_cmd = get_platform_commands("dummy").cancel()
+    running = _make_submit().execute({"duration_s": 60})
+    done = _make_submit().execute({})
+
+    assert cancel_cmd.execute(running)["status"] == "cancelled"
+    assert cancel_cmd.execute(done)["status"] == "succeeded"
+    assert _make_status().execute(running).phase is JobPhase.CANCELLED
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+from platform_core import async_http
+from platform_core.registry import get_command
+from platform_core.state import JobPhase
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await async_http.close()
+    return asyncio.run(main())
+
+
+def test_async_submit_and_status_against_backend(monkeypatch, dummy_backend, fake_credential):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    submit_cmd = get_command("dummy-async", "submit")
+    status_cmd = get_command("dummy-async", "status")
+
+    async def flow():
+        plan = await submit_cmd.execute({"task": "x"})
+        return plan, await status_cmd.execute(plan)
+
+    plan, state = _run(flow())
+    assert plan["platform"] == "dummy-async"
+    assert plan["aux"] == {"base": dummy_backend.url, "scopes": ["https://graph.microsoft.com/.default"]}
+    assert state.phase is JobPhase.SUCCEEDED
+    assert fake_credential.calls == 1
+
+
+def test_concurrent_async_polls_share_one_loop(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    dummy_backend.latency_s = 0.05
+    plans = [{"job_id": dummy_backend.submit({}), "aux": {"base": dummy_backend.url}} for _ in range(200)]
+    status_cmd = get_command("dummy-async", "status")
+
+    async def poll_all():
+        return await asyncio.gather(*(status_cmd.execute(p) for p in plans))
+
+    states = _run(poll_all())
+    assert [s.raw_status["job_id"] for s in states] == [p["job_id"] for p in plans]
+    assert dummy_backend.requests["status"] == 200
+
+
+def test_async_execute_many_batches_and_flags_unknown_jobs(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    status_cmd = get_command("dummy-async", "status")
+    plans = [{"job_id": dummy_backend.submit({}), "aux": {"base": dummy_backend.url}} for _ in range(3)]
+    plans.append({"job_id": "nope", "aux": {"base": dummy_backend.url}})
+
+    states = _run(status_cmd.execute_many(plans))
+    assert [s.phase for s in states] == [JobPhase.SUCCEEDED] * 3 + [JobPhase.ERROR]
+    assert dummy_backend.requests == {"status_batch": 1}
+
+
+def test_async_execute_many_isolates_malformed_plans(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    status_cmd = get_command("dummy-async", "status")
+    plans = [{"job_id": dummy_backend.submit({}), "aux": {"base": dummy_backend.url}}, {"job_id": "x"}]
+
+    states = _run(status_cmd.execute_many(plans))
+    assert states[0].phase is JobPhase.SUCCEEDED and isinstance(states[1], KeyError)
+
+
+def test_async_http_retries_only_idempotent_requests(dummy_backend):
+    from platform_core import http_pool
+
+    http_pool.configure(dummy_backend.url, http_pool.PoolPolicy(retries=3, backoff_factor=0))
+    dummy_backend.error_rate = 1.0
+
+    async def calls():
+        return (
+            await async_http.get(f"{dummy_backend.url}/status/job-1"),
+            await async_http.post(f"{dummy_backend.url}/submit", json={}),
+        )
+
+    got, posted = _run(calls())
+    assert (got.status, posted.status) == (503, 503)
+    assert dummy_backend.requests == {"status": 4, "submit": 1}
+    with pytest.raises(async_http.HTTPStatusError, match="HTTP 503"):
+        got.raise_for_status()
+
+
+def test_async_http_retries_refused_connections_for_any_verb(monkeypatch):
+    import socket
+
+    import aiohttp
+    from platform_core import http_pool
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    http_pool.configure(url, http_pool.PoolPolicy(retries=2, backoff_factor=0))
+    attempts = []
+    request = aiohttp.ClientSession.request
+
+    def counting(self, method, *args, **kwargs):
+        attempts.append(method)
+        return request(self, method, *args, **kwargs)
+
+    monkeypatch.setattr(aiohttp.ClientSession, "request", counting)
+    for send in (async_http.get, async_http.post):
+        with pytest.raises(aiohttp.ClientConnectorError):
+            _run(send(f"{url}/submit"))
+    assert attempts == ["GET"] * 3 + ["POST"] * 3
+
+
+def test_async_http_close_all_closes_sessions_of_idle_loops(dummy_backend):
+    loop = asyncio.new_event_loop()
+    try:
+        async def open_session():
+            return async_http.session_for(dummy_backend.url)
+
+        session = loop.run_until_complete(open_session())
+        async_http.close_all()
+        assert session.closed
+    finally:
+        loop.close()
+
+
+def test_async_submit_execute_many_reraises_cancellation():
+    from platform_core.commands import AsyncSubmitCommand
+
+    class Submit(AsyncSubmitCommand):
+        async def execute(self, payload):
+            if payload.get("cancel"):
+                raise asyncio.CancelledError()
+            if payload.get("invalid"):
+                raise ValueError("rejected")
+            return {"job_id": "j"}
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(Submit().execute_many([{}, {"invalid": True}, {"cancel": True}]))
+    plans = asyncio.run(Submit().execute_many([{}, {"invalid": True}]))
+    assert plans[0] == {"job_id": "j"} and isinstance(plans[1], ValueError)
+
+
+def test_async_submit_execute_many_isolates_rejected_payloads(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    submit_cmd = get_command("dummy-async", "submit")
+
+    plans = _run(submit_cmd.execute_many([{"task": 0}, {"invalid": True}]))
+    assert plans[0]["job_id"] and isinstance(plans[1], RuntimeError)
+    assert dummy_backend.requests == {"submit_batch": 1}
+
+
+def test_async_cancel_stops_running_job(monkeypatch, dummy_backend):
+    monkeypatch.setenv("DUMMY_BASE_URL", dummy_backend.url)
+    plan = {"job_id": dummy_backend.submit({"duration_s": 60}), "aux": {"base": dummy_backend.url}}
+
+    info = _run(get_command("dummy-async", "cancel").execute(plan))
+    assert info == {"job_id": plan["job_id"], "status": "cancelled"}
+    assert dummy_backend.requests == {"cancel": 1}
@@ -0,0 +1,291 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+mlflow = pytest.importorskip("mlflow")
+
+from platform_core.providers import mlflow_provider  # noqa: E402
+from platform_core.state import JobPhase  # noqa: E402
+from mlflow.store.entities.paged_list import PagedList  # noqa: E402
+
+
+def _run(exp_id, status):
+    return SimpleNamespace(info=SimpleNamespace(experiment_id=exp_id, status=status))
+
+
+def test_status_execute_many_uses_one_search(monkeypatch):
+    searches = []
+
+    def search_runs(experiment_ids, output_format=None, **kwargs):
+        searches.append(list(experiment_ids))
+        assert output_format == "list"
+        return [_run("1", "RUNNING"), _run("1", "FINISHED"), _run("2", "FINISHED")]
+
+    monkeypatch.setattr(mlflow_provider.mlflow, "search_runs", search_runs)
+    monkeypatch.setattr(mlflow_provider.mlflow, "search_logged_models", lambda **kw: ["m-1"])
+
+    states = mlflow_provider.MlflowGetStatus().execute_many(
+        [{"experiment_id": "1", "scan": "full"}, {"experiment_id": "2", "scan": "full"},
+         {"experiment_id": "3", "scan": "full"}, {}]
+    )
+
+    assert searches == [["1", "2", "3"]]
+    assert [s.phase for s in states] == [JobPhase.RUNNING, JobPhase.SUCCEEDED, JobPhase.PENDING, JobPhase.ERROR]
+    assert states[0].raw_status == {"active": 1, "total": 2}
+    assert states[1].output == {"model_ids": ["m-1"]}
+
+
+def test_status_search_error_maps_to_error_state(monkeypatch):
+    def search_runs(**kwargs):
+        raise RuntimeError("tracking server down")
+
+    monkeypatch.setattr(mlflow_provider.mlflow, "search_runs", search_runs)
+    state = mlflow_provider.MlflowGetStatus().execute({"experiment_id": "1", "scan": "full"})
+    assert state.phase is JobPhase.ERROR
+    assert "tracking server down" in state.message
+
+
+class FakeTrackingServer:
+    """
+    Answers `attributes.<ts> >= N` and `attributes.status IN (...)` searches
+    over an in-memory run table, with paging.
+    """
+
+    def __init__(self):
+        self.runs = {}
+        self.searches = []
+
+    def put(self, run_id, exp_id="1", status="RUNNING", start=0, end=None):
+        self.runs[run_id] = SimpleNamespace(info=SimpleNamespace(
+            run_id=run_id, experiment_id=exp_id, status=status, start_time=start, end_time=end,
+        ))
+
+    def search_runs(self, experiment_ids, filter_string, order_by, max_results, page_token=None):
+        runs = [r for r in self.runs.values() if r.info.experiment_id in experiment_ids]
+        if filter_string.startswith("attributes.status IN"):
+            attr, since = "status", None
+            statuses = re.findall(r"'(\w+)'", filter_string)
+            matches = sorted((r for r in runs if r.info.status in statuses), key=lambda r: r.info.start_time)
+        else:
+            attr, since = re.fullmatch(r"attributes\.(\w+) >= (\d+)", filter_string).groups()
+            since = int(since)
+            matches = sorted(
+                (r for r in runs if getattr(r.info, attr) is not None and getattr(r.info, attr) >= since),
+                key=lambda r: getattr(r.info, attr),
+            )
+        offset = int(page_token or 0)
+        page = matches[offset:offset + max_results]
+        self.searches.append((attr, since, len(page)))
+        more = offset + max_results < len(matches)
+        return PagedList(page, str(offset + max_results) if more else None)
+
+    def set_terminated(self, run_id, status="FINISHED"):
+        self.runs[run_id].info.status = status
+
+
+@pytest.fixture
+def tracking(monkeypatch):
+    server = FakeTrackingServer()
+    monkeypatch.setattr(mlflow_provider.mlflow, "MlflowClient", lambda: server)
+    monkeypatch.setattr(mlflow_provider.mlflow, "search_logged_models", lambda **kw: ["m-1"])
+    return server
+
+
+def _key(run_id):
+    return mlflow_provider._seen_key(run_id)
+
+
+def _poll(cmd, plan):
+    state = cmd.execute(plan)
+    return state, dict(plan, cursor=state.cursor)
+
+
+def test_incremental_scan_only_fetches_changes(tracking):
+    cmd = mlflow_provider.MlflowGetStatus()
+    cmd.page_size = 2
+    cmd.overlap_ms = 0
+    for i in range(5):
+        tracking.put(f"old-{i}", status="FINISHED", start=i, end=10 + i)
+    tracking.put("live", status="RUNNING", start=20)
+
+    state, plan = _poll(cmd, {"experiment_id": "1"})
+    assert state.phase is JobPhase.RUNNING
+    assert state.raw_status == {"active": 1, "total": 6}
+    assert sum(n for _, _, n in tracking.searches) == 12  # first poll reads the backlog once
+
+    tracking.searches.clear()
+    state, plan = _poll(cmd, plan)
+    assert state.raw_status == {"active": 1, "total": 6}
+    # Only the boundary runs and the active run come back; nothing new is counted.
+    assert sum(n for _, _, n in tracking.searches) == 3
+
+    tracking.put("live", status="FAILED", start=20, end=30)
+    state, plan = _poll(cmd, plan)
+    assert state.phase is JobPhase.SUCCEEDED  # a logged model exists
+    assert state.raw_status == {"active": 0, "total": 6}
+    assert plan["cursor"]["failed"] == 1
+    assert plan["cursor"]["end"] == 30
+
+
+def test_incremental_scan_counts_runs_committed_behind_the_marks(tracking):
+    cmd = mlflow_provider.MlflowGetStatus()
+    cmd.overlap_ms = 10
+    tracking.put("a", status="RUNNING", start=20)
+    tracking.put("b", status="FINISHED", start=1, end=50)
+    state, plan = _poll(cmd, {"experiment_id": "1"})
+    assert state.raw_status == {"active": 1, "total": 2}
+
+    # Committed late, with client timestamps behind both marks but inside the overlap.
+    tracking.put("late", status="FAILED", start=15, end=45)
+    # Ends with a timestamp behind the end mark: still no longer active.
+    tracking.put("a", status="FINISHED", start=20, end=42)
+    state, plan = _poll(cmd, plan)
+    assert state.phase is JobPhase.SUCCEEDED
+    assert state.raw_status == {"active": 0, "total": 3}
+    assert plan["cursor"]["failed"] == 1
+
+    state, plan = _poll(cmd, plan)
+    assert state.raw_status == {"active": 0, "total": 3}
+    assert plan["cursor"]["failed"] == 1
+
+
+def test_incremental_scan_counts_runs_sharing_a_timestamp_once(tracking):
+    cmd = mlflow_provider.MlflowGetStatus()
+    tracking.put("a", status="RUNNING", start=5)
+    state, plan = _poll(cmd, {"experiment_id": "1"})
+    assert state.raw_status == {"active": 1, "total": 1}
+
+    tracking.put("b", status="RUNNING", start=5)
+    state, plan = _poll(cmd, plan)
+    assert state.raw_status == {"active": 2, "total": 2}
+    assert plan["cursor"]["start_seen"] == {_key("a"): 5, _key("b"): 5}
+
+    state, plan = _poll(cmd, plan)
+    assert state.raw_status == {"active": 2, "total": 2}
+
+
+def test_incremental_scan_bounds_the_runs_it_remembers(tracking):
+    cmd = mlflow_provider.MlflowGetStatus()
+    cmd.max_seen = 3
+    for i in range(5):
+        tracking.put(f"r-{i}", status="RUNNING", start=10 + i)
+    state, plan = _poll(cmd, {"experiment_id": "1"})
+    assert state.raw_status == {"active": 5, "total": 5}
+    seen = plan["cursor"]["start_seen"]
+    assert sorted(seen.values()) == [12, 13, 14]
+    assert all(len(k) == 12 and not k.startswith("r-") for k in seen)
+
+    # Runs 10 and 11 were forgotten, so the re-scan starts at 12 and never recounts them.
+    tracking.put("new", status="FINISHED", start=20, end=21)
+    state, plan = _poll(cmd, plan)
+    assert state.raw_status == {"active": 5, "total": 6}
+    assert sorted(plan["cursor"]["start_seen"].values()) == [13, 14, 20]
+
+
+def test_incremental_scan_batches_experiments_with_own_cursors(tracking):
+    cmd = mlflow_provider.MlflowGetStatus()
+    tracking.put("a", exp_id="1", status="FINISHED", start=1, end=2)
+    tracking.put("b", exp_id="2", status="RUNNING", start=50)
+    plan_1 = {"experiment_id": "1", "cursor": {"start": 1, "start_seen": {_key("a"): 1}, "end": 2, "end_seen": {_key("a"): 2},
+                                              "total": 1, "failed": 0}}
+    plan_2 = {"experiment_id": "2"}
+
+    states = cmd.execute_many([plan_1, plan_2])
+
+    assert len(tracking.searches) == 3
+    assert states[0].phase is JobPhase.SUCCEEDED and states[0].raw_status == {"active": 0, "total": 1}
+    assert states[1].phase is JobPhase.RUNNING and states[1].raw_status == {"active": 1, "total": 1}
+
+
+def test_incremental_scan_with_no_runs_is_pending(tracking):
+    state = mlflow_provider.MlflowGetStatus().execute({"experiment_id": "1"})
+    assert state.phase is JobPhase.PENDING
+    assert state.cursor["total"] == 0
+
+
+@pytest.fixture
+def experiments(monkeypatch):
+    mlflow_provider.experiment_cache().clear()
+    store = {"lookups": 0, "creates": 0, "ids": {}}
+
+    def get_experiment_by_name(name):
+        store["lookups"] += 1
+        exp_id = store["ids"].get(name)
+        return SimpleNamespace(experiment_id=exp_id) if exp_id else None
+
+    def create_experiment(name, artifact_location):
+        store["creates"] += 1
+        store["ids"][name] = f"exp-{len(store['ids']) + 1}"
+        return store["ids"][name]
+
+    monkeypatch.setattr(mlflow_provider.mlflow, "get_experiment_by_name", get_experiment_by_name)
+    monkeypatch.setattr(mlflow_provider.mlflow, "create_experiment", create_experiment)
+    yield store
+    mlflow_provider.experiment_cache().clear()
+
+
+_UC = {"experiment_name": "exp", "catalog": "cat", "schema": "sch", "volume": "vol"}
+
+
+def test_prepare_resolves_experiment_once_for_a_batch(experiments):
+    prepare = mlflow_provider.MlflowPrepare()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        prepared = list(pool.map(lambda i: prepare.execute(dict(_UC, run=i)), range(500)))
+
+    assert {p["experiment_id"] for p in prepared} == {"exp-1"}
+    assert prepared[0]["experiment_name"] == "cat.sch.exp"
+    assert experiments["lookups"] == 1
+    assert experiments["creates"] == 1
+    assert mlflow_provider.experiment_cache().stats()["hit_rate"] > 0.9
+
+
+def test_prepare_already_exists_conflict_resolves_to_existing_id(experiments, monkeypatch):
+    from mlflow.exceptions import MlflowException
+    from mlflow.protos.databricks_pb2 import RESOURCE_ALREADY_EXISTS
+
+    def create_experiment(name, artifact_location):
+        experiments["ids"][name] = "exp-created-elsewhere"
+        raise MlflowException("already exists", error_code=RESOURCE_ALREADY_EXISTS)
+
+    monkeypatch.setattr(mlflow_provider.mlflow, "create_experiment", create_experiment)
+    prepared = mlflow_provider.MlflowPrepare().execute(dict(_UC))
+    assert prepared["experiment_id"] == "exp-created-elsewhere"
+
+
+def test_prepare_other_create_errors_propagate(experiments, monkeypatch):
+    from mlflow.exceptions import MlflowException
+
+    def create_experiment(name, artifact_location):
+        raise MlflowException("denied")
+
+    monkeypatch.setattr(mlflow_provider.mlflow, "create_experiment", create_experiment)
+    with pytest.raises(MlflowException, match="denied"):
+        mlflow_provider.MlflowPrepare().execute(dict(_UC))
+
+
+def test_submit_execute_many_prepares_named_payloads_and_isolates_errors(experiments):
+    plans = mlflow_provider.MlflowSubmit().execute_many(
+        [dict(_UC, run=0), {"experiment_id": "given"}, {"run": 2}, dict(_UC, run=3)]
+    )
+
+    assert [p["experiment_id"] for p in (plans[0], plans[1], plans[3])] == ["exp-1", "given", "exp-1"]
+    assert isinstance(plans[2], ValueError)
+    assert experiments["lookups"] == 1
+
+
+def test_cancel_kills_only_active_runs_of_the_experiment(tracking):
+    tracking.put("a", status="RUNNING", start=1)
+    tracking.put("b", status="SCHEDULED", start=2)
+    tracking.put("c", status="FINISHED", start=3, end=4)
+    tracking.put("d", exp_id="2", status="RUNNING", start=5)
+    cancel = mlflow_provider.MlflowCancel()
+    cancel.page_size = 1
+
+    assert cancel.execute({"experiment_id": "1"}) == {"terminated": ["a", "b"]}
+    assert {k: r.info.status for k, r in tracking.runs.items()} == {
+        "a": "KILLED", "b": "KILLED", "c": "FINISHED", "d": "RUNNING",
+    }
+    with pytest.raises(ValueError, match="experiment_id"):
+        cancel.execute({})
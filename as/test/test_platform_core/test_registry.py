@@ -32,3 +32,101 @@ def test_submit_includes_content_type_and_auth_headers(monkeypatch):
         m.get("http://dummy/status/jj", json={"status": "pending"}, status_code=200)
         st = status_cmd.execute(plan)
         assert st.raw_status == {"status": "pending"}
+
+
+def test_register_lazy_imports_module_on_first_use(tmp_path, monkeypatch):
+    from platform_core import registry
+
+    (tmp_path / "lazy_fake_provider.py").write_text(
+        "from platform_core.registry import platform, Provider\n"
+        "@platform('lazy-fake')\n"
+        "class LazyFake(Provider):\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(registry._LAZY, "lazy-fake", "lazy_fake_provider")
+    # Registrations made by the test land in a copy that teardown discards.
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+
+    import sys
+    assert "lazy_fake_provider" not in sys.modules
+    try:
+        prov = get_platform_commands("Lazy-Fake")
+        assert prov.__name__ == "LazyFake"
+        assert get_platform_commands("lazy-fake") is prov
+    finally:
+        sys.modules.pop("lazy_fake_provider", None)
+
+
+def test_entry_point_provider_class_is_registered(monkeypatch):
+    from platform_core import registry
+
+    class EpProvider(registry.Provider):
+        pass
+
+    class FakeEntryPoint:
+        name = "ep-platform"
+
+        def load(self):
+            return EpProvider
+
+    seen = {}
+
+    def fake_entry_points(group):
+        seen["group"] = group
+        return [FakeEntryPoint()]
+
+    monkeypatch.setattr(registry, "entry_points", fake_entry_points)
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+    assert get_platform_commands("ep-platform") is EpProvider
+    assert seen["group"] == registry.ENTRY_POINT_GROUP
+
+
+def test_get_command_reuses_one_instance_per_platform_and_kind():
+    from platform_core.registry import get_command
+
+    submit = get_command("DUMMY", "submit")
+    assert get_command("dummy", "submit") is submit
+    assert get_command("dummy", "status") is not submit
+
+
+def test_get_command_unknown_kind_raises_value_error():
+    from platform_core.registry import get_command
+
+    with pytest.raises(ValueError, match="has no 'callback' command"):
+        get_command("dummy", "callback")
+
+
+def test_warm_up_and_close_drive_command_lifecycle(monkeypatch):
+    from platform_core import registry
+    from platform_core.commands import GetStatusCommand, SubmitCommand
+
+    calls = []
+
+    class Tracked:
+        def warm_up(self):
+            calls.append((type(self).__name__, "warm_up"))
+
+        def close(self):
+            calls.append((type(self).__name__, "close"))
+
+    class LifeSubmit(Tracked, SubmitCommand):
+        def execute(self, payload):
+            return {}
+
+    class LifeStatus(Tracked, GetStatusCommand):
+        def execute(self, plan):
+            return None
+
+    class LifeProvider(registry.Provider):
+        submit = LifeSubmit
+        status = LifeStatus
+
+    monkeypatch.setitem(registry._REGISTRY, "life", LifeProvider)
+    registry.warm_up(["life"])
+    first = registry.get_command("life", "submit")
+    assert sorted(calls) == [("LifeStatus", "warm_up"), ("LifeSubmit", "warm_up")]
+
+    registry.close()
+    assert sorted(calls[2:]) == [("LifeStatus", "close"), ("LifeSubmit", "close")]
+    assert registry.get_command("life", "submit") is not first
@@ -0,0 +1,71 @@
+import pytest
+from platform_core import result_cache
+from platform_core.claimcheck import LocalFileStore
+from platform_core.result_cache import BlobResultCache, MemoryResultCache, cache_key
+from platform_core.state import JobPhase, JobState
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    result_cache.reset()
+    yield
+    result_cache.reset()
+
+
+def _done(n=0):
+    return JobState(JobPhase.SUCCEEDED, raw_status={"n": n}, output=[n])
+
+
+def test_cache_key_is_canonical_and_ignores_notify_url():
+    assert cache_key("Dummy", {"a": 1, "b": 2}) == cache_key("dummy", {"b": 2, "a": 1, "notify_url": "http://x"})
+    assert cache_key("dummy", {"a": 1}) != cache_key("mlflow", {"a": 1})
+    assert cache_key("dummy", {"a": 1}) != cache_key("dummy", {"a": 2})
+
+
+def test_memory_cache_expires_and_evicts_least_recent():
+    now = [0.0]
+    cache = MemoryResultCache(maxsize=2, ttl_s=10, clock=lambda: now[0])
+    cache.put("a", _done(1))
+    cache.put("b", _done(2))
+    assert cache.get("a") == _done(1)
+    cache.put("c", _done(3))
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cache_entries_are_copies():
+    cache = MemoryResultCache()
+    cache.put("a", _done(1))
+    cache.get("a").output.append("mutated")
+    assert cache.get("a") == _done(1)
+
+
+def test_blob_cache_expires_entries_and_overwrites(tmp_path):
+    now = [1000.0]
+    store = LocalFileStore(str(tmp_path))
+    cache = BlobResultCache(store, ttl_s=60, clock=lambda: now[0])
+
+    assert cache.get("k") is None
+    cache.put("k", _done(1))
+    cache.put("k", _done(2))
+    assert cache.get("k") == _done(2)
+    now[0] += 61
+    assert cache.get("k") is None
+    assert list(tmp_path.rglob("*.json")) == []
+    assert cache.stats() == {"hits": 1, "misses": 2, "expired": 1, "hit_rate": 1 / 3}
+
+
+def test_result_cache_configured_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("RESULT_CACHE_STORE", raising=False)
+    assert result_cache.result_cache() is None
+
+    result_cache.reset()
+    monkeypatch.setenv("RESULT_CACHE_STORE", "memory")
+    assert isinstance(result_cache.result_cache(), MemoryResultCache)
+
+    result_cache.reset()
+    monkeypatch.setenv("RESULT_CACHE_STORE", str(tmp_path))
+    cache = result_cache.result_cache()
+    assert isinstance(cache, BlobResultCache) and cache.store.root == tmp_path
@@ -1,3 +1,6 @@
+import json
+
+import pytest
 
 import requests_mock
 from platform_core.registry import get_platform_commands
@@ -11,7 +14,7 @@ def test_terminal_set():
 
 
 def test_terminal_phases_constant_matches_and_property():
-    expected = {JobPhase.SUCCEEDED, JobPhase.FAILED, JobPhase.ERROR, JobPhase.TIMEOUT}
+    expected = {JobPhase.SUCCEEDED, JobPhase.FAILED, JobPhase.ERROR, JobPhase.TIMEOUT, JobPhase.CANCELLED}
     assert TERMINAL == expected
     assert JobState(JobPhase.TIMEOUT, {}).is_terminal
     assert not JobState(JobPhase.PENDING, {}).is_terminal
@@ -22,3 +25,48 @@ def test_jobstate_message_optional_and_raw_status_passthrough():
     s = JobState(JobPhase.RUNNING, raw_status=raw)
     assert s.raw_status is raw
     assert s.message is None
+
+
+def test_jobstate_wire_form_is_compact_and_round_trips():
+    s = JobState(JobPhase.RUNNING, raw_status={"pct": 5}, next_poll_after_s=3.0, cursor={"start": 1})
+    wire = s.to_json()
+    assert wire == {"v": 1, "p": "RUNNING", "r": {"pct": 5}, "n": 3.0, "c": {"start": 1}}
+    assert JobState.from_json(wire) == s
+    assert JobState.from_json(json.dumps(wire)) == s
+
+
+def test_jobstate_can_drop_raw_status_from_wire_form():
+    s = JobState(JobPhase.SUCCEEDED, raw_status={"big": "x" * 100}, output=[1])
+    back = JobState.from_json(s.to_json(drop_raw_status=True))
+    assert back == JobState(JobPhase.SUCCEEDED, raw_status=None, output=[1])
+
+    counted = JobState(JobPhase.RUNNING, raw_status={"big": "x" * 100, "active": 2, "total": 5})
+    assert counted.to_json(drop_raw_status=True)["r"] == {"active": 2, "total": 5}
+
+
+def test_jobstate_from_json_rejects_newer_schema_and_reads_long_keys():
+    with pytest.raises(ValueError, match="schema version 2"):
+        JobState.from_json({"v": 2, "p": "RUNNING"})
+    long_form = JobState(JobPhase.FAILED, raw_status=None, message="boom").to_dict()
+    assert JobState.from_json(long_form) == JobState(JobPhase.FAILED, raw_status=None, message="boom")
+
+
+def test_jobstate_survives_durable_custom_object_serialization():
+    from azure.functions._durable_functions import _deserialize_custom_object, _serialize_custom_object
+
+    s = JobState(JobPhase.PENDING, raw_status={"status": "pending"})
+    encoded = json.dumps(s, default=_serialize_custom_object)
+    assert json.loads(encoded, object_hook=_deserialize_custom_object) == s
+
+
+def test_codec_encodes_jobstate_in_long_form():
+    from platform_core import codec
+
+    encoded = codec.dumps({"items": [JobState(JobPhase.SUCCEEDED, raw_status={})]})
+    assert json.loads(encoded) == {"items": [JobState(JobPhase.SUCCEEDED, raw_status={}).to_dict()]}
+
+
+def test_to_dict_leaves_out_polling_internals():
+    s = JobState(JobPhase.RUNNING, raw_status={"active": 1}, next_poll_after_s=5.0, cursor={"start": 3})
+    assert s.to_dict() == {"phase": "RUNNING", "raw_status": {"active": 1}, "message": None, "output": None}
+    assert JobState.from_json(s.to_json()) == s
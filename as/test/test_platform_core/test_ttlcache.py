@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from platform_core.ttlcache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hits_until_ttl_expires():
+    clock = Clock()
+    cache = TTLCache(ttl_s=10, clock=clock)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get_or_load("k", load) == 1
+    clock.now = 9.9
+    assert cache.get_or_load("k", load) == 1
+    clock.now = 10
+    assert cache.get_or_load("k", load) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["loads"] == 2
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get_or_load("a", lambda: pytest.fail("should hit"))
+    cache.put("c", 3)
+    assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_concurrent_misses_share_one_load():
+    gate = threading.Event()
+    loads = []
+
+    def load():
+        loads.append(1)
+        gate.wait(2)
+        return "v"
+
+    cache = TTLCache()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(cache.get_or_load, "k", load) for _ in range(16)]
+        gate.set()
+        assert {f.result() for f in futures} == {"v"}
+    assert len(loads) == 1
+
+
+def test_failed_load_is_not_cached():
+    cache = TTLCache()
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
@@ -1,3 +1,8 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from platform_core import tokens
 
@@ -47,4 +52,87 @@ def test_credential_lru_cache_reuses_same_instance(monkeypatch):
     monkeypatch.setattr(tokens, "DefaultAzureCredential", lambda **_: FakeCred())
     tokens.get_graph_token()
     tokens.get_graph_token()
-    assert len(instances) == 1
\ No newline at end of file
+    assert len(instances) == 1
+
+def test_token_cache_serves_hits_until_refresh(fake_credential):
+    tokens.get_graph_token()
+    tokens.get_graph_token()
+    tokens.get_graph_token(scopes=["scope-1"])
+
+    assert fake_credential.calls == 2
+    stats = tokens.token_cache().stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["refreshes"] == 2
+
+
+def test_token_cache_refetches_expired_token(fake_credential):
+    fake_credential.expires_in = 10  # below the minimum validity window
+    tokens.get_graph_token()
+    tokens.get_graph_token()
+    assert fake_credential.calls == 2
+    assert tokens.token_cache().stats()["hits"] == 0
+
+
+def test_token_cache_refreshes_in_background_near_expiry(fake_credential):
+    fake_credential.expires_in = 120  # valid, but inside the refresh window
+    tokens.get_graph_token()
+    assert tokens.get_graph_token() == {"Authorization": "Bearer test-token"}
+
+    deadline = time.time() + 2
+    while tokens.token_cache().stats()["refreshes"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert fake_credential.calls == 2
+    assert tokens.token_cache().stats()["hits"] == 1
+
+
+def test_token_cache_single_flight():
+    gate = threading.Event()
+    calls = []
+
+    def slow_fetch(scopes):
+        calls.append(scopes)
+        gate.wait(2)
+        return type("Tok", (), {"token": "t", "expires_on": time.time() + 3600})()
+
+    cache = tokens.TokenCache(slow_fetch)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get, ["s"]) for _ in range(8)]
+        time.sleep(0.05)
+        gate.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_token_cache_failed_fetch_is_not_cached():
+    attempts = []
+
+    def flaky_fetch(scopes):
+        attempts.append(scopes)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return type("Tok", (), {"token": "t", "expires_on": time.time() + 3600})()
+
+    cache = tokens.TokenCache(flaky_fetch)
+    with pytest.raises(RuntimeError, match="boom"):
+        cache.get(["s"])
+    assert cache.get(["s"]).token == "t"
+
+
+def test_peek_never_fetches(fake_credential):
+    assert tokens.token_cache().peek([tokens._GRAPH_SCOPE]) is None
+    assert fake_credential.calls == 0
+    tokens.get_graph_token()
+    assert tokens.token_cache().peek([tokens._GRAPH_SCOPE]).token == "test-token"
+    assert fake_credential.calls == 1
+
+
+def test_aget_graph_token_fetches_off_loop_only_on_miss(fake_credential):
+    async def twice():
+        return await tokens.aget_graph_token(), await tokens.aget_graph_token()
+
+    assert asyncio.run(twice()) == ({"Authorization": "Bearer test-token"},) * 2
+    assert fake_credential.calls == 1